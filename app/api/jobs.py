@@ -0,0 +1,103 @@
+from app.models.intervals import INTERVAL_METHOD
+from app.models.registry import get_fitted_model, get_model_cv
+from app.models.tuning import load_model_params
+from app.models.prophet import forecast_prophet_model, cross_validate_prophet
+from app.models.arima import forecast_arima_model, cross_validation_arima
+from app.models.metrics import compute_metrics
+
+# Models exposed by the service
+MODELS = ["Prophet", "ARIMA"]
+
+def frame_records(data):
+    """
+    Convert a DataFrame to JSON-ready records, with ISO dates and nulls instead of NaN.
+
+    Args:
+        data (pd.DataFrame): DataFrame with a 'Date' column.
+
+    Returns:
+        list: One dictionary per row.
+    """
+    data = data.assign(Date=data['Date'].dt.strftime('%Y-%m-%d'))
+    return data.astype(object).where(data.notna(), None).to_dict('records')
+
+def fit_entry(ticker, data, model_selection):
+    """
+    Return the shared registry entry of a model fitted on the data, with its saved parameters.
+    """
+    entry = get_fitted_model(ticker, data, model_selection, load_model_params(ticker, model_selection))
+    if entry is None:
+        raise RuntimeError(f"Unable to fit {model_selection} on {ticker}")
+    return entry
+
+def cv_metrics(entry, data, model_selection):
+    """
+    Return the cross-validation metrics of a fitted model, computing its cross-validation once,
+    or None if the cross-validation failed or the history is too short for a single fold.
+    """
+    if model_selection == "Prophet":
+        df_cv = get_model_cv(entry, cross_validate_prophet, entry['model'])
+        actual_column, predicted_column = 'y', 'yhat'
+    else:
+        df_cv = get_model_cv(entry, cross_validation_arima, data, entry['model'])
+        actual_column, predicted_column = 'Actual', 'Predicted'
+    if df_cv.empty:
+        return None
+    return compute_metrics(df_cv[actual_column], df_cv[predicted_column])
+
+def metrics_accuracy(metrics):
+    """
+    Return the accuracy (100 - MAPE) of cross-validation metrics, or None without metrics.
+    """
+    return None if metrics is None else 100 - metrics['mape']
+
+def forecast_job(ticker, data, model_selection, years=1, interval_method=INTERVAL_METHOD):
+    """
+    Fit (or reuse) a model and forecast the requested number of years. Runs in a worker process.
+
+    Args:
+        ticker (str): Ticker symbol.
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+        model_selection (str): 'Prophet' or 'ARIMA'.
+        years (int): Forecast horizon in years.
+        interval_method (str): Prediction interval method ('analytic', 'simulation' or 'none').
+
+    Returns:
+        dict: Forecast records (Date, Forecast, Lower, Upper), cross-validation metrics and accuracy
+            (both None if the model could not be cross-validated).
+    """
+    entry = fit_entry(ticker, data, model_selection)
+    period = years * 365
+
+    if model_selection == "Prophet":
+        forecast = forecast_prophet_model(entry['model'], period, interval_method=interval_method)
+        forecast = forecast.rename(columns={'ds': 'Date', 'yhat': 'Forecast', 'yhat_lower': 'Lower', 'yhat_upper': 'Upper'})
+    else:
+        forecast = forecast_arima_model(entry['model'], data, period, interval_method=interval_method)
+    forecast = forecast[[column for column in ['Date', 'Forecast', 'Lower', 'Upper'] if column in forecast]]
+
+    metrics = cv_metrics(entry, data, model_selection)
+    return {
+        'ticker': ticker,
+        'model': model_selection,
+        'years': years,
+        'forecast': frame_records(forecast),
+        'metrics': metrics,
+        'accuracy': metrics_accuracy(metrics),
+    }
+
+def metrics_job(ticker, data, model_selection):
+    """
+    Fit (or reuse) a model and return its cross-validation metrics. Runs in a worker process.
+
+    Args:
+        ticker (str): Ticker symbol.
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+        model_selection (str): 'Prophet' or 'ARIMA'.
+
+    Returns:
+        dict: Cross-validation metrics and accuracy (both None if the model could not be cross-validated).
+    """
+    entry = fit_entry(ticker, data, model_selection)
+    metrics = cv_metrics(entry, data, model_selection)
+    return {'ticker': ticker, 'model': model_selection, 'metrics': metrics, 'accuracy': metrics_accuracy(metrics)}
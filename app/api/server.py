@@ -0,0 +1,201 @@
+"""
+Local async HTTP service exposing data loading and forecasting over JSON.
+
+Endpoints:
+    GET  /health                 Liveness check.
+    GET  /data/{ticker}?years=5  Historical data of a ticker.
+    POST /forecast               {"ticker": "AAPL", "model": "Prophet", "years": 1}
+    POST /metrics                {"ticker": "AAPL", "model": "ARIMA"}
+    POST /batch                  {"requests": [{"ticker": ..., "model": ..., "years": ...}, ...]}
+                                 Streams one NDJSON line per request, in completion order.
+
+Data loading runs on a thread pool and model fitting on a process pool, so the event loop
+only handles I/O.
+
+Usage (from the repository root):
+    python -m app.api.server --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from aiohttp import web
+from app.data.loader import fetch_history
+from app.api.jobs import MODELS, frame_records, forecast_job, metrics_job
+
+# Service settings, overridable through environment variables or command-line options
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "0")) or os.cpu_count()  # Worker processes for model fitting
+SERVICE_IO_THREADS = int(os.getenv("SERVICE_IO_THREADS", "16"))             # Threads for data loading
+MAX_BATCH_SIZE = int(os.getenv("SERVICE_MAX_BATCH", "500"))                 # Maximum requests per batch
+
+routes = web.RouteTableDef()
+
+async def run_io(app, fn, *args):
+    """
+    Run a blocking I/O call on the thread pool.
+    """
+    return await asyncio.get_running_loop().run_in_executor(app['io_pool'], partial(fn, *args))
+
+async def run_cpu(app, fn, *args):
+    """
+    Run a CPU-bound call on the process pool.
+    """
+    return await asyncio.get_running_loop().run_in_executor(app['cpu_pool'], partial(fn, *args))
+
+def parse_request(body, with_years=True):
+    """
+    Validate a forecast or metrics request body.
+
+    Args:
+        body (dict): Decoded JSON body.
+        with_years (bool): Whether the request carries a forecast horizon.
+
+    Returns:
+        tuple: Ticker, model and (if `with_years`) years.
+
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object.")
+    ticker = str(body.get('ticker', '')).strip().upper()
+    if not ticker or len(ticker.split()) != 1:
+        raise ValueError("'ticker' must be a single ticker symbol.")
+    model = body.get('model', 'Prophet')
+    if model not in MODELS:
+        raise ValueError(f"'model' must be one of {MODELS}.")
+    if not with_years:
+        return ticker, model
+    years = body.get('years', 1)
+    if not isinstance(years, int) or not 1 <= years <= 5:
+        raise ValueError("'years' must be an integer between 1 and 5.")
+    return ticker, model, years
+
+async def load_close(app, ticker):
+    """
+    Load the 'Date' and 'Close' columns of a ticker, raising LookupError if there is no data.
+    """
+    data = await run_io(app, fetch_history, ticker)
+    if data is None or data.empty:
+        raise LookupError(f"No data found for ticker {ticker}.")
+    return data[['Date', 'Close']]
+
+async def read_json(request):
+    try:
+        return await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text=json.dumps({'error': "Invalid JSON body."}), content_type='application/json')
+
+def error_response(status, message):
+    return web.json_response({'error': message}, status=status)
+
+@routes.get('/health')
+async def health(request):
+    return web.json_response({'status': 'ok'})
+
+@routes.get('/data/{ticker}')
+async def get_data(request):
+    ticker = request.match_info['ticker'].upper()
+    try:
+        years = int(request.query.get('years', 5))
+    except ValueError:
+        years = None
+    if years is None or not 1 <= years <= 5:
+        return error_response(400, "'years' must be an integer between 1 and 5.")
+    data = await run_io(request.app, fetch_history, ticker, years)
+    if data is None or data.empty:
+        return error_response(404, f"No data found for ticker {ticker}.")
+    return web.json_response({'ticker': ticker, 'data': frame_records(data)}, dumps=partial(json.dumps, default=str))
+
+@routes.post('/forecast')
+async def post_forecast(request):
+    try:
+        ticker, model, years = parse_request(await read_json(request))
+        data = await load_close(request.app, ticker)
+    except ValueError as e:
+        return error_response(400, str(e))
+    except LookupError as e:
+        return error_response(404, str(e))
+    try:
+        result = await run_cpu(request.app, forecast_job, ticker, data, model, years)
+    except Exception as e:
+        return error_response(500, str(e))
+    return web.json_response(result, dumps=partial(json.dumps, default=str))
+
+@routes.post('/metrics')
+async def post_metrics(request):
+    try:
+        ticker, model = parse_request(await read_json(request), with_years=False)
+        data = await load_close(request.app, ticker)
+    except ValueError as e:
+        return error_response(400, str(e))
+    except LookupError as e:
+        return error_response(404, str(e))
+    try:
+        result = await run_cpu(request.app, metrics_job, ticker, data, model)
+    except Exception as e:
+        return error_response(500, str(e))
+    return web.json_response(result, dumps=partial(json.dumps, default=str))
+
+@routes.post('/batch')
+async def post_batch(request):
+    body = await read_json(request)
+    items = body.get('requests') if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        return error_response(400, "'requests' must be a non-empty list.")
+    if len(items) > MAX_BATCH_SIZE:
+        return error_response(400, f"A batch holds at most {MAX_BATCH_SIZE} requests.")
+
+    async def run_one(index, item):
+        try:
+            ticker, model, years = parse_request(item)
+            data = await load_close(request.app, ticker)
+            result = await run_cpu(request.app, forecast_job, ticker, data, model, years)
+        except Exception as e:
+            result = {'error': str(e)}
+        return {'index': index, **result}
+
+    # Stream each result as soon as it completes, so large batches never sit in memory
+    response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+    await response.prepare(request)
+    for next_result in asyncio.as_completed([run_one(i, item) for i, item in enumerate(items)]):
+        result = await next_result
+        await response.write((json.dumps(result, default=str) + "\n").encode())
+    await response.write_eof()
+    return response
+
+def create_app(workers=SERVICE_WORKERS, io_threads=SERVICE_IO_THREADS):
+    """
+    Create the aiohttp application with its thread and process pools.
+
+    Args:
+        workers (int): Number of worker processes for model fitting.
+        io_threads (int): Number of threads for data loading.
+
+    Returns:
+        web.Application: The configured application.
+    """
+    app = web.Application()
+    app['io_pool'] = ThreadPoolExecutor(max_workers=io_threads)
+    app['cpu_pool'] = ProcessPoolExecutor(max_workers=workers)
+    app.add_routes(routes)
+
+    async def shutdown_pools(app):
+        app['io_pool'].shutdown(wait=False, cancel_futures=True)
+        app['cpu_pool'].shutdown(wait=False, cancel_futures=True)
+
+    app.on_cleanup.append(shutdown_pools)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Finance Predictor forecasting service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Worker processes for model fitting.")
+    args = parser.parse_args()
+    web.run_app(create_app(args.workers), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from .layout import *
 from .action_selector import *
+from .portfolio import *
+from .screener import *
 from app.data import *
 from app.models import *
\ No newline at end of file
@@ -3,7 +3,7 @@ from app.components.explore import explore_section
 from app.components.forecast import forecast_section
 from app.components.ask_ai import ask_ai_section
 
-def action_selector(data, ticker):
+def action_selector(data, ticker, info_future=None):
     """
     Display buttons for the user to choose an action (Explore, Ask AI, or Forecast) 
     and navigate to the corresponding section.
@@ -11,6 +11,7 @@ def action_selector(data, ticker):
     Args:
         data (pd.DataFrame): DataFrame containing the data to be used in each section.
         ticker (str): The ticker symbol of the stock or asset being analyzed.
+        info_future (Future): Metadata fetch already started for the page, or None.
     """
     st.sidebar.divider()
 
@@ -45,7 +46,7 @@ def action_selector(data, ticker):
     if "selected_section" in st.session_state:
         section = st.session_state.selected_section
         if section == "🔍 Explore":
-            explore_section(data, ticker)
+            explore_section(data, ticker, info_future)
         elif section == "🤖 Ask AI":
             ask_ai_section(data, ticker)
         elif section == "🔮 Forecast":
@@ -1,10 +1,26 @@
+import os
 import streamlit as st
 import openai
 from langchain_openai import ChatOpenAI
 from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
+from ..data import get_profile, profile_prompt
 from ..models import *
+from .state import set_output, get_output
+from .profiling import profiled
 import time 
 
+# Maximum reasoning steps of the agent per question, overridable through an environment variable
+ASK_AI_MAX_ITERATIONS = int(os.getenv("ASK_AI_MAX_ITERATIONS", "6"))
+
+AGENT_PREFIX = """You are a financial analyst answering questions about {ticker}.
+A precomputed profile of its daily price data is given below. Answer from the profile whenever it is enough.
+Only when the question needs values the profile does not contain, use the tools below on the pandas dataframe `df`,
+which holds the full daily data with the columns listed in the profile. Do not print the dataframe to explore it.
+
+{profile}
+
+You should use the tools below to answer the question posed of you:"""
+
 def is_running():
     st.session_state.running = True
 
@@ -17,6 +33,32 @@ def check_openai_api_key(api_key):
     else:
         return True
 
+def create_ask_ai_agent(llm, data, ticker, verbose=True):
+    """
+    Create the agent answering questions about a ticker from its precomputed profile.
+
+    The profile (schema, statistics, returns, volatility, extremes, monthly aggregates) is part
+    of the prompt, so most questions are answered without running code; the daily data stays
+    available to the Python tool but is not printed into the prompt.
+
+    Args:
+        llm: Chat model driving the agent.
+        data (pd.DataFrame): Historical data of the ticker.
+        ticker (str): The ticker symbol.
+        verbose (bool): Print the agent's steps.
+
+    Returns:
+        AgentExecutor: The agent.
+    """
+    profile = profile_prompt(get_profile(data), ticker)
+    # The prefix becomes part of a prompt template, so literal braces must be escaped
+    prefix = AGENT_PREFIX.format(ticker=ticker, profile=profile.replace("{", "{{").replace("}", "}}"))
+    return create_pandas_dataframe_agent(
+        llm, data, prefix=prefix, include_df_in_prompt=False,
+        max_iterations=ASK_AI_MAX_ITERATIONS, verbose=verbose, allow_dangerous_code=True,
+    )
+
+@profiled("ask_ai")
 def ask_ai_section(data, ticker):
     st.markdown(f"<h2 style='text-align: center;'>🤖 Ask AI about {ticker}</h2>", unsafe_allow_html=True)
     st.markdown("🤖 Using LangChain and OpenAI (gpt-4o mini), this AI can answer questions about price, volume, trends, and other financial metrics  for the selected ticker.")
@@ -47,9 +89,9 @@ def ask_ai_section(data, ticker):
                 if user_prompt.strip():
                     with st.spinner("Generating response...🤖"):
                         llm = ChatOpenAI(api_key=openai_api_key, temperature=0.9, model_name='gpt-4o-mini')
-                        agent = create_pandas_dataframe_agent(llm, data, verbose=True, allow_dangerous_code=True)
+                        agent = create_ask_ai_agent(llm, data, ticker)
                         response = agent.invoke(user_prompt)
-                    st.session_state.output_generate = response["output"]
+                    set_output('output_generate', response["output"])
                     st.session_state.output_warning = None
                 else:
                     time.sleep(0.01)
@@ -64,7 +106,8 @@ def ask_ai_section(data, ticker):
         st.session_state.running = False
         st.rerun()
 
-    if st.session_state.output_generate:
-        st.write(st.session_state.output_generate)
+    output_generate = get_output('output_generate')
+    if output_generate:
+        st.write(output_generate)
     if st.session_state.output_warning:
         st.warning(st.session_state.output_warning)
\ No newline at end of file
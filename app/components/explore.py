@@ -1,22 +1,62 @@
-from ..data import plot_data, get_ticker_info
+from ..data import plot_data, submit_info_fetch, display_ticker_info
 from .utils import *
+from .intraday import intraday_section
 import streamlit as st
 
-def explore_section(data, ticker):
+def explore_section(data, ticker, info_future=None):
     """
     Display detailed stock, price, and business information for the given ticker, and show historical data plots.
 
+    The history is displayed right away while the metadata, fetched concurrently with it (see
+    `start_info_fetch`), is displayed as soon as it arrives.
+
     Args:
-        data (pd.DataFrame): Historical data for the selected ticker.
+        data (pd.DataFrame): Historical data for the selected ticker, or None if it could not be loaded.
         ticker (str): The ticker symbol of the stock or asset being analyzed.
+        info_future (Future): Metadata fetch already started for the page, or None to start it now.
     """
     st.markdown(f"<h2>🔍 Explore Data of {ticker}</h2>", unsafe_allow_html=True)
 
-    # Display the ticker information DataFrame
-    get_ticker_info(ticker)
+    # The metadata fetch runs while the history renders
+    if info_future is None:
+        info_future = submit_info_fetch(ticker)
+
+    # One placeholder per part of the page, in display order
+    info_placeholder = st.container()
+    st.write("#####")
+    history_placeholder = st.container()
+
+    with info_placeholder:
+        info_loading = st.empty()
+        info_loading.caption("⏳ Loading ticker information...")
+
+    if data is not None:
+        with history_placeholder:
+            display_history(data)
+
+    try:
+        info = info_future.result()
+    except Exception as e:
+        info_loading.empty()
+        info_placeholder.error(f"❌ Error fetching data for {ticker}: {e}")
+    else:
+        info_loading.empty()
+        with info_placeholder:
+            # Display the ticker information DataFrames
+            display_ticker_info(ticker, info)
 
     st.write("#####")
 
+    # Intraday bars, stored locally and aggregated on demand
+    intraday_section(ticker)
+
+def display_history(data):
+    """
+    Display the historical data table and chart of a ticker.
+
+    Args:
+        data (pd.DataFrame): Historical data for the selected ticker.
+    """
     st.write("Historical Data")
     # Show historical data using a custom function
     display_data(data, data, "historical", None)
@@ -1,6 +1,12 @@
+import time
+import numpy as np
+import pandas as pd
 import streamlit as st
 from ..models import *
+from ..data import data_fingerprint, prepare_data, plot_close, future_sessions
 from .utils import *
+from .state import set_output, get_output
+from .profiling import profiled
 
 def is_running():
     st.session_state.running = True
@@ -42,12 +48,26 @@ def forecast_section(data, ticker):
     # Check if the selected model has changed
     if st.session_state.previous_model != model_selection:
         # If the model has changed, reset session state for output prediction
-        st.session_state.output_predict = None  # Clear the stored prediction data
+        set_output('output_predict', None)  # Clear the stored prediction data
         st.session_state.running = False  # Reset the running flag if needed
 
         # Store the current selected model as the previous one for future comparisons
         st.session_state.previous_model = model_selection
 
+    # Checkbox to tune the model before fitting (saved per ticker for later fits)
+    if model_selection == "Prophet":
+        tune = st.sidebar.checkbox(
+            "Tune hyperparameters",
+            disabled=st.session_state.running,
+            help="Search changepoint/seasonality priors and seasonality mode with parallel cross-validation. Slower, but often more accurate for volatile assets."
+        )
+    else:
+        tune = st.sidebar.checkbox(
+            "Parallel order search",
+            disabled=st.session_state.running,
+            help=f"Search ARIMA orders, including weekly seasonal ones, on all cores within {ARIMA_SEARCH_BUDGET:.0f} seconds."
+        )
+
     st.sidebar.write('######')
 
     # Button to trigger the prediction process
@@ -58,25 +78,44 @@ def forecast_section(data, ticker):
     )
 
     if predict_pressed:
-        handle_models(data, period, model_selection)
+        handle_models(data, period, model_selection, ticker, tune)
+
+    # If only the horizon changed, re-forecast from the shared fit without waiting for "Predict"
+    elif (
+        st.session_state.output_predict
+        and st.session_state.previous_period not in (None, period)
+        and get_model_registry().get(model_key(ticker, data[['Date', 'Close']], model_selection, load_model_params(ticker, model_selection))) is not None
+    ):
+        handle_models(data, period, model_selection, ticker)
 
     # Display the forecast results
-    if "output_predict" in st.session_state and st.session_state.output_predict:
-        # Retrieve stored results
-        forecast_fig, m_accuracy, metrics_df, forecast, data = st.session_state.output_predict
+    output_predict = get_output('output_predict')
+    if output_predict:
+        # Retrieve stored results (the historical data comes from the shared data cache)
+        forecast_fig, m_accuracy, metrics_df, forecast, cv_progress = output_predict
         model_selection = st.session_state.previous_model
         ticker = st.session_state.previous_ticker
 
-        display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, data, model_selection, ticker)
+        display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, data, model_selection, ticker, cv_progress)
 
-def handle_models(data, period, model_selection):
+@profiled("forecast")
+def handle_models(data, period, model_selection, ticker, tune=False):
     """
     Function to fit the selected forecasting model and generate predictions.
 
+    Fitted models and their cross-validation results are shared across sessions through the
+    model registry, so a new horizon or a repeated request reuses the existing fit.
+
+    Results render in stages: the historical chart right away, the forecast as soon as the fit
+    returns, then the metrics fold by fold while cross-validation runs. Each stage is stored as
+    it completes, so cancelling the cross-validation keeps the forecast and the folds done so far.
+
     Args:
         data : Historical data.
         period: The number of days to forecast into the future.
         model_selection: The forecasting model selected by the user.
+        ticker: Ticker symbol of the asset being forecasted.
+        tune: Whether to tune the model hyperparameters before fitting.
 
     Returns:
         None: Updates the session state with forecast results, accuracy, and evaluation metrics.
@@ -84,36 +123,120 @@ def handle_models(data, period, model_selection):
     # Filter to only the 'Date' and 'Close' columns required for the models
     data = data[['Date', 'Close']]
 
+    # Placeholders filled as each stage completes
+    st.markdown(f"<h2>🔮 Forecast Data for {ticker} with {model_selection}</h2>", unsafe_allow_html=True)
+    chart_area = st.empty()
+    progress_area = st.empty()
+    metrics_area = st.empty()
+    cancel_area = st.empty()
+
+    # Stage 1: the historical prices, immediately
+    chart_area.plotly_chart(plot_close(data), use_container_width=True)
+
     if model_selection == "Prophet":
-        # Fit the Prophet model and cross-validate
+        # Use the parameters saved by a previous tuning run, or tune them now
+        params = load_model_params(ticker, model_selection)
+        if tune:
+            try:
+                with st.spinner('🎛️ Tuning the crystal ball... 🧪'):
+                    params, _ = tune_prophet(data, ticker)
+            except ValueError as e:
+                st.warning(f"⚠️ {e} Keeping the current parameters.")
+
+        # Fit the Prophet model (or reuse an existing fit)
         with st.spinner('🔮 Fitting the crystal ball... 🧙‍♂️'):
-            m, forecast = fit_prophet_model(data, period)
-        with st.spinner('🤹‍♂️ Juggling some numbers... 🤔'):
-            df_cv = cross_validate_prophet(m)
-        metrics_df = calculate_metrics(df_cv['y'], df_cv['yhat'])  # Calculate performance metrics
+            entry = get_fitted_model(ticker, data, model_selection, params)
+        if entry is None:
+            st.session_state.running = False
+            st.error("❌ Unable to fit the model. Please try again later.")
+            return
+        m = entry['model']
+        forecast = forecast_prophet_model(m, period)
+        forecast = forecast[[column for column in ['ds', 'yhat', 'yhat_lower', 'yhat_upper'] if column in forecast]]  # Keep only displayed columns
         forecast_fig = plot_prophet_forecast(m, forecast)  # Plot the forecast
+        folds = lambda: cross_validate_prophet_folds(m)
+        actual_column, predicted_column = 'y', 'yhat'
 
     elif model_selection == "ARIMA":
-        # Fit the ARIMA model and cross-validate
+        # Search the ARIMA order in parallel and share the best model, or use the saved order
+        if tune:
+            with st.spinner(f'🔎 Searching ARIMA orders (up to {ARIMA_SEARCH_BUDGET:.0f}s)...'):
+                m, _ = search_arima_order(data, ticker)
+            if m is not None:
+                get_model_registry().put(model_key(ticker, data, model_selection, load_model_params(ticker, model_selection)), m)
+        params = load_model_params(ticker, model_selection)
+
+        # Fit the ARIMA model (or reuse an existing fit)
         with st.spinner('🔮 Fitting the ARIMA model...'):
-            m, forecast = fit_arima_model(data, period) 
-        with st.spinner('🤹‍♂️ Juggling some numbers... 🤔'):
-            df_cv = cross_validation_arima(data, m) 
-        metrics_df = calculate_metrics(df_cv['Actual'], df_cv['Predicted'])  # Calculate performance metrics
+            entry = get_fitted_model(ticker, data, model_selection, params)
+        if entry is None:
+            st.session_state.running = False
+            st.error("❌ Unable to fit the model. Please try again later.")
+            return
+        m = entry['model']
+        forecast = forecast_arima_model(m, data, period)
         forecast_fig = plot_arima_forecast(data, forecast)  # Plot the forecast
-
-    # Extract the MAPE and compute the accuracy
-    global_mape = metrics_df.loc['MAPE (Mean Absolute Percentage Error)', 'Value'].strip('%')
-    m_accuracy = 100 - float(global_mape)
+        folds = lambda: cross_validation_arima_folds(data, m)
+        actual_column, predicted_column = 'Actual', 'Predicted'
+
+    # Stage 2: the forecast, as soon as the fit returns
+    chart_area.plotly_chart(forecast_fig, use_container_width=True)
+    set_output('output_predict', (forecast_fig, None, None, forecast, (0, None)))
+    st.session_state.previous_period = period
+
+    def run_folds():
+        fold_results = []
+        for fold, n_folds, df_fold in folds():
+            fold_results.append(df_fold)
+            df_cv = pd.concat(fold_results, ignore_index=True)
+            metrics_df = calculate_metrics(df_cv[actual_column], df_cv[predicted_column])
+            set_output('output_predict', (forecast_fig, metrics_accuracy(metrics_df), metrics_df, forecast, (fold, n_folds)))
+
+            progress_area.progress(fold / n_folds, text=f"🤹‍♂️ Cross-validation: {fold} of {n_folds} folds done")
+            metrics_area.dataframe(metrics_df, width=800)
+        if not fold_results:
+            return pd.DataFrame(columns=[actual_column, predicted_column])  # History too short for a single fold
+        return pd.concat(fold_results, ignore_index=True)
+
+    # Stage 3: the cross-validation metrics, fold by fold. Sessions predicting the same model share
+    # one cross-validation: followers wait for the leader's folds instead of running their own.
+    df_cv = get_model_registry().get_result(entry, 'cv')
+    if df_cv is None:
+        cancel_area.button("⏹️ Stop cross-validation", on_click=cancel_cross_validation, key='cancel_cv_button')
+        with st.spinner('🤹‍♂️ Cross-validating the model...'):
+            df_cv = get_model_cv(entry, run_folds)
+        cancel_area.empty()
+
+    if df_cv.empty:
+        # The cross-validation failed or no fold fits in the history, so there is nothing to score the model on
+        set_output('output_predict', (forecast_fig, None, None, forecast, (0, 0)))
+        st.session_state.running = False
+        st.rerun()
+
+    metrics_df = calculate_metrics(df_cv[actual_column], df_cv[predicted_column])  # Calculate performance metrics
 
     # Store forecast results in session state for display
-    st.session_state.output_predict = (forecast_fig, m_accuracy, metrics_df, forecast, data)
+    set_output('output_predict', (forecast_fig, metrics_accuracy(metrics_df), metrics_df, forecast, None))
 
     # Reset running state and rerun the app to update with new results
     st.session_state.running = False
     st.rerun()
 
-def display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, data, model_selection, ticker):
+def metrics_accuracy(metrics_df):
+    """
+    Compute the model accuracy (100 - MAPE) from a metrics DataFrame returned by `calculate_metrics`.
+    """
+    global_mape = metrics_df.loc['MAPE (Mean Absolute Percentage Error)', 'Value'].strip('%')
+    return 100 - float(global_mape)
+
+def cancel_cross_validation():
+    """
+    Stop the running cross-validation. The click reruns the script, which interrupts the
+    current run; the forecast and the folds already done stay stored.
+    """
+    st.session_state.running = False
+
+def display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, data, model_selection, ticker, cv_progress=None):
     """
     Function to display forecast results.
 
@@ -125,6 +248,8 @@ def display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, dat
         data: Historical data.
         model_selection: Name of the selected forecasting model.
         ticker: Ticker symbol of the asset being forecasted.
+        cv_progress: (folds done, total folds) if the cross-validation was stopped early, (0, 0) if it
+            failed or the history is too short for any fold, None if it completed.
     """
     # Display forecast data and model selection
     st.markdown(f"<h2>🔮 Forecast Data for {ticker} with {model_selection}</h2>", unsafe_allow_html=True)
@@ -133,7 +258,24 @@ def display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, dat
     display_data(data, forecast, "forecast", model_selection)
 
     # Show model accuracy
-    st.markdown(f"<h5 class='model-accuracy'>{model_selection} Model Accuracy: {m_accuracy:.2f}%</h5>", unsafe_allow_html=True)
+    if m_accuracy is not None:
+        st.markdown(f"<h5 class='model-accuracy'>{model_selection} Model Accuracy: {m_accuracy:.2f}%</h5>", unsafe_allow_html=True)
+    if cv_progress:
+        done, total = cv_progress
+        if not total:
+            st.caption("The model could not be cross-validated (the history may be too short): accuracy and metrics are unavailable.")
+        elif done:
+            st.caption(f"Cross-validation stopped after {done} of {total} folds: accuracy and metrics are partial. Press 'Predict' to complete it.")
+        else:
+            st.caption("Cross-validation stopped before its first fold. Press 'Predict' to compute the accuracy and metrics.")
+
+    # Show the tuned parameters, if any
+    record = load_tuning_record(ticker, model_selection)
+    if record:
+        caption = "Tuned parameters: " + ", ".join(f"{name}={value}" for name, value in record['params'].items())
+        if 'evaluated' in record:
+            caption += f" ({record['evaluated']}/{record['candidates']} candidates evaluated in {record['elapsed']:.1f}s)"
+        st.caption(caption)
 
     # Tip for interacting with the chart
     st.markdown(
@@ -171,7 +313,106 @@ def display_forecast_results(forecast_fig, m_accuracy, metrics_df, forecast, dat
         """, unsafe_allow_html=True)
 
     # Display the metrics DataFrame
-    st.dataframe(metrics_df, width=800)
+    if metrics_df is not None:
+        st.dataframe(metrics_df, width=800)
+
+    # Display the historical accuracy stored by the walk-forward backtest, if any
+    display_backtest(ticker, model_selection)
+
+    st.write('#####')
+
+    # Display the Monte Carlo scenario analysis
+    display_scenarios(data, forecast, model_selection, ticker)
+
+def display_backtest(ticker, model_selection):
+    """
+    Display the historical accuracy of the model from the backtest results store.
+
+    Args:
+        ticker: Ticker symbol of the asset being forecasted.
+        model_selection: Name of the selected forecasting model.
+    """
+    results = load_backtest_results(ticker, model_selection)
+    if results.empty:
+        st.caption(f"No walk-forward backtest stored for {ticker} with {model_selection}. "
+                   f"Run `python scripts/backtest.py --tickers {ticker} --models {model_selection}` to add one.")
+        return
+
+    with st.expander(f"📜 Historical Accuracy (walk-forward backtest over {results['cutoff'].nunique()} cutoffs)"):
+        summary = backtest_summary(results)
+        st.dataframe(summary.style.format({'MAPE': "{:.2f}%", 'MAE': "{:.2f}", 'RMSE': "{:.2f}"}), width=800)
+        st.caption(f"Average errors of forecasts made at each cutoff from "
+                   f"{results['cutoff'].min():%Y-%m-%d} to {results['cutoff'].max():%Y-%m-%d}, by horizon.")
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_scenarios(fingerprint, model_id, horizon, n_paths, method, periods_per_year, _prices, _innovations, _base_path):
+    """
+    Run the scenario engine, cached by data fingerprint, model and simulation settings
+    (the underscored arguments are derived from them and not hashed).
+    """
+    return simulate_scenarios(
+        _prices, horizon, n_paths=n_paths, method=method, periods_per_year=periods_per_year,
+        innovations=_innovations, base_path=_base_path, seed=0
+    )
+
+def display_scenarios(data, forecast, model_selection, ticker):
+    """
+    Display a Monte Carlo scenario analysis: quantile fan, threshold probabilities and Value at Risk.
+
+    Args:
+        data: Historical data.
+        forecast: Forecasted data of the selected model (base path of the 'residual' method).
+        model_selection: Name of the selected forecasting model.
+        ticker: Ticker symbol of the asset being forecasted.
+    """
+    with st.expander("🎲 Scenario Analysis (Monte Carlo)"):
+        col1, col2 = st.columns(2)
+        method_labels = {
+            "bootstrap": "Bootstrapped returns",
+            "gbm": "Geometric Brownian motion",
+            "residual": f"{model_selection} forecast + residuals",
+        }
+        method = col1.selectbox("Simulation method", SCENARIO_METHODS, format_func=method_labels.get)
+        n_paths = col2.select_slider("Number of paths", options=[1_000, 5_000, 10_000, 20_000], value=10_000)
+
+        # Simulate the displayed horizon, one period per trading session of the asset
+        n_years = max(1, (st.session_state.previous_period or 365) // 365)
+        prices = data['Close'].to_numpy(dtype=float)
+        span_years = (data['Date'].iloc[-1] - data['Date'].iloc[0]).days / 365.25
+        periods_per_year = int(round(len(data) / span_years))
+        dates = future_sessions(data['Date'], n_years * 365)
+        horizon = len(dates)
+
+        innovations = base_path = None
+        params = load_model_params(ticker, model_selection)
+        if method == "residual":
+            entry = get_model_registry().get(model_key(ticker, data[['Date', 'Close']], model_selection, params))
+            if entry is None:
+                st.info("The fitted model is no longer available. Please press 'Predict' again to use its residuals.")
+                return
+            # The model was fitted on the preprocessed series
+            innovations = model_innovations(entry['model'], prepare_data(data)['Close'].to_numpy())
+            forecast_dates, forecast_values = (
+                (forecast['ds'], forecast['yhat']) if model_selection == "Prophet" else (forecast['Date'], forecast['Forecast'])
+            )
+            base_path = np.interp(dates.as_unit('ns').asi8, pd.DatetimeIndex(forecast_dates).as_unit('ns').asi8, forecast_values)
+
+        start = time.perf_counter()
+        result = cached_scenarios(
+            data_fingerprint(data[['Date', 'Close']]), f"{ticker}/{model_selection}/{params}", horizon, n_paths, method,
+            periods_per_year, prices, innovations, base_path
+        )
+        elapsed = time.perf_counter() - start
+
+        fig = plot_scenario_fan(data, result['fan'], dates[result['fan']['step'] - 1])
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{n_paths:,} paths × {horizon:,} periods simulated in {elapsed * 1000:.0f} ms.")
+
+        st.write("**Probability of ending above each price**")
+        st.dataframe(result['thresholds'].style.format("{:.1%}"), width=800)
+
+        st.write("**Value at Risk (loss not exceeded at each confidence level) and CVaR (average loss beyond it)**")
+        st.dataframe(result['var'].style.format("{:.1%}"), width=800)
 
 
 
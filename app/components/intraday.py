@@ -0,0 +1,76 @@
+import streamlit as st
+from ..data import INTRADAY_LIMITS, INTRADAY_FIT_BARS, INTRADAY_RAW_BARS, AGGREGATIONS, INTRADAY_MINUTES, ingest_intraday, load_intraday_bars, partitions_version
+from ..models import forecast_intraday, plot_intraday
+from .state import set_output, get_output
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_intraday_forecast(ticker, interval, rule, version, model_selection, periods):
+    """
+    Forecast intraday bars once per store version, aggregation, model and horizon.
+    """
+    return forecast_intraday(load_intraday_bars(ticker, interval, rule), model_selection, periods)
+
+def intraday_section(ticker):
+    """
+    Ingest, aggregate, plot and forecast the intraday bars of a ticker.
+
+    Args:
+        ticker (str): The ticker symbol of the asset being analyzed.
+    """
+    st.write("Intraday Bars")
+    col1, col2 = st.columns(2)
+    with col1:
+        interval = st.selectbox("Bar interval", list(INTRADAY_LIMITS), index=2, disabled=st.session_state.running, key="intraday_interval")
+    with col2:
+        # Only coarser sizes than the stored bars can be aggregated to
+        rules = [None] + [rule for rule, minutes in AGGREGATIONS.items() if minutes > INTRADAY_MINUTES[interval]]
+        rule = st.selectbox(
+            "Aggregate to", rules, format_func=lambda rule: f"No aggregation (last {INTRADAY_RAW_BARS:,} bars)" if rule is None else rule,
+            index=min(2, len(rules) - 1), disabled=st.session_state.running, key="intraday_rule",
+        )
+
+    if st.button("📥 Update intraday bars", disabled=st.session_state.running):
+        progress_bar = st.progress(0.0, text=f"Downloading {interval} bars of {ticker}...")
+        try:
+            written = ingest_intraday(
+                ticker, interval, progress=lambda done, total: progress_bar.progress(done / total, text=f"Downloaded {done}/{total} windows...")
+            )
+            progress_bar.empty()
+            st.success(f"✅ {written:,} {interval} bars stored.")
+        except Exception as e:
+            progress_bar.empty()
+            st.error(f"❌ Unable to download intraday bars: {e}")
+
+    version = partitions_version(ticker, interval)
+    if not version:
+        st.info(f"No {interval} bars stored for {ticker} yet. Press 'Update intraday bars' to download them.")
+        return
+
+    bars = load_intraday_bars(ticker, interval, rule)
+    if bars.empty:
+        st.info(f"No {interval} bars available for {ticker}.")
+        return
+    st.write(f"{len(bars):,} bars from {bars['Date'].iloc[0]:%Y-%m-%d %H:%M} to {bars['Date'].iloc[-1]:%Y-%m-%d %H:%M}")
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        periods = st.number_input("Bars to forecast", 1, 500, 50, disabled=st.session_state.running, key="intraday_periods")
+    with col2:
+        model_selection = st.radio("Model", ("ARIMA", "Prophet"), horizontal=True, disabled=st.session_state.running, key="intraday_model")
+    with col3:
+        st.write("######")
+        predict = st.button("🔮 Forecast", disabled=st.session_state.running, key="intraday_predict")
+
+    settings = (ticker, interval, rule, model_selection, int(periods))
+    if predict:
+        try:
+            with st.spinner(f"🔮 Fitting {model_selection} on the last {min(len(bars), INTRADAY_FIT_BARS):,} bars..."):
+                forecast = cached_intraday_forecast(ticker, interval, rule, version, model_selection, int(periods))
+            set_output('output_intraday', (settings, forecast))
+        except Exception as e:
+            st.error(f"❌ Unable to forecast the intraday bars: {e}")
+
+    # Show the forecast only while its settings are still selected
+    output_intraday = get_output('output_intraday')
+    forecast = output_intraday[1] if output_intraday and output_intraday[0] == settings else None
+    st.plotly_chart(plot_intraday(bars, forecast), use_container_width=True)
@@ -1,5 +1,6 @@
 import streamlit as st
 from app.components.learn_more import *
+from app.components.state import set_output
 
 
 def initialize_app():
@@ -39,14 +40,19 @@ def display_header():
     if st.session_state.page == "Homepage":
         if st.button("Learn More", disabled=st.session_state.running):
             st.session_state.page = "Learn More"
-            st.session_state.output_predict = None
+            set_output('output_predict', None)
+            st.session_state.selected_section = None
+            st.rerun()
+        if st.button("Screener", disabled=st.session_state.running):
+            st.session_state.page = "Screener"
+            set_output('output_predict', None)
             st.session_state.selected_section = None
             st.rerun()
 
-    elif st.session_state.page == "Learn More":
+    elif st.session_state.page in ("Learn More", "Screener"):
         if st.button("Back to Homepage"):
             st.session_state.page = "Homepage"
-            st.session_state.output_predict = None
+            set_output('output_predict', None)
             st.session_state.selected_section = None
             st.rerun()
     
@@ -106,6 +112,20 @@ def initialize_session_state():
     if 'previous_model' not in st.session_state:
         st.session_state.previous_model = None
 
+    # Initialize a variable to track the forecast period of the displayed prediction
+    if 'previous_period' not in st.session_state:
+        st.session_state.previous_period = None
+
+    # Initialize the portfolio input and forecast (portfolio mode)
+    if 'previous_portfolio' not in st.session_state:
+        st.session_state.previous_portfolio = ''
+    if 'output_portfolio' not in st.session_state:
+        st.session_state.output_portfolio = None
+
+    # Initialize the intraday forecast (Explore page)
+    if 'output_intraday' not in st.session_state:
+        st.session_state.output_intraday = None
+
     # Initialize the selected section
     if 'selected_section' not in st.session_state:
         st.session_state.selected_section = None
\ No newline at end of file
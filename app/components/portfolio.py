@@ -0,0 +1,116 @@
+import pandas as pd
+import streamlit as st
+from ..data import parse_portfolio, data_fingerprint
+from ..models import portfolio_statistics, periods_per_year, forecast_portfolio, plot_portfolio_forecast, plot_correlation
+from .state import set_output, get_output
+
+def is_running():
+    st.session_state.running = True
+
+def get_user_portfolio():
+    """
+    Prompt the user to enter weighted tickers (e.g., "AAPL:0.6, MSFT:0.4").
+
+    Returns:
+        dict: Normalized weight of each ticker, or None if the input is empty or invalid.
+    """
+    text = st.sidebar.text_input(
+        r"$\textsf{\normalsize Enter\ weighted\ tickers:\ }$",
+        disabled=st.session_state.running,
+        placeholder="e.g. AAPL:0.6, MSFT:0.4",
+        key="portfolio_input",
+    )
+    st.sidebar.button("Go", disabled=st.session_state.running, key="portfolio_go")
+
+    if st.session_state.previous_portfolio != text:
+        # Reset the forecast if the portfolio has changed
+        set_output('output_portfolio', None)
+        st.session_state.running = False
+    st.session_state.previous_portfolio = text
+
+    if not text:
+        return None
+    try:
+        return parse_portfolio(text)
+    except ValueError as e:
+        st.sidebar.error(f"❌ {e}")
+        return None
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_portfolio_forecast(fingerprint, weights, model_selection, period, _data):
+    """
+    Forecast a portfolio, cached by data fingerprint, weights, model and horizon
+    (`_data` is identified by its fingerprint and not hashed).
+    """
+    return forecast_portfolio(_data, dict(weights), model_selection, period)
+
+def portfolio_section(data, weights):
+    """
+    Display the statistics of a weighted portfolio and forecast its value.
+
+    Args:
+        data (pd.DataFrame): Aligned prices, 'Date' column plus one column per ticker.
+        weights (dict): Weight of each ticker.
+    """
+    tickers = list(weights)
+    st.markdown(f"<h2>📂 Portfolio of {', '.join(tickers)}</h2>", unsafe_allow_html=True)
+
+    # Return and risk statistics, computed on the aligned price matrix
+    annualization = periods_per_year(data['Date'])
+    stats = portfolio_statistics(data[tickers].to_numpy(dtype=float), [weights[ticker] for ticker in tickers], annualization)
+    stats_df = pd.DataFrame({
+        'Weight': [weights[ticker] for ticker in tickers] + [1.0],
+        'Annual Return': list(stats['mean']) + [stats['portfolio_return']],
+        'Annual Volatility': list(stats['volatility']) + [stats['portfolio_volatility']],
+        'Risk Contribution': list(stats['risk_contribution']) + [1.0],
+    }, index=tickers + ['Portfolio'])
+    st.write(f"Statistics of daily log returns over {len(data):,} common dates, annualized")
+    st.dataframe(stats_df.style.format("{:.1%}"), width=800)
+
+    st.write("#####")
+
+    st.write("Correlation of Returns")
+    st.plotly_chart(plot_correlation(stats['corr'], tickers), use_container_width=True)
+
+    st.sidebar.write("####")
+
+    # Forecast settings
+    n_years = st.sidebar.slider(
+        r"$\textsf{\normalsize Years\ of\ prediction:}$",
+        1, 5, disabled=st.session_state.running, key="portfolio_years"
+    )
+    period = n_years * 365
+    model_selection = st.sidebar.radio(
+        r"$\textsf{\normalsize Select\ ML\ model:}$",
+        ("Prophet", "ARIMA"),
+        disabled=st.session_state.running, key="portfolio_model"
+    )
+
+    st.sidebar.write('######')
+
+    if st.sidebar.button("Predict", disabled=st.session_state.running, on_click=is_running, key='portfolio_predict'):
+        try:
+            with st.spinner(f'🔮 Fitting {len(tickers)} {model_selection} models in parallel... 🧙‍♂️'):
+                history, forecast = cached_portfolio_forecast(
+                    data_fingerprint(data), tuple(weights.items()), model_selection, period, data
+                )
+            set_output('output_portfolio', (history, forecast, model_selection))
+        except Exception as e:
+            st.error(f"❌ Unable to forecast the portfolio: {e}")
+        st.session_state.running = False
+        st.rerun()
+
+    output_portfolio = get_output('output_portfolio')
+    if output_portfolio:
+        history, forecast, model_selection = output_portfolio
+        st.write("#####")
+        st.markdown(f"<h2>🔮 Portfolio Forecast with {model_selection}</h2>", unsafe_allow_html=True)
+        st.write(f"Value of ${history['Value'].iloc[-1]:,.0f} invested today with the given weights")
+        fig = plot_portfolio_forecast(history, forecast)
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+
+        display_df = forecast.assign(Date=forecast['Date'].dt.strftime('%Y-%m-%d')).rename(columns={
+            'Forecast': 'Portfolio Value ($)', 'Lower': 'Lower Bound ($)', 'Upper': 'Upper Bound ($)',
+        })
+        st.dataframe(display_df.set_index('Date').round(2), width=800)
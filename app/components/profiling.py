@@ -0,0 +1,150 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+import streamlit as st
+
+# Profiling settings, overridable through environment variables
+APP_PROFILE = os.getenv("APP_PROFILE", "0")                                # '0' (never), 'query' (runs with ?profile=1) or '1' (every run)
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", ".cache/profiles"))             # Where the flame-graph files are written
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "10")) / 1000     # Seconds between two stack samples
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))                         # Number of most recent profiles kept
+PROFILE_MIN_SECONDS = float(os.getenv("PROFILE_MIN_SECONDS", "0.5"))       # Shorter runs are not written
+PROFILE_ALL_THREADS = os.getenv("PROFILE_ALL_THREADS", "0") == "1"          # Sample every thread, not only the profiled one
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the Python stacks of running threads from a background thread.
+
+    Every `interval` seconds the current frame of each sampled thread is walked up to its root
+    and counted, so the overhead stays constant whatever the profiled code does (including
+    time spent in native code such as Stan or BLAS, attributed to the calling Python frame).
+    Stacks are kept in the folded format read by flame-graph tools (flamegraph.pl, speedscope).
+
+    Args:
+        thread_id (int): Identifier of the thread to sample, or None to sample every thread.
+        interval (float): Seconds between two samples.
+    """
+
+    def __init__(self, thread_id=None, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.started = self.elapsed = 0.0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="profiler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_id is not None and thread_id != self.thread_id):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                if self.thread_id is None:
+                    stack.append(names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        """
+        Return the samples as folded stacks, one "frame;frame;frame count" line per distinct stack.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+def frame_label(frame):
+    """
+    Name a frame by its function and the file and line where the function starts, so every
+    sample of the same function lands in the same flame-graph box.
+    """
+    code = frame.f_code
+    path = code.co_filename
+    _, site, inner = path.rpartition("site-packages" + os.sep)
+    path = inner if site else os.path.relpath(path) if path.startswith(os.getcwd()) else os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+def profiling_enabled():
+    """
+    Check whether the current run is profiled: always with APP_PROFILE=1, and with APP_PROFILE=query
+    when the page was opened with the `?profile=1` query parameter. Profiling is off otherwise, so
+    visitors cannot turn it on unless the operator allowed it.
+    """
+    if APP_PROFILE != "query":
+        return APP_PROFILE == "1"
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:
+        return False
+
+def save_profile(profiler, label, directory=PROFILE_DIR, keep=PROFILE_KEEP):
+    """
+    Write the folded stacks of a finished profile and delete the oldest profiles beyond `keep`.
+
+    Args:
+        profiler (SamplingProfiler): The stopped profiler.
+        label (str): Name of the profiled function, used in the file name.
+        directory (Path): Directory receiving the profiles.
+        keep (int): Number of most recent profiles kept.
+
+    Returns:
+        Path: The written file.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}-{label}-{profiler.elapsed:.1f}s.folded"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(profiler.folded())
+    os.replace(tmp_path, path)
+
+    profiles = sorted(directory.glob("*.folded"), key=lambda file: file.stat().st_mtime, reverse=True)
+    for old in profiles[keep:]:
+        old.unlink(missing_ok=True)
+    return path
+
+def profiled(label):
+    """
+    Decorator sampling a function's stacks while it runs, when profiling is enabled for the
+    current run, and writing them as a flame-graph file under `PROFILE_DIR`.
+
+    When profiling is disabled, the only cost is one check of the setting and query parameters.
+    The profile is written however the function ends, including Streamlit reruns and stops.
+
+    Args:
+        label (str): Name of the profiled function, used in the file name.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiling_enabled():
+                return fn(*args, **kwargs)
+
+            profiler = SamplingProfiler(None if PROFILE_ALL_THREADS else threading.get_ident())
+            profiler.start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.stop()
+                if profiler.elapsed >= PROFILE_MIN_SECONDS and profiler.samples:
+                    try:
+                        path = save_profile(profiler, label)
+                        print(f"Profile of {label} ({profiler.elapsed:.1f}s, {profiler.samples} samples) written to {path}")
+                    except OSError as e:
+                        print(f"Unable to write the profile of {label}: {e}")
+        return wrapper
+    return decorator
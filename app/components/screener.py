@@ -0,0 +1,133 @@
+import time
+import streamlit as st
+from ..data import (
+    FUNDAMENTAL_FIELDS, FUNDAMENTALS_REFRESH_LIMIT, get_fundamentals, refresh_fundamentals,
+    stale_symbols, screen, get_symbol_index,
+)
+
+# Labels of the snapshot columns shown in the screener
+SCREENER_LABELS = {
+    'symbol': 'Ticker',
+    'name': 'Name',
+    'sector': 'Sector',
+    'industry': 'Industry',
+    'market_cap': 'Market Cap',
+    'enterprise_value': 'Enterprise Value',
+    'price': 'Price',
+    'trailing_pe': 'P/E (TTM)',
+    'forward_pe': 'P/E (FWD)',
+    'peg_ratio': 'PEG Ratio',
+    'price_to_sales': 'P/S Ratio',
+    'price_to_book': 'P/B Ratio',
+    'gross_margin': 'Gross Margin',
+    'operating_margin': 'Operating Margin',
+    'profit_margin': 'Profit Margin',
+    'return_on_equity': 'Return on Equity',
+    'revenue_growth': 'Revenue Growth',
+    'earnings_growth': 'Earnings Growth',
+    'dividend_yield': 'Div Yield',
+    'beta': 'Beta',
+    'employees': 'Employees',
+}
+
+# Columns stored as fractions, shown and filtered as percentages
+PERCENT_COLUMNS = {'gross_margin', 'operating_margin', 'profit_margin', 'return_on_equity', 'revenue_growth', 'earnings_growth', 'dividend_yield'}
+
+# Columns shown in the results, in order
+SCREENER_COLUMNS = ['symbol', 'name', 'sector', 'market_cap', 'price', 'trailing_pe', 'forward_pe', 'peg_ratio', 'profit_margin', 'return_on_equity', 'dividend_yield', 'beta']
+
+def refresh_snapshot(table):
+    """
+    Refresh the fundamentals of the symbols never fetched or least recently updated, with a progress bar.
+
+    Args:
+        table (pd.DataFrame): Current snapshot table.
+    """
+    index = get_symbol_index()
+    listed, _, types = index.entries
+    candidates = [symbol for symbol, quote_type in zip(listed, types) if quote_type == 'EQUITY']
+    symbols = stale_symbols(candidates or list(table['symbol']), table)
+    if not symbols:
+        st.warning("⚠️ No stock symbols to refresh.")
+        return
+
+    progress_bar = st.progress(0.0, text=f"Refreshing fundamentals of {len(symbols):,} stocks...")
+    _, failed = refresh_fundamentals(
+        symbols, progress=lambda done, total: progress_bar.progress(done / total, text=f"Refreshed {done:,}/{total:,} stocks...")
+    )
+    progress_bar.empty()
+    if failed:
+        st.warning(f"⚠️ {len(failed):,} symbols could not be fetched.")
+
+def range_filter(table, column):
+    """
+    Display a range slider over the values of a numeric column.
+
+    Returns:
+        tuple: Selected (minimum, maximum), in the column's units.
+    """
+    values = table[column].dropna()
+    scale = 100 if column in PERCENT_COLUMNS else 1
+    # Bounds from the 1st to the 99th percentile, so a few extreme values do not squash the slider
+    low, high = (float(q) * scale for q in values.quantile([0.01, 0.99]))
+    if low == high:
+        high = low + 1
+    label = SCREENER_LABELS[column] + (" (%)" if scale == 100 else "")
+    selected = st.sidebar.slider(label, low, high, (low, high), key=f"screener_{column}")
+    # An untouched end of the slider means no bound, so the extreme values are kept
+    return (
+        selected[0] / scale if selected[0] > low else None,
+        selected[1] / scale if selected[1] < high else None,
+    )
+
+def format_results(results):
+    """
+    Format the screener results for display.
+    """
+    display_df = results[SCREENER_COLUMNS].copy()
+    display_df['market_cap'] = display_df['market_cap'] / 1e9
+    for column in PERCENT_COLUMNS.intersection(SCREENER_COLUMNS):
+        display_df[column] = display_df[column] * 100
+    labels = {**SCREENER_LABELS, 'market_cap': 'Market Cap ($B)'}
+    labels.update({column: f"{SCREENER_LABELS[column]} (%)" for column in PERCENT_COLUMNS})
+    return display_df.rename(columns=labels).set_index('Ticker').round(2)
+
+def screener_page():
+    """
+    Display the stock screener: filter and rank the fundamentals snapshot of every stored symbol.
+    """
+    st.markdown("<h2>🧮 Stock Screener</h2>", unsafe_allow_html=True)
+    table = get_fundamentals()
+
+    if table.empty:
+        st.info("The fundamentals snapshot is empty. Refresh it to fetch the fundamentals of the listed stocks.")
+    else:
+        age = (time.time() - table['updated_at'].max()) / 3600
+        st.write(f"Snapshot of {len(table):,} stocks, last updated {age:.0f} hours ago")
+
+    if st.button(f"🔄 Refresh up to {FUNDAMENTALS_REFRESH_LIMIT:,} stocks", disabled=st.session_state.running):
+        refresh_snapshot(table)
+        st.rerun()
+
+    if table.empty:
+        return
+
+    # Filters
+    sectors = st.sidebar.multiselect("Sectors", sorted(table['sector'].dropna().unique()), key="screener_sectors")
+    filtered = st.sidebar.multiselect(
+        "Filter by", list(FUNDAMENTAL_FIELDS), default=['market_cap', 'trailing_pe'],
+        format_func=SCREENER_LABELS.get, key="screener_filters",
+    )
+    ranges = {column: range_filter(table, column) for column in filtered if table[column].notna().any()}
+
+    # Ranking
+    sort_by = st.sidebar.selectbox("Rank by", list(FUNDAMENTAL_FIELDS), format_func=SCREENER_LABELS.get, key="screener_sort")
+    ascending = st.sidebar.toggle("Ascending", key="screener_ascending")
+    limit = st.sidebar.slider("Rows", 10, 500, 100, step=10, key="screener_limit")
+
+    start = time.perf_counter()
+    results, matches = screen(table, ranges, {'sector': sectors}, sort_by, ascending, limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    st.write(f"{matches:,} matching stocks (screened in {elapsed:.1f} ms)")
+    st.dataframe(format_results(results), width=800)
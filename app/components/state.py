@@ -0,0 +1,252 @@
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Memory governor settings, overridable through environment variables
+MEMORY_BUDGET_BYTES = int(float(os.getenv("SESSION_MEMORY_BUDGET_MB", "1024")) * 1024 ** 2)  # Budget for all sessions
+IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "300"))       # Entries untouched for this long can be evicted
+ENTRY_TTL_SECONDS = float(os.getenv("SESSION_ENTRY_TTL", "3600"))    # Entries untouched for this long are dropped
+SWEEP_SECONDS = float(os.getenv("SESSION_SWEEP_SECONDS", "60"))      # Interval of the background sweep of expired entries
+SPILL_ENABLED = os.getenv("SESSION_SPILL", "1") == "1"               # Spill evicted entries to disk instead of dropping them
+SPILL_DIR = Path(os.getenv("SESSION_SPILL_DIR", os.path.join(tempfile.gettempdir(), "finance_predictor_sessions")))
+
+class SessionStore:
+    """
+    Process-wide store holding the large outputs of every session under a global memory budget.
+
+    Sessions keep only a small handle in `st.session_state`; the values live here, keyed by
+    session id and name, with their approximate size and last access time. When the budget
+    is exceeded, the largest entries idle for at least `idle_seconds` (never those of the
+    current session) are spilled to disk, or dropped if spilling is disabled. Entries untouched
+    for longer than `ENTRY_TTL_SECONDS`, and their spill files, are dropped on every write and
+    by a background sweep, so the spill directory does not outlive the sessions that filled it.
+
+    Args:
+        budget_bytes (int): Memory budget shared by all sessions, in bytes.
+        idle_seconds (float): Minimum idle time before an entry can be evicted.
+        spill_dir (Path): Directory receiving spilled entries, or None to drop them.
+    """
+
+    def __init__(self, budget_bytes=MEMORY_BUDGET_BYTES, idle_seconds=IDLE_SECONDS, spill_dir=SPILL_DIR if SPILL_ENABLED else None):
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self.spill_dir = spill_dir
+        self.entries = {}
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def put(self, session_id, name, value):
+        size = estimate_bytes(value)
+        with self.lock:
+            self.discard(session_id, name)
+            self.entries[(session_id, name)] = {"value": value, "size": size, "last_access": time.monotonic(), "path": None}
+            self.total_bytes += size
+            self.enforce_budget(session_id)
+
+    def get(self, session_id, name):
+        with self.lock:
+            entry = self.entries.get((session_id, name))
+            if entry is None:
+                return None
+            entry["last_access"] = time.monotonic()
+
+            # Load spilled entries back into memory
+            if entry["path"] is not None:
+                try:
+                    with open(entry["path"], "rb") as f:
+                        entry["value"] = pickle.load(f)
+                    os.remove(entry["path"])
+                except Exception:
+                    del self.entries[(session_id, name)]
+                    return None
+                entry["path"] = None
+                self.total_bytes += entry["size"]
+                self.enforce_budget(session_id)
+            return entry["value"]
+
+    def session_bytes(self, session_id):
+        """
+        Return the approximate number of bytes held in memory for a session.
+        """
+        with self.lock:
+            return sum(
+                entry["size"] for (sid, _), entry in self.entries.items()
+                if sid == session_id and entry["path"] is None
+            )
+
+    def discard(self, session_id, name):
+        # Caller must hold the lock
+        entry = self.entries.pop((session_id, name), None)
+        if entry is None:
+            return
+        if entry["path"] is None:
+            self.total_bytes -= entry["size"]
+        else:
+            Path(entry["path"]).unlink(missing_ok=True)
+
+    def drop_expired(self, now):
+        # Caller must hold the lock
+        for key in [key for key, entry in self.entries.items() if now - entry["last_access"] > ENTRY_TTL_SECONDS]:
+            self.discard(*key)
+
+    def sweep(self):
+        """
+        Drop the entries of sessions that have been gone for a long time, deleting their spill files.
+        """
+        with self.lock:
+            self.drop_expired(time.monotonic())
+
+    def start_sweeper(self, interval=SWEEP_SECONDS):
+        """
+        Sweep expired entries every `interval` seconds from a background thread, so that spill files
+        of closed sessions are deleted even when no session writes to the store.
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                self.sweep()
+
+        threading.Thread(target=run, name="session-sweeper", daemon=True).start()
+
+    def remove_stale_spills(self):
+        """
+        Delete spill files left behind by earlier processes. Only files older than the entry TTL are
+        removed, since no running store still needs them.
+        """
+        if self.spill_dir is None or not self.spill_dir.is_dir():
+            return
+        cutoff = time.time() - ENTRY_TTL_SECONDS
+        for path in self.spill_dir.glob("*.pkl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def enforce_budget(self, current_session_id):
+        # Caller must hold the lock
+        now = time.monotonic()
+
+        # Drop entries of sessions that have been gone for a long time
+        self.drop_expired(now)
+
+        if self.total_bytes <= self.budget_bytes:
+            return
+
+        # Evict the largest idle entries first
+        candidates = sorted(
+            (
+                (key, entry) for key, entry in self.entries.items()
+                if key[0] != current_session_id and entry["path"] is None
+                and now - entry["last_access"] >= self.idle_seconds
+            ),
+            key=lambda item: item[1]["size"],
+            reverse=True,
+        )
+        for key, entry in candidates:
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if not self.spill(key, entry):
+                del self.entries[key]
+            self.total_bytes -= entry["size"]
+
+    def spill(self, key, entry):
+        # Caller must hold the lock
+        if self.spill_dir is None:
+            return False
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path = self.spill_dir / f"{key[0]}-{key[1]}.pkl"
+            with open(path, "wb") as f:
+                pickle.dump(entry["value"], f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        entry["value"] = None
+        entry["path"] = str(path)
+        return True
+
+def estimate_bytes(obj):
+    """
+    Estimate the memory held by a session output (DataFrames, arrays, figures and containers).
+
+    Args:
+        obj: The object to measure.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(deep=True).sum()) if isinstance(obj, pd.DataFrame) else int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (str, bytes)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_bytes(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_bytes(item) for item in obj)
+    if hasattr(obj, "to_plotly_json"):  # Plotly figures
+        return estimate_bytes(obj.to_plotly_json())
+    return sys.getsizeof(obj)
+
+@st.cache_resource(show_spinner=False)
+def get_session_store():
+    """
+    Return the process-wide session store, after deleting spill files left by earlier runs.
+
+    Returns:
+        SessionStore: Store shared by every session.
+    """
+    store = SessionStore()
+    store.remove_stale_spills()
+    store.start_sweeper()
+    return store
+
+def current_session_id():
+    """
+    Return the id of the session running the current script ('local' outside the Streamlit runtime).
+    """
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+def set_output(name, value):
+    """
+    Store a session output in the shared store and keep only a handle in the session state.
+
+    Args:
+        name (str): Name of the session state variable (e.g., 'output_predict').
+        value: The value to store, or None to clear it.
+    """
+    store = get_session_store()
+    if value is None:
+        with store.lock:
+            store.discard(current_session_id(), name)
+        st.session_state[name] = None
+        return
+    store.put(current_session_id(), name, value)
+    st.session_state[name] = name  # Lightweight handle to the stored value
+
+def get_output(name):
+    """
+    Retrieve a session output from the shared store.
+
+    Args:
+        name (str): Name of the session state variable (e.g., 'output_predict').
+
+    Returns:
+        The stored value, or None if it was never set, was cleared or has been dropped.
+    """
+    if not st.session_state.get(name):
+        return None
+    value = get_session_store().get(current_session_id(), name)
+    if value is None:
+        st.session_state[name] = None  # The entry was dropped to stay within the memory budget
+    return value
@@ -19,14 +19,22 @@ def display_data(historical_data, forecast_data, data_type, model_type):
             # Rename columns for a user-friendly display
             forecast_data = forecast_data.rename(columns={
                 'ds': 'Date',
-                'yhat': 'Predicted Close Price ($)'
-            })[['Date', 'Predicted Close Price ($)']]
+                'yhat': 'Predicted Close Price ($)',
+                'yhat_lower': 'Lower Bound ($)',
+                'yhat_upper': 'Upper Bound ($)'
+            })
 
         elif model_type == "ARIMA":
             # Rename columns for a user-friendly display
             forecast_data = forecast_data.rename(columns={
-                'Forecast': 'Predicted Close Price ($)'
-            })[['Date', 'Predicted Close Price ($)']]
+                'Forecast': 'Predicted Close Price ($)',
+                'Lower': 'Lower Bound ($)',
+                'Upper': 'Upper Bound ($)'
+            })
+
+        # Keep the date, the prediction and its interval bounds when available
+        columns = ['Date', 'Predicted Close Price ($)', 'Lower Bound ($)', 'Upper Bound ($)']
+        forecast_data = forecast_data[[column for column in columns if column in forecast_data]]
 
         # Format the Date column to remove time
         forecast_data['Date'] = forecast_data['Date'].dt.strftime('%Y-%m-%d')
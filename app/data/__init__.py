@@ -1,2 +1,13 @@
+from .client import *
+from .sources import *
+from .symbols import *
+from .singleflight import *
+from .shared import *
 from .loader import *
+from .calendar import *
+from .preprocess import *
+from .portfolio import *
+from .fundamentals import *
+from .intraday import *
+from .profile import *
 from .plotting import *
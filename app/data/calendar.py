@@ -0,0 +1,94 @@
+import os
+import holidays
+import pandas as pd
+import streamlit as st
+
+# Calendar settings, overridable through environment variables
+CALENDAR_START_YEAR = int(os.getenv("CALENDAR_START_YEAR", "1990"))   # First year of the precomputed calendars
+CALENDAR_END_YEAR = int(os.getenv("CALENDAR_END_YEAR", "2050"))       # Last year of the precomputed calendars
+
+# Number of weekday dates on NYSE holidays from which a series is considered to trade on the 'fx' calendar
+# (a few stray rows, e.g. exceptional closures missing from the holiday list, are tolerated)
+FX_HOLIDAY_SESSIONS = 3
+
+@st.cache_resource(show_spinner=False)
+def trading_calendar(name):
+    """
+    Return the precomputed sessions of a trading calendar, shared by every session.
+
+    Args:
+        name (str): 'crypto' (every day, e.g. cryptocurrencies), 'fx' (business days, e.g. currencies)
+            or 'exchange' (business days except the NYSE holidays, e.g. stocks and ETFs).
+
+    Returns:
+        pd.DatetimeIndex: Every session from `CALENDAR_START_YEAR` to `CALENDAR_END_YEAR`, sorted.
+    """
+    start, end = f"{CALENDAR_START_YEAR}-01-01", f"{CALENDAR_END_YEAR}-12-31"
+    if name == 'crypto':
+        return pd.date_range(start, end, freq='D')
+    sessions = pd.bdate_range(start, end)
+    if name == 'fx':
+        return sessions
+    closed = pd.DatetimeIndex(list(holidays.NYSE(years=range(CALENDAR_START_YEAR, CALENDAR_END_YEAR + 1))))
+    return sessions[~sessions.isin(closed)]
+
+def infer_trading_calendar(dates):
+    """
+    Infer the trading calendar of a series from its dates.
+
+    Series trading on weekends follow the 'crypto' calendar, series trading on NYSE holidays the
+    'fx' calendar, and other series the 'exchange' calendar.
+
+    Args:
+        dates (pd.Series): Dates of the series.
+
+    Returns:
+        str: Name of the trading calendar.
+    """
+    dates = pd.DatetimeIndex(dates).tz_localize(None).normalize()
+    if (dates.dayofweek >= 5).any():
+        return 'crypto'
+    weekdays = dates[dates.year >= CALENDAR_START_YEAR]
+    if (~weekdays.isin(trading_calendar('exchange'))).sum() >= FX_HOLIDAY_SESSIONS:
+        return 'fx'
+    return 'exchange'
+
+def trading_sessions(start, end, calendar):
+    """
+    Return the sessions of a trading calendar between two dates (both included).
+
+    Sessions are sliced from the precomputed calendar with binary searches; dates outside its
+    range fall back to the calendar's weekly pattern (without holidays).
+
+    Args:
+        start (pd.Timestamp): First date.
+        end (pd.Timestamp): Last date.
+        calendar (str): Name of the trading calendar.
+
+    Returns:
+        pd.DatetimeIndex: Sessions between `start` and `end`.
+    """
+    sessions = trading_calendar(calendar)
+    freq = 'D' if calendar == 'crypto' else 'B'
+    if start < sessions[0]:
+        sessions = pd.date_range(start, sessions[0] - pd.Timedelta(days=1), freq=freq).append(sessions)
+    if end > sessions[-1]:
+        sessions = sessions.append(pd.date_range(sessions[-1] + pd.Timedelta(days=1), end, freq=freq))
+    return sessions[sessions.searchsorted(start, side='left'):sessions.searchsorted(end, side='right')]
+
+def future_sessions(dates, period, calendar=None):
+    """
+    List the trading sessions within a horizon after the last date of a series, so weekends and
+    holidays are never forecast.
+
+    Args:
+        dates (pd.Series): Dates of the series, sorted.
+        period (int): Horizon in calendar days after the last date.
+        calendar (str): Name of the trading calendar (inferred from `dates` if None).
+
+    Returns:
+        pd.DatetimeIndex: Sessions after the last date, up to `period` days later.
+    """
+    calendar = calendar or infer_trading_calendar(dates)
+    last = pd.Timestamp(dates.iloc[-1] if isinstance(dates, pd.Series) else dates[-1]).tz_localize(None).normalize()
+    return trading_sessions(last + pd.Timedelta(days=1), last + pd.Timedelta(days=period), calendar)
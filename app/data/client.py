@@ -0,0 +1,116 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+
+# Client settings, overridable through environment variables
+RATE_LIMIT = float(os.getenv("YF_RATE_LIMIT", "5"))            # Requests per second (token refill rate)
+RATE_BURST = int(os.getenv("YF_RATE_BURST", "10"))             # Maximum burst size (bucket capacity)
+MAX_CONCURRENCY = int(os.getenv("YF_MAX_CONCURRENCY", "8"))    # Maximum simultaneous requests
+MAX_RETRIES = int(os.getenv("YF_MAX_RETRIES", "4"))            # Retries after the first attempt
+BACKOFF_BASE = float(os.getenv("YF_BACKOFF_BASE", "0.5"))      # Base delay (seconds) for exponential backoff
+BACKOFF_CAP = float(os.getenv("YF_BACKOFF_CAP", "8"))          # Maximum delay (seconds) between retries
+REQUEST_TIMEOUT = float(os.getenv("YF_REQUEST_TIMEOUT", "10")) # Default timeout (seconds) per request
+
+# HTTP status codes worth retrying (throttling and transient server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to cap the global request rate.
+
+    Args:
+        rate (float): Number of tokens added per second.
+        capacity (int): Maximum number of tokens the bucket can hold.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available, then consume it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                # Refill the bucket according to the time elapsed since the last call
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class RateLimitedSession(requests.Session):
+    """
+    Keep-alive `requests` session shared by every Yahoo Finance call.
+
+    Each request waits for a rate-limit token and a concurrency slot, and is retried
+    with exponential backoff and full jitter on connection errors and retryable status codes.
+
+    Args:
+        rate (float): Requests per second allowed across the whole process.
+        burst (int): Maximum number of requests allowed in a burst.
+        max_concurrency (int): Maximum number of requests in flight at once.
+        max_retries (int): Number of retries after the first attempt.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST, max_concurrency=MAX_CONCURRENCY, max_retries=MAX_RETRIES):
+        super().__init__()
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.max_retries = max_retries
+
+        # Pool enough keep-alive connections to serve every concurrent slot
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                with self.slots:
+                    response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                response.close()  # Release the connection back to the pool before retrying
+
+            time.sleep(backoff_delay(attempt))
+
+def backoff_delay(attempt):
+    """
+    Compute the delay before the next retry using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Zero-based index of the attempt that just failed.
+
+    Returns:
+        float: Number of seconds to wait.
+    """
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """
+    Return the process-wide rate-limited session used for all Yahoo Finance calls.
+
+    Returns:
+        RateLimitedSession: Shared session with connection pooling, rate limiting and retry.
+    """
+    return RateLimitedSession()
@@ -0,0 +1,220 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import streamlit as st
+from .client import MAX_CONCURRENCY
+from .loader import fetch_info
+
+# Fundamentals store settings, overridable through environment variables
+FUNDAMENTALS_PATH = Path(os.getenv("FUNDAMENTALS_PATH", ".cache/fundamentals.parquet"))   # Snapshot table
+FUNDAMENTALS_WORKERS = int(os.getenv("FUNDAMENTALS_WORKERS", str(MAX_CONCURRENCY)))      # Concurrent metadata requests
+FUNDAMENTALS_REFRESH_LIMIT = int(os.getenv("FUNDAMENTALS_REFRESH_LIMIT", "500"))         # Symbols refreshed per refresh from the app
+
+# Numeric snapshot columns and the `Ticker.info` key each one is read from
+FUNDAMENTAL_FIELDS = {
+    'market_cap': 'marketCap',
+    'enterprise_value': 'enterpriseValue',
+    'price': 'currentPrice',
+    'trailing_pe': 'trailingPE',
+    'forward_pe': 'forwardPE',
+    'peg_ratio': 'pegRatio',
+    'price_to_sales': 'priceToSalesTrailing12Months',
+    'price_to_book': 'priceToBook',
+    'gross_margin': 'grossMargins',
+    'operating_margin': 'operatingMargins',
+    'profit_margin': 'profitMargins',
+    'return_on_equity': 'returnOnEquity',
+    'revenue_growth': 'revenueGrowth',
+    'earnings_growth': 'earningsGrowth',
+    'dividend_yield': 'dividendYield',
+    'beta': 'beta',
+    'employees': 'fullTimeEmployees',
+}
+
+# Text snapshot columns and their `Ticker.info` keys
+TEXT_FIELDS = {
+    'name': 'longName',
+    'quote_type': 'quoteType',
+    'sector': 'sector',
+    'industry': 'industry',
+    'country': 'country',
+}
+
+SNAPSHOT_COLUMNS = ['symbol', *TEXT_FIELDS, *FUNDAMENTAL_FIELDS, 'updated_at']
+
+def snapshot_row(symbol, info):
+    """
+    Extract the snapshot columns of a symbol from its metadata, with NaN for missing or non-numeric values.
+
+    Args:
+        symbol (str): Ticker symbol.
+        info (dict): Metadata using the `Ticker.info` keys.
+
+    Returns:
+        dict: One snapshot row.
+    """
+    row = {'symbol': symbol, 'updated_at': time.time()}
+    for column, key in TEXT_FIELDS.items():
+        value = info.get(key)
+        row[column] = str(value) if value is not None else None
+    for column, key in FUNDAMENTAL_FIELDS.items():
+        value = info.get(key)
+        row[column] = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+    # Yahoo Finance only reports the PEG ratio under its trailing name for many symbols
+    if np.isnan(row['peg_ratio']) and isinstance(info.get('trailingPegRatio'), (int, float)):
+        row['peg_ratio'] = float(info['trailingPegRatio'])
+    return row
+
+def empty_snapshot():
+    return pd.DataFrame({
+        **{column: pd.Series(dtype=object) for column in ['symbol', *TEXT_FIELDS]},
+        **{column: pd.Series(dtype=np.float64) for column in [*FUNDAMENTAL_FIELDS, 'updated_at']},
+    })
+
+def load_fundamentals():
+    """
+    Read the fundamentals snapshot table from disk.
+
+    Returns:
+        pd.DataFrame: One row per symbol with `SNAPSHOT_COLUMNS` (empty if no snapshot was taken yet).
+    """
+    if not FUNDAMENTALS_PATH.exists():
+        return empty_snapshot()
+    try:
+        return pd.read_parquet(FUNDAMENTALS_PATH)
+    except (OSError, ValueError):
+        return empty_snapshot()
+
+def save_fundamentals(table):
+    """
+    Write the fundamentals snapshot table through a temporary file, so readers never see a partial write.
+    """
+    FUNDAMENTALS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = FUNDAMENTALS_PATH.with_suffix(".parquet.tmp")
+    table.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, FUNDAMENTALS_PATH)
+
+def refresh_fundamentals(symbols, max_workers=FUNDAMENTALS_WORKERS, progress=None, save_every=200):
+    """
+    Fetch the metadata of many symbols concurrently and merge them into the snapshot table.
+
+    At most `max_workers` requests are in flight, on top of the global rate limit of the shared
+    HTTP session. The table is saved every `save_every` symbols, so an interrupted refresh keeps
+    what it fetched.
+
+    Args:
+        symbols (list): Ticker symbols to refresh.
+        max_workers (int): Maximum concurrent requests.
+        progress: Optional callback called with (symbols done, total symbols) after each symbol.
+        save_every (int): Number of symbols between intermediate saves.
+
+    Returns:
+        tuple: The updated snapshot table and the list of symbols that could not be fetched.
+    """
+    table = load_fundamentals().set_index('symbol')
+    rows, failed = [], []
+
+    def merge(table, rows):
+        update = pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS).set_index('symbol')
+        table = pd.concat([table[~table.index.isin(update.index)], update])
+        save_fundamentals(table.reset_index())
+        return table
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_info, symbol): symbol for symbol in symbols}
+        for done, future in enumerate(as_completed(futures), start=1):
+            symbol = futures[future]
+            try:
+                info = future.result()
+                if info:
+                    rows.append(snapshot_row(symbol, info))
+                else:
+                    failed.append(symbol)
+            except Exception:
+                failed.append(symbol)
+            if len(rows) >= save_every:
+                table, rows = merge(table, rows), []
+            if progress:
+                progress(done, len(futures))
+
+    if rows:
+        table = merge(table, rows)
+    return table.reset_index(), failed
+
+def stale_symbols(candidates, table, limit=FUNDAMENTALS_REFRESH_LIMIT):
+    """
+    Pick the symbols to refresh next: those never fetched first, then the least recently updated.
+
+    Args:
+        candidates (list): Symbols that may be refreshed.
+        table (pd.DataFrame): Current snapshot table.
+        limit (int): Maximum number of symbols.
+
+    Returns:
+        list: Symbols to refresh.
+    """
+    updated = pd.Series(table['updated_at'].to_numpy(), index=table['symbol'])
+    ages = updated.reindex(candidates).fillna(-np.inf)
+    return ages.sort_values(kind='stable').index[:limit].tolist()
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def cached_fundamentals(mtime):
+    """
+    Load the snapshot table once per file version (`mtime` is the file's modification time).
+    """
+    return load_fundamentals()
+
+def get_fundamentals():
+    """
+    Return the snapshot table shared by every session, reloaded when the file changes.
+
+    The same DataFrame is returned to every caller, so it must be treated as read-only.
+
+    Returns:
+        pd.DataFrame: One row per symbol with `SNAPSHOT_COLUMNS`.
+    """
+    mtime = FUNDAMENTALS_PATH.stat().st_mtime if FUNDAMENTALS_PATH.exists() else None
+    return cached_fundamentals(mtime)
+
+def screen(table, ranges=None, categories=None, sort_by='market_cap', ascending=False, limit=100):
+    """
+    Filter and rank the snapshot table with vectorized predicates.
+
+    Args:
+        table (pd.DataFrame): Snapshot table.
+        ranges (dict): (minimum, maximum) of numeric columns; either bound may be None. Rows with
+            a missing value in a filtered column are excluded.
+        categories (dict): Accepted values of text columns (e.g. {'sector': ['Technology']}).
+        sort_by (str): Column to rank by (missing values last).
+        ascending (bool): Rank in ascending order.
+        limit (int): Maximum number of rows returned.
+
+    Returns:
+        tuple: The top rows and the total number of matching rows.
+    """
+    mask = np.ones(len(table), dtype=bool)
+    for column, (low, high) in (ranges or {}).items():
+        values = table[column].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        mask &= ~np.isnan(values)
+    for column, accepted in (categories or {}).items():
+        if accepted:
+            mask &= table[column].isin(accepted).to_numpy()
+
+    matches = table[mask]
+    # Partial sort of the top rows only, missing values last
+    values = matches[sort_by].to_numpy(dtype=np.float64)
+    keys = np.where(np.isnan(values), np.inf, values if ascending else -values)
+    if len(keys) > limit:
+        top = np.argpartition(keys, limit - 1)[:limit]
+        top = top[np.argsort(keys[top], kind='stable')]
+    else:
+        top = np.argsort(keys, kind='stable')
+    return matches.iloc[top], int(mask.sum())
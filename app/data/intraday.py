@@ -0,0 +1,272 @@
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import streamlit as st
+from .sources import get_data_source, INTRADAY_MINUTES
+
+# Intraday store settings, overridable through environment variables
+INTRADAY_DIR = Path(os.getenv("INTRADAY_DIR", ".cache/intraday"))             # Bar store, one Parquet file per month
+INTRADAY_MAX_POINTS = int(os.getenv("INTRADAY_MAX_POINTS", "4000"))          # Points drawn per chart
+INTRADAY_FIT_BARS = int(os.getenv("INTRADAY_FIT_BARS", "2000"))              # Most recent aggregated bars used to fit a model
+INTRADAY_RAW_BARS = int(os.getenv("INTRADAY_RAW_BARS", "10000"))             # Most recent bars loaded when not aggregating
+INTRADAY_CACHE_ENTRIES = int(os.getenv("INTRADAY_CACHE_ENTRIES", "32"))      # Aggregated series kept in memory
+
+# Yahoo Finance limits per interval: days per request and how far back bars are available
+INTRADAY_LIMITS = {
+    '1m': (7, 29),
+    '2m': (59, 59),
+    '5m': (59, 59),
+    '15m': (59, 59),
+    '30m': (59, 59),
+    '1h': (180, 729),
+}
+
+# Coarser bar sizes the stored bars can be aggregated to
+AGGREGATIONS = {'5min': 5, '15min': 15, '30min': 30, '1h': 60, '4h': 240, '1D': 1440}
+
+# Columns of the stored and aggregated bars
+BAR_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+def intraday_dir(ticker, interval):
+    return INTRADAY_DIR / interval / ticker
+
+def intraday_partitions(ticker, interval):
+    """
+    List the monthly partitions of a ticker's stored bars, oldest first.
+    """
+    directory = intraday_dir(ticker, interval)
+    return sorted(directory.glob("*.parquet")) if directory.exists() else []
+
+def last_stored_bar(ticker, interval):
+    """
+    Return the start time of the most recent stored bar, or None if nothing is stored.
+    """
+    partitions = intraday_partitions(ticker, interval)
+    if not partitions:
+        return None
+    return pd.read_parquet(partitions[-1], columns=['Date'])['Date'].max()
+
+def write_partitions(ticker, interval, bars):
+    """
+    Merge new bars into the monthly partitions they belong to.
+
+    Each partition is rewritten through a temporary file, so readers never see a partial write.
+
+    Args:
+        ticker (str): Ticker symbol.
+        interval (str): Bar interval.
+        bars (pd.DataFrame): New bars with `BAR_COLUMNS`.
+
+    Returns:
+        int: Number of bars written.
+    """
+    directory = intraday_dir(ticker, interval)
+    directory.mkdir(parents=True, exist_ok=True)
+    for month, group in bars.groupby(bars['Date'].dt.strftime('%Y-%m'), sort=True):
+        path = directory / f"{month}.parquet"
+        if path.exists():
+            group = pd.concat([pd.read_parquet(path), group], ignore_index=True)
+        group = group.drop_duplicates('Date', keep='last').sort_values('Date')
+        tmp_path = path.with_suffix(".parquet.tmp")
+        group.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    return len(bars)
+
+def ingest_intraday(ticker, interval, progress=None):
+    """
+    Download the intraday bars of a ticker into the local store, one request window at a time.
+
+    Only bars after the last stored one are requested, within how far back the interval is
+    available, in windows no longer than the data source accepts. Each window is written
+    before the next one is requested, so memory stays bounded by one window and an
+    interrupted ingestion keeps what it fetched.
+
+    Args:
+        ticker (str): Ticker symbol.
+        interval (str): Bar interval, one of `INTRADAY_LIMITS`.
+        progress: Optional callback called with (windows done, total windows) after each window.
+
+    Returns:
+        int: Number of bars written.
+    """
+    chunk_days, lookback_days = INTRADAY_LIMITS[interval]
+    end = pd.Timestamp("today").normalize() + pd.Timedelta(days=1)
+    start = end - pd.Timedelta(days=lookback_days)
+    last = last_stored_bar(ticker, interval)
+    if last is not None:
+        start = max(start, last.normalize())  # Re-request the last stored day, which may have been partial
+
+    windows = pd.date_range(start, end, freq=f"{chunk_days}D").append(pd.DatetimeIndex([end])).unique()
+    written = 0
+    for i, (window_start, window_end) in enumerate(zip(windows[:-1], windows[1:]), start=1):
+        data = get_data_source().download_intraday(ticker, window_start, window_end, interval)
+        if not data.empty:
+            bars = data.reset_index()[BAR_COLUMNS].dropna(subset=['Close'])
+            written += write_partitions(ticker, interval, bars)
+        if progress:
+            progress(i, len(windows) - 1)
+    return written
+
+def scan_intraday(ticker, interval, start=None, end=None, columns=None):
+    """
+    Read the stored bars of a ticker one monthly partition at a time.
+
+    Args:
+        ticker (str): Ticker symbol.
+        interval (str): Bar interval.
+        start (pd.Timestamp): First bar time (included), or None.
+        end (pd.Timestamp): Last bar time (excluded), or None.
+        columns (list): Columns to read (default: `BAR_COLUMNS`).
+
+    Yields:
+        pd.DataFrame: Bars of one partition, sorted by 'Date'.
+    """
+    columns = columns or BAR_COLUMNS
+    for path in intraday_partitions(ticker, interval):
+        # Skip partitions whose month is outside the window without opening them
+        month = pd.Timestamp(path.stem)
+        if (start is not None and month + pd.offsets.MonthBegin(1) <= start) or (end is not None and month >= end):
+            continue
+        data = pd.read_parquet(path, columns=columns)
+        if start is not None:
+            data = data[data['Date'] >= start]
+        if end is not None:
+            data = data[data['Date'] < end]
+        yield data
+
+def tail_intraday(ticker, interval, rows):
+    """
+    Read the most recent stored bars of a ticker, opening only the newest partitions needed.
+
+    Args:
+        ticker (str): Ticker symbol.
+        interval (str): Stored bar interval.
+        rows (int): Number of bars to return.
+
+    Returns:
+        pd.DataFrame: The last `rows` bars with `BAR_COLUMNS`, in time order.
+    """
+    chunks, count = [], 0
+    for path in reversed(intraday_partitions(ticker, interval)):
+        chunk = pd.read_parquet(path)
+        chunks.append(chunk)
+        count += len(chunk)
+        if count >= rows:
+            break
+    if not chunks:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    return pd.concat(chunks[::-1], ignore_index=True).iloc[-rows:].reset_index(drop=True)
+
+def aggregate_bars(chunks, rule):
+    """
+    Aggregate a stream of sorted bars into coarser bars, holding one chunk in memory at a time.
+
+    Bars of the last (possibly incomplete) bucket of a chunk are carried over to the next chunk,
+    so buckets spanning two chunks are aggregated once.
+
+    Args:
+        chunks (iterable): DataFrames with `BAR_COLUMNS`, in time order.
+        rule (str): Bar size, one of `AGGREGATIONS`.
+
+    Returns:
+        pd.DataFrame: Aggregated bars with `BAR_COLUMNS`, each labelled by its bucket start.
+    """
+    size = pd.Timedelta(minutes=AGGREGATIONS[rule])
+    aggregated, carry = [], None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if chunk.empty:
+            continue
+        buckets = chunk['Date'].dt.floor(size)
+        last = buckets.iloc[-1]
+        done = (buckets != last).to_numpy()
+        carry = chunk[~done]
+        if done.any():
+            aggregated.append(aggregate_chunk(chunk[done], buckets[done]))
+    if carry is not None and not carry.empty:
+        aggregated.append(aggregate_chunk(carry, carry['Date'].dt.floor(size)))
+    if not aggregated:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    return pd.concat(aggregated, ignore_index=True)
+
+def aggregate_chunk(bars, buckets):
+    return bars.groupby(buckets.to_numpy(), sort=False).agg(
+        Open=('Open', 'first'), High=('High', 'max'), Low=('Low', 'min'), Close=('Close', 'last'), Volume=('Volume', 'sum'),
+    ).rename_axis('Date').reset_index()
+
+def partitions_version(ticker, interval):
+    """
+    Identify the current content of a ticker's store (partition names and modification times), to key caches.
+    """
+    return tuple((path.name, path.stat().st_mtime) for path in intraday_partitions(ticker, interval))
+
+@st.cache_data(show_spinner=False, max_entries=INTRADAY_CACHE_ENTRIES)
+def cached_intraday_bars(ticker, interval, rule, version):
+    """
+    Aggregate a ticker's stored bars once per store version (`version` from `partitions_version`).
+    Without aggregation only the last `INTRADAY_RAW_BARS` bars are loaded, never the whole raw series.
+    """
+    if rule is None:
+        return tail_intraday(ticker, interval, INTRADAY_RAW_BARS)
+    return aggregate_bars(scan_intraday(ticker, interval), rule)
+
+def load_intraday_bars(ticker, interval, rule=None):
+    """
+    Return the stored bars of a ticker, aggregated to `rule` (or the last `INTRADAY_RAW_BARS` as stored if None).
+
+    Args:
+        ticker (str): Ticker symbol.
+        interval (str): Stored bar interval.
+        rule (str): Bar size, one of `AGGREGATIONS`, or None.
+
+    Returns:
+        pd.DataFrame: Bars with `BAR_COLUMNS`.
+    """
+    return cached_intraday_bars(ticker, interval, rule, partitions_version(ticker, interval))
+
+def downsample(data, column='Close', max_points=INTRADAY_MAX_POINTS):
+    """
+    Reduce a series to at most `max_points` rows for plotting, keeping the minimum and maximum
+    of each bucket of consecutive rows so spikes stay visible.
+
+    Args:
+        data (pd.DataFrame): Series with a 'Date' column, sorted by date.
+        column (str): Column whose extremes are kept.
+        max_points (int): Maximum number of rows returned.
+
+    Returns:
+        pd.DataFrame: Selected rows, in time order.
+    """
+    if len(data) <= max_points:
+        return data
+    values = data[column].to_numpy()
+    buckets = max_points // 2
+    edges = np.linspace(0, len(values), buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    series = pd.Series(values)
+    keep = np.union1d(series.groupby(bucket).idxmin().to_numpy(), series.groupby(bucket).idxmax().to_numpy())
+    return data.iloc[keep]
+
+def future_bar_dates(dates, periods):
+    """
+    List the start times of the next bars, on the time slots and days the series trades.
+
+    Time slots are those of the last days of the series, and days are business days unless the
+    series trades on weekends, so forecasts skip nights and weekends.
+
+    Args:
+        dates (pd.Series): Bar times, sorted.
+        periods (int): Number of future bars.
+
+    Returns:
+        pd.DatetimeIndex: Start times of the next `periods` bars.
+    """
+    dates = pd.DatetimeIndex(dates)
+    recent = dates[dates >= dates[-1].normalize() - pd.Timedelta(days=7)]
+    slots = np.unique(recent - recent.normalize())
+    freq = 'D' if (dates.dayofweek >= 5).any() else 'B'
+    days = pd.date_range(dates[-1].normalize(), periods=periods // len(slots) + 3, freq=freq)
+    candidates = (days.to_numpy()[:, None] + slots[None, :]).ravel()
+    return pd.DatetimeIndex(candidates[candidates > dates[-1].to_datetime64()][:periods])
@@ -1,7 +1,17 @@
-import yfinance as yf
 import streamlit as st
 import pandas as pd
 import re
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from .client import MAX_CONCURRENCY
+from .sources import get_data_source
+from .symbols import get_symbol_index
+from .singleflight import get_single_flight
+
+# Bounds of the shared historical data cache, overridable through environment variables
+LOAD_DATA_MAX_ENTRIES = int(os.getenv("LOAD_DATA_MAX_ENTRIES", "200"))  # Maximum number of cached tickers
+LOAD_DATA_TTL = int(os.getenv("LOAD_DATA_TTL", "3600"))                 # Seconds before cached data expires
 
 def get_user_ticker():
     """
@@ -17,15 +27,36 @@ def get_user_ticker():
         label_visibility="visible",
         disabled=st.session_state.running,
         placeholder="e.g. AAPL, BTC=F, EURUSD=X",
+        key="ticker_input",
     ).upper()
 
+    # Suggest known symbols starting with the input when it is not an exact match
+    index = get_symbol_index()
+    if new_ticker and index.lookup(new_ticker) is None:
+        suggestions = index.prefix(new_ticker)
+        if suggestions:
+            names = {symbol: f"{symbol} · {name}" for symbol, name, _ in suggestions}
+            st.sidebar.selectbox(
+                "Matching tickers",
+                options=list(names),
+                format_func=names.get,
+                index=None,
+                placeholder="Pick a matching ticker",
+                key="ticker_suggestion",
+                on_change=use_ticker_suggestion,
+                disabled=st.session_state.running,
+            )
+
     st.sidebar.button("Go", disabled=st.session_state.running)
 
     if 'previous_ticker' in st.session_state and st.session_state.previous_ticker != new_ticker:
-        # Reset data and predictions if the ticker has changed
-        st.session_state.output_predict = None
+        # Reset data and predictions if the ticker has changed, releasing their memory in the session store
+        # (imported here because the components package imports this module)
+        from app.components.state import set_output
+        set_output('output_predict', None)
         st.session_state.output_warning = None
-        st.session_state.output_generate = None
+        set_output('output_generate', None)
+        set_output('output_intraday', None)
         st.session_state.selected_section = None
         st.session_state.running = False
 
@@ -36,10 +67,17 @@ def get_user_ticker():
 
     return new_ticker
 
+def use_ticker_suggestion():
+    """
+    Replace the ticker input with the suggestion picked by the user.
+    """
+    if st.session_state.ticker_suggestion:
+        st.session_state.ticker_input = st.session_state.ticker_suggestion
+
 def validate_input(ticker_input):
     """
     Validate the user-inputted ticker symbol by checking that only one is entered and 
-    attempting to download a piece of data for it.
+    looking it up in the local symbol index, or else attempting to download a piece of data for it.
     
     Args:
         user_ticker_input (str): The ticker symbol entered by the user.
@@ -58,15 +96,22 @@ def validate_input(ticker_input):
         ticker = tickers[0].upper()
         ticker_type = get_ticker_type(ticker)
 
+        # Known symbols are valid without a network call
+        if get_symbol_index().lookup(ticker) is not None:
+            if ticker_type in ["FUTURE", "OPTION"]:
+                st.sidebar.error("❌ Futures and options are not supported because they lack sufficient long-term data for forecasting. Please enter a stock, cryptocurrency, or other asset.")
+                return None
+            return ticker
+
         # Step 2: Validate the ticker by fetching 1 day or 1 month of data
         try:
             if ticker_type in ["FUTURE", "OPTION"]:
                 st.sidebar.error("❌ Futures and options are not supported because they lack sufficient long-term data for forecasting. Please enter a stock, cryptocurrency, or other asset.")
                 return None
             if ticker_type == "MUTUALFUND":
-                validation_data = yf.download(ticker, period="1mo")
+                validation_data = get_single_flight().do(("download", ticker, "1mo"), get_data_source().download, ticker, period="1mo")
             else:
-                validation_data = yf.download(ticker, period="1d")
+                validation_data = get_single_flight().do(("download", ticker, "1d"), get_data_source().download, ticker, period="1d")
             if validation_data.empty:
                 st.sidebar.error("❌ Invalid ticker provided.")
                 return None
@@ -78,7 +123,7 @@ def validate_input(ticker_input):
 
 def get_ticker_type(ticker):
     """
-    Fetch the ticker type (e.g., stock, ETF, etc.) from Yahoo Finance.
+    Fetch the ticker type (e.g., stock, ETF, etc.) from the configured data source.
 
     Args:
         ticker (str): The ticker symbol for which to get the type.
@@ -86,8 +131,13 @@ def get_ticker_type(ticker):
     Returns:
         str: Ticker type (e.g., 'EQUITY', 'ETF'), or None if there is an error.
     """
+    # Answer from the local symbol index when possible
+    known = get_symbol_index().lookup(ticker)
+    if known is not None:
+        return known[1]
+
     try:
-        ticker_info = yf.Ticker(ticker).info
+        ticker_info = fetch_info(ticker)
 
         # Check if the info is not empty
         if not ticker_info:
@@ -106,11 +156,42 @@ def get_ticker_type(ticker):
         st.warning(f"❌ Unable to access Yahoo Finance API for ticker {ticker}. Please try again later.")
         return None
 
+def start_info_fetch(ticker):
+    """
+    Start fetching the metadata of a ticker's page on the shared fetch pool when the page needs it:
+    for the sidebar name of symbols missing from the local index, and for the Explore section.
+    The fetch runs while the script thread loads the history, so the page waits for the slowest
+    of the two rather than for their sum.
+
+    Args:
+        ticker (str): The ticker symbol.
+
+    Returns:
+        Future: The metadata fetch, or None when the page does not need the metadata.
+    """
+    if get_symbol_index().lookup(ticker) is None or st.session_state.get('selected_section') == "🔍 Explore":
+        return submit_info_fetch(ticker)
+    return None
+
+def submit_info_fetch(ticker):
+    """
+    Fetch the metadata of a ticker (see `fetch_info`) on the shared fetch pool.
+
+    The shared single-flight group and data source are looked up on the calling script thread,
+    so the pool thread only runs the network call.
+
+    Args:
+        ticker (str): The ticker symbol.
+
+    Returns:
+        Future: The metadata fetch.
+    """
+    single_flight, source = get_single_flight(), get_data_source()
+    return get_fetch_executor().submit(single_flight.do, ("info", ticker), source.info, ticker)
 
-@st.cache_data(show_spinner=False)
 def load_data(ticker):
     """
-    Load historical data for the given ticker symbol from Yahoo Finance.
+    Load historical data for the given ticker symbol from the configured data source.
 
     Args:
         ticker (str): The ticker symbol for which data is to be fetched.
@@ -118,33 +199,104 @@ def load_data(ticker):
     Returns:
         pd.DataFrame: DataFrame containing historical data for the ticker.
     """
-    end = pd.to_datetime("today").date()
-    start = (end - pd.DateOffset(years=5)).date()
-    
     try:
         with st.spinner('📈 Loading data... Hold tight! 🚀'):
             # Fetch full historical data
-            data = yf.download(ticker, start=start, end=end)
-            data.reset_index(inplace=True)
-            return data
+            return cached_history(ticker)
     except Exception as e:
         st.sidebar.error(f"❌ Error occurred while fetching data: {e}")
         return None
 
-def get_ticker_name(ticker):
+@st.cache_data(show_spinner=False, max_entries=LOAD_DATA_MAX_ENTRIES, ttl=LOAD_DATA_TTL)
+def cached_history(ticker):
+    """
+    Fetch the historical data of a ticker once per `LOAD_DATA_TTL`, shared by every session.
+    """
+    return fetch_history(ticker)
+
+def fetch_history(ticker, years=5):
+    """
+    Fetch the historical data of a ticker from the configured data source, without any UI.
+
+    Args:
+        ticker (str): The ticker symbol for which data is to be fetched.
+        years (int): Number of years of history, up to today.
+
+    Returns:
+        pd.DataFrame: DataFrame containing historical data for the ticker, with a 'Date' column.
+    """
+    end = pd.to_datetime("today").date()
+    start = (end - pd.DateOffset(years=years)).date()
+
+    # Concurrent requests for the same window share one download
+    data = get_single_flight().do(("history", ticker, start, end), get_data_source().download, ticker, start=start, end=end)
+    return data.reset_index()  # New frame for each caller, so the shared download is never mutated
+
+def fetch_info(ticker):
+    """
+    Fetch the metadata of a ticker (`Ticker.info` keys) from the configured data source.
+
+    Concurrent requests for the same ticker share one call.
+
+    Args:
+        ticker (str): The ticker symbol.
+
+    Returns:
+        dict: The ticker metadata.
+    """
+    return get_single_flight().do(("info", ticker), get_data_source().info, ticker)
+
+@st.cache_resource(show_spinner=False)
+def get_fetch_executor():
+    """
+    Return the process-wide thread pool running a page's independent network fetches concurrently.
+
+    Requests still go through the shared rate-limited session, so the pool only bounds how many
+    fetches wait on the network at the same time.
+
+    Returns:
+        ThreadPoolExecutor: The shared pool.
+    """
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="fetch")
+
+def data_fingerprint(data):
+    """
+    Compute a stable fingerprint of a DataFrame's content, used to key shared caches.
+
+    Args:
+        data (pd.DataFrame): The data to fingerprint.
+
+    Returns:
+        str: Hex digest identifying the data (columns and values).
+    """
+    hasher = hashlib.sha1(",".join(map(str, data.columns)).encode())
+    hasher.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    return hasher.hexdigest()
+
+def get_ticker_name(ticker, info_future=None):
     """
     Get the long name of the given ticker (e.g., company name).
 
     Args:
         ticker (str): The ticker symbol.
+        info_future (Future): Metadata fetch already started by `start_info_fetch`, reused
+            instead of fetching the metadata again.
 
     Returns:
         str: The long name of the company or the ticker itself if not available.
     """
+    # Answer from the local symbol index when possible
+    known = get_symbol_index().lookup(ticker)
+    if known is not None:
+        return f"{known[0]} ({known[1]})"
+
     try:
-        info = yf.Ticker(ticker).info
+        info = info_future.result() if info_future is not None else fetch_info(ticker)
         long_name = info.get("longName", ticker)
-        ticker_type = get_ticker_type(ticker)  # Call the function to get the ticker type
+        ticker_type = info.get("quoteType", "Unknown")
+        # Remember the validated ticker so that later lookups skip the network
+        if info.get("quoteType"):
+            get_symbol_index().add(ticker, long_name, ticker_type)
         return f"{long_name} ({ticker_type})"
     except Exception:
         return f"{ticker} (Unknown)"
@@ -165,6 +317,24 @@ def get_ticker_info(ticker):
     else:
         return None, None, None
 
+def display_ticker_info(ticker, info):
+    """
+    Display the information tables of a ticker from metadata fetched beforehand (e.g., concurrently).
+
+    Args:
+        ticker (str): The ticker symbol.
+        info (dict): The ticker metadata (`Ticker.info` keys).
+    """
+    if not info:
+        st.warning("⚠️ The data is unavailable right now. Please try again later.")
+        return
+
+    # The symbol index may know the type of tickers whose metadata lacks it
+    known = get_symbol_index().lookup(ticker)
+    ticker_type = info.get('quoteType') or (known[1] if known is not None else None)
+    if ticker_type == "EQUITY":
+        display_stock_info(ticker, build_stock_info(info))
+
 def get_stock_info(ticker):
     """
     Fetch detailed stock, price, and business information for the provided ticker symbol.
@@ -176,79 +346,100 @@ def get_stock_info(ticker):
         tuple: Three DataFrames containing stock, price, and business metrics respectively.
     """
     try:
-        ticker_obj = yf.Ticker(ticker)
-        stock_info = ticker_obj.info
-
-        # Stock Info DataFrame
-        stock_data = {
-            "Stock Info": ["Company Name", "Country", "Sector", "Industry", "Market Cap", "Enterprise Value", "Beta", "Shares Outstanding", "Revenue (TTM)", "Employees"],
-            "Value": [
-                str(stock_info.get("longName", "N/A")),
-                str(stock_info.get("country", "N/A")),
-                str(stock_info.get("sector", "N/A")),
-                str(stock_info.get("industry", "N/A")),
-                f"${round(stock_info.get('marketCap', 0) / 1e9, 1)}T" if stock_info.get("marketCap") else "N/A",
-                f"${round(stock_info.get('enterpriseValue', 0) / 1e9, 1)}T" if stock_info.get("enterpriseValue") else "N/A",
-                str(stock_info.get('beta', 'N/A')),
-                str(stock_info.get('sharesOutstanding', 'N/A')),
-                f"${round(stock_info.get('totalRevenue', 0) / 1e9, 2)}B" if stock_info.get('totalRevenue') else "N/A",  # Revenue in billions
-                str(stock_info.get("fullTimeEmployees", "N/A"))
-            ]
-        }
-        stock_info_df = pd.DataFrame(stock_data)
-
-        # Price Info DataFrame
-        price_data = {
-            "Price Info": ["Current Price", "Previous Close", "Day High", "Day Low", "52 Week High", "52 Week Low", "Volume (10-Day Avg)", "P/S Ratio"],
-            "Value": [
-                f"${stock_info.get('currentPrice', 'N/A')}" if stock_info.get('currentPrice') is not None else "N/A",
-                f"${stock_info.get('previousClose', 'N/A')}" if stock_info.get('previousClose') is not None else "N/A",
-                f"${stock_info.get('dayHigh', 'N/A')}" if stock_info.get('dayHigh') is not None else "N/A",
-                f"${stock_info.get('dayLow', 'N/A')}" if stock_info.get('dayLow') is not None else "N/A",
-                f"${stock_info.get('fiftyTwoWeekHigh', 'N/A')}" if stock_info.get('fiftyTwoWeekHigh') is not None else "N/A",
-                f"${stock_info.get('fiftyTwoWeekLow', 'N/A')}" if stock_info.get('fiftyTwoWeekLow') is not None else "N/A",
-                str(stock_info.get('averageVolume10days', 'N/A')) if stock_info.get('averageVolume10days') is not None else "N/A",
-                str(round(stock_info.get('priceToSalesTrailing12Months', 0), 2)) if stock_info.get('priceToSalesTrailing12Months') is not None else "N/A"
-            ]
-        }
-        price_info_df = pd.DataFrame(price_data)
-
-        # Business Metrics DataFrame
-        business_data = {
-            "Business Metrics": ["EPS (FWD)", "P/E (FWD)", "PEG Ratio", "Div Rate (FWD)", "Div Yield (FWD)", "EBITDA", "Free Cash Flow", "Return on Equity (ROE)", "Gross Profit Margin", "Recommendation"],
-            "Value": [
-                str(stock_info.get('forwardEps', 'N/A')) if stock_info.get('forwardEps') is not None else "N/A",
-                str(stock_info.get('forwardPE', 'N/A')) if stock_info.get('forwardPE') is not None else "N/A",
-                str(stock_info.get('pegRatio', 'N/A')) if stock_info.get('pegRatio') is not None else "N/A",
-                f"${stock_info.get('dividendRate', 'N/A')}" if stock_info.get('dividendRate') is not None else "N/A",
-                f"{round(stock_info.get('dividendYield', 0) * 100, 2)}%" if stock_info.get('dividendYield') is not None else "N/A",
-                f"${round(stock_info.get('ebitda', 0) / 1e9, 2)}B" if stock_info.get('ebitda') is not None else "N/A",
-                f"${round(stock_info.get('freeCashflow', 0) / 1e9, 2)}B" if stock_info.get('freeCashflow') is not None else "N/A",  # FCF in billions
-                f"{round(stock_info.get('returnOnEquity', 0) * 100, 2)}%" if stock_info.get('returnOnEquity') is not None else "N/A",
-                f"{round(stock_info.get('grossMargins', 0) * 100, 2)}%" if stock_info.get('grossMargins') is not None else "N/A",
-                str(stock_info.get('recommendationKey', 'N/A').capitalize()) if stock_info.get('recommendationKey') else "N/A"
-            ]
-        }
-        business_info_df = pd.DataFrame(business_data)
-
-        # Display the stock information DataFrame
-        with st.expander(f"Stock Information for {ticker}", expanded=False):
-            st.write("######")
-            st.dataframe(stock_info_df.set_index(stock_info_df.columns[0]), width=800)
-
-        # Display the price information DataFrame
-        with st.expander(f"Price Information for {ticker}", expanded=False):
-            st.write("######")
-            st.dataframe(price_info_df.set_index(price_info_df.columns[0]), width=800)
-
-        # Display the business information DataFrame
-        with st.expander(f"Business Information for {ticker}", expanded=False):
-            st.write("######")
-            st.dataframe(business_info_df.set_index(business_info_df.columns[0]), width=800)
-
+        frames = build_stock_info(fetch_info(ticker))
+        display_stock_info(ticker, frames)
         # Return the three DataFrames if needed elsewhere
-        return stock_info_df, price_info_df, business_info_df
+        return frames
 
     except Exception as e:
         st.error(f"Error fetching data for {ticker}: {e}")
         return None, None, None
+
+def build_stock_info(stock_info):
+    """
+    Build the stock, price, and business information tables from the metadata of a stock, without any UI.
+
+    Args:
+        stock_info (dict): The ticker metadata (`Ticker.info` keys).
+
+    Returns:
+        tuple: Three DataFrames containing stock, price, and business metrics respectively.
+    """
+    # Stock Info DataFrame
+    stock_data = {
+        "Stock Info": ["Company Name", "Country", "Sector", "Industry", "Market Cap", "Enterprise Value", "Beta", "Shares Outstanding", "Revenue (TTM)", "Employees"],
+        "Value": [
+            str(stock_info.get("longName", "N/A")),
+            str(stock_info.get("country", "N/A")),
+            str(stock_info.get("sector", "N/A")),
+            str(stock_info.get("industry", "N/A")),
+            f"${round(stock_info.get('marketCap', 0) / 1e9, 1)}T" if stock_info.get("marketCap") else "N/A",
+            f"${round(stock_info.get('enterpriseValue', 0) / 1e9, 1)}T" if stock_info.get("enterpriseValue") else "N/A",
+            str(stock_info.get('beta', 'N/A')),
+            str(stock_info.get('sharesOutstanding', 'N/A')),
+            f"${round(stock_info.get('totalRevenue', 0) / 1e9, 2)}B" if stock_info.get('totalRevenue') else "N/A",  # Revenue in billions
+            str(stock_info.get("fullTimeEmployees", "N/A"))
+        ]
+    }
+    stock_info_df = pd.DataFrame(stock_data)
+
+    # Price Info DataFrame
+    price_data = {
+        "Price Info": ["Current Price", "Previous Close", "Day High", "Day Low", "52 Week High", "52 Week Low", "Volume (10-Day Avg)", "P/S Ratio"],
+        "Value": [
+            f"${stock_info.get('currentPrice', 'N/A')}" if stock_info.get('currentPrice') is not None else "N/A",
+            f"${stock_info.get('previousClose', 'N/A')}" if stock_info.get('previousClose') is not None else "N/A",
+            f"${stock_info.get('dayHigh', 'N/A')}" if stock_info.get('dayHigh') is not None else "N/A",
+            f"${stock_info.get('dayLow', 'N/A')}" if stock_info.get('dayLow') is not None else "N/A",
+            f"${stock_info.get('fiftyTwoWeekHigh', 'N/A')}" if stock_info.get('fiftyTwoWeekHigh') is not None else "N/A",
+            f"${stock_info.get('fiftyTwoWeekLow', 'N/A')}" if stock_info.get('fiftyTwoWeekLow') is not None else "N/A",
+            str(stock_info.get('averageVolume10days', 'N/A')) if stock_info.get('averageVolume10days') is not None else "N/A",
+            str(round(stock_info.get('priceToSalesTrailing12Months', 0), 2)) if stock_info.get('priceToSalesTrailing12Months') is not None else "N/A"
+        ]
+    }
+    price_info_df = pd.DataFrame(price_data)
+
+    # Business Metrics DataFrame
+    business_data = {
+        "Business Metrics": ["EPS (FWD)", "P/E (FWD)", "PEG Ratio", "Div Rate (FWD)", "Div Yield (FWD)", "EBITDA", "Free Cash Flow", "Return on Equity (ROE)", "Gross Profit Margin", "Recommendation"],
+        "Value": [
+            str(stock_info.get('forwardEps', 'N/A')) if stock_info.get('forwardEps') is not None else "N/A",
+            str(stock_info.get('forwardPE', 'N/A')) if stock_info.get('forwardPE') is not None else "N/A",
+            str(stock_info.get('pegRatio', 'N/A')) if stock_info.get('pegRatio') is not None else "N/A",
+            f"${stock_info.get('dividendRate', 'N/A')}" if stock_info.get('dividendRate') is not None else "N/A",
+            f"{round(stock_info.get('dividendYield', 0) * 100, 2)}%" if stock_info.get('dividendYield') is not None else "N/A",
+            f"${round(stock_info.get('ebitda', 0) / 1e9, 2)}B" if stock_info.get('ebitda') is not None else "N/A",
+            f"${round(stock_info.get('freeCashflow', 0) / 1e9, 2)}B" if stock_info.get('freeCashflow') is not None else "N/A",  # FCF in billions
+            f"{round(stock_info.get('returnOnEquity', 0) * 100, 2)}%" if stock_info.get('returnOnEquity') is not None else "N/A",
+            f"{round(stock_info.get('grossMargins', 0) * 100, 2)}%" if stock_info.get('grossMargins') is not None else "N/A",
+            str(stock_info.get('recommendationKey', 'N/A').capitalize()) if stock_info.get('recommendationKey') else "N/A"
+        ]
+    }
+    business_info_df = pd.DataFrame(business_data)
+
+    return stock_info_df, price_info_df, business_info_df
+
+def display_stock_info(ticker, frames):
+    """
+    Display the stock, price, and business information tables of a stock in expanders.
+
+    Args:
+        ticker (str): The ticker symbol.
+        frames (tuple): DataFrames returned by `build_stock_info`.
+    """
+    stock_info_df, price_info_df, business_info_df = frames
+
+    # Display the stock information DataFrame
+    with st.expander(f"Stock Information for {ticker}", expanded=False):
+        st.write("######")
+        st.dataframe(stock_info_df.set_index(stock_info_df.columns[0]), width=800)
+
+    # Display the price information DataFrame
+    with st.expander(f"Price Information for {ticker}", expanded=False):
+        st.write("######")
+        st.dataframe(price_info_df.set_index(price_info_df.columns[0]), width=800)
+
+    # Display the business information DataFrame
+    with st.expander(f"Business Information for {ticker}", expanded=False):
+        st.write("######")
+        st.dataframe(business_info_df.set_index(business_info_df.columns[0]), width=800)
@@ -76,3 +76,30 @@ def plot_data(data):
     else:
         # Show a warning if no columns are selected
         st.warning("Please select at least one column to plot.")
+
+def plot_close(data):
+    """
+    Plot the historical close prices with the same style as the forecast charts, shown while a model is fitting.
+
+    Args:
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+
+    Returns:
+        fig (go.Figure): Plotly figure object.
+    """
+    common_font_style = dict(size=14, color='#ffffff')
+    fig = go.Figure(go.Scatter(
+        x=data['Date'], y=data['Close'], mode='lines', name='Actual',
+        marker=dict(color='#87CEEB', size=3),
+        hovertemplate='Actual: %{y:.2f}<extra></extra>',
+    ))
+    fig.update_layout(
+        xaxis_title='Date',
+        yaxis_title='Close Price ($)',
+        margin=dict(t=20, b=0, l=0, r=0),
+        font=common_font_style,
+        hovermode='x',
+        showlegend=True,
+        legend=dict(orientation='h', yanchor='bottom', y=1, xanchor='center', x=0.5, font=common_font_style)
+    )
+    return fig
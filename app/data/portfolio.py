@@ -0,0 +1,111 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+import streamlit as st
+from .sources import get_data_source
+from .singleflight import get_single_flight
+from .loader import LOAD_DATA_MAX_ENTRIES, LOAD_DATA_TTL
+
+# Portfolio settings, overridable through environment variables
+PORTFOLIO_MAX_ASSETS = int(os.getenv("PORTFOLIO_MAX_ASSETS", "20"))  # Maximum number of tickers in a portfolio
+
+def parse_portfolio(text):
+    """
+    Parse weighted tickers such as "AAPL:0.6, MSFT:0.4" (or "AAPL MSFT" for equal weights).
+
+    Weights may be fractions or percentages; they are normalized to sum to 1.
+
+    Args:
+        text (str): Tickers separated by commas or spaces, each optionally followed by ':weight'.
+
+    Returns:
+        dict: Normalized weight of each ticker, in input order.
+
+    Raises:
+        ValueError: If the input is empty, malformed, repeats a ticker or has non-positive weights.
+    """
+    items = [item for item in re.split(r'[,\s]+', text.strip()) if item]
+    if not items:
+        raise ValueError("Please provide at least one ticker.")
+    if len(items) > PORTFOLIO_MAX_ASSETS:
+        raise ValueError(f"A portfolio holds at most {PORTFOLIO_MAX_ASSETS} tickers.")
+
+    weights = {}
+    for item in items:
+        ticker, _, weight = item.partition(':')
+        ticker = ticker.upper()
+        if not ticker:
+            raise ValueError(f"Missing ticker in '{item}'.")
+        if ticker in weights:
+            raise ValueError(f"Ticker {ticker} is listed more than once.")
+        try:
+            weights[ticker] = float(weight.rstrip('%')) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight in '{item}'.")
+        if weights[ticker] <= 0:
+            raise ValueError(f"The weight of {ticker} must be positive.")
+
+    total = sum(weights.values())
+    return {ticker: weight / total for ticker, weight in weights.items()}
+
+def fetch_portfolio_history(tickers, years=5):
+    """
+    Fetch the close prices of several tickers in one batched download, aligned on common dates.
+
+    Args:
+        tickers (tuple): Ticker symbols.
+        years (int): Number of years of history, up to today.
+
+    Returns:
+        pd.DataFrame: 'Date' column plus one close price column per ticker, restricted to the
+            dates on which every ticker has a price.
+
+    Raises:
+        LookupError: If a ticker has no data.
+    """
+    end = pd.to_datetime("today").date()
+    start = (end - pd.DateOffset(years=years)).date()
+
+    # Concurrent requests for the same basket share one download
+    closes = get_single_flight().do(
+        ("portfolio", tuple(tickers), start, end), get_data_source().download_many, list(tickers), start=start, end=end
+    )
+    missing = [ticker for ticker in tickers if ticker not in closes or closes[ticker].isna().all()]
+    if missing:
+        raise LookupError(f"No data found for {', '.join(missing)}.")
+
+    # Keep only the dates where every asset traded (e.g., drops weekends when mixing crypto and stocks)
+    closes = closes[list(tickers)].dropna(how='any')
+    return closes.reset_index()
+
+@st.cache_data(show_spinner=False, max_entries=LOAD_DATA_MAX_ENTRIES, ttl=LOAD_DATA_TTL)
+def load_portfolio(tickers):
+    """
+    Load the aligned close prices of the given tickers from the configured data source.
+
+    Args:
+        tickers (tuple): Ticker symbols.
+
+    Returns:
+        pd.DataFrame: 'Date' column plus one close price column per ticker, or None on error.
+    """
+    try:
+        with st.spinner('📈 Loading portfolio data... Hold tight! 🚀'):
+            return fetch_portfolio_history(tuple(tickers))
+    except Exception as e:
+        st.sidebar.error(f"❌ Error occurred while fetching data: {e}")
+        return None
+
+def price_matrix(data, tickers):
+    """
+    Return the aligned close prices as a 2-D float array of shape (dates, tickers).
+
+    Args:
+        data (pd.DataFrame): Frame returned by `load_portfolio`.
+        tickers (list): Ticker symbols, in column order.
+
+    Returns:
+        np.ndarray: Close prices.
+    """
+    return data[list(tickers)].to_numpy(dtype=np.float64)
@@ -0,0 +1,107 @@
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from .loader import data_fingerprint
+from .calendar import infer_trading_calendar, trading_sessions
+
+# Preprocessing settings, overridable through environment variables
+PREPROCESS_MAX_GAP = int(os.getenv("PREPROCESS_MAX_GAP", "5"))              # Longest gap (periods) filled by interpolation
+PREPROCESS_CLIP = os.getenv("PREPROCESS_CLIP", "1") == "1"                  # Clip outliers
+PREPROCESS_WINDOW = int(os.getenv("PREPROCESS_WINDOW", "21"))               # Rolling window (periods) of the outlier detector
+PREPROCESS_THRESHOLD = float(os.getenv("PREPROCESS_THRESHOLD", "6"))        # Outlier threshold, in robust standard deviations
+PREPROCESS_CACHE_ENTRIES = int(os.getenv("PREPROCESS_CACHE_ENTRIES", "64"))  # Number of preprocessed series kept in memory
+
+# Columns produced by the preprocessing stage
+PREPROCESSED_COLUMNS = ['Date', 'Close', 'LogClose', 'Return', 'Filled', 'Clipped']
+
+def preprocess(data, max_gap=PREPROCESS_MAX_GAP, clip=PREPROCESS_CLIP, window=PREPROCESS_WINDOW, threshold=PREPROCESS_THRESHOLD):
+    """
+    Prepare a close price series for the models in one vectorized pass.
+
+    Steps:
+        - Calendar alignment: reindex on the asset's trading calendar (exchange sessions, business
+          days for currencies, or every day for assets trading on weekends), dropping duplicate dates.
+        - Gap filling: interpolate the log price over gaps of up to `max_gap` periods; longer gaps are dropped.
+        - Outlier clipping: clip isolated spikes, i.e. prices whose move in and move out are in
+          opposite directions and both larger than `threshold` robust standard deviations of the
+          returns (rolling median absolute return over `window` periods). Trends and lasting
+          jumps are kept.
+        - Transforms: log price and log return.
+
+    Args:
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+        max_gap (int): Longest gap filled, in periods.
+        clip (bool): Whether to clip outliers.
+        window (int): Rolling window of the outlier detector, in periods.
+        threshold (float): Outlier threshold, in robust standard deviations.
+
+    Returns:
+        pd.DataFrame: Columns 'Date', 'Close', 'LogClose', 'Return' (log return, 0 on the first row),
+            'Filled' (row added by gap filling) and 'Clipped' (price clipped as an outlier).
+    """
+    dates = pd.DatetimeIndex(data['Date']).tz_localize(None).normalize()
+    log_close = pd.Series(np.log(data['Close'].to_numpy(dtype=np.float64)), index=dates)
+    log_close = log_close[~log_close.index.duplicated(keep='last')].sort_index()
+
+    # Align on the asset's calendar and fill short gaps in log space
+    calendar = trading_sessions(log_close.index[0], log_close.index[-1], infer_trading_calendar(log_close.index))
+    calendar = calendar.union(log_close.index)  # Keep actual trading days that fall off the calendar
+    aligned = log_close.reindex(calendar)
+    filled = aligned.isna().to_numpy()
+    # Length of the gap each missing row belongs to (rows of a gap share the id of the row before it)
+    gap_id = np.cumsum(~filled)
+    gap_length = np.bincount(gap_id, weights=filled)[gap_id]
+    aligned = aligned.interpolate(method='linear', limit_area='inside')
+    keep = ~filled | (gap_length <= max_gap)
+    values, dates, filled = aligned.to_numpy()[keep], calendar[keep], filled[keep]
+
+    clipped = np.zeros(len(values), dtype=bool)
+    if clip and len(values) > window:
+        # Robust scale of the returns; 1.4826 turns a median absolute deviation into a standard deviation
+        moves = np.diff(values)
+        scale = 1.4826 * pd.Series(np.abs(moves)).rolling(window, center=True, min_periods=window // 2).median().to_numpy()
+        band = threshold * np.maximum(scale[:-1], 1e-6)
+        move_in, move_out = moves[:-1], moves[1:]
+        spikes = (np.abs(move_in) > band) & (np.abs(move_out) > band) & (np.sign(move_in) != np.sign(move_out))
+
+        # Pull each spike back within the band around its neighbours
+        neighbours = (values[:-2] + values[2:]) / 2
+        clipped[1:-1] = spikes
+        values[1:-1] = np.where(spikes, np.clip(values[1:-1], neighbours - band, neighbours + band), values[1:-1])
+
+    returns = np.empty_like(values)
+    returns[0] = 0.0
+    np.subtract(values[1:], values[:-1], out=returns[1:])
+
+    return pd.DataFrame({
+        'Date': dates,
+        'Close': np.exp(values),
+        'LogClose': values,
+        'Return': returns,
+        'Filled': filled,
+        'Clipped': clipped,
+    })
+
+@st.cache_resource(show_spinner=False, max_entries=PREPROCESS_CACHE_ENTRIES)
+def cached_preprocess(fingerprint, _data):
+    """
+    Preprocess a series once per data fingerprint (`_data` is identified by its fingerprint and not hashed).
+    """
+    return preprocess(_data)
+
+def prepare_data(data):
+    """
+    Return the preprocessed version of a close price series, shared across sessions and models.
+
+    The same DataFrame object is returned to every caller with the same data (no copy), so it
+    must be treated as read-only.
+
+    Args:
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+
+    Returns:
+        pd.DataFrame: Output of `preprocess`.
+    """
+    data = data[['Date', 'Close']]
+    return cached_preprocess(data_fingerprint(data), data)
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from .loader import data_fingerprint
+
+# Trailing windows of the period returns, in calendar days (None: since the first date)
+RETURN_WINDOWS = {'1 week': 7, '1 month': 30, '3 months': 91, '6 months': 182, '1 year': 365, '3 years': 1095, 'All': None}
+
+# Trailing windows of the volatility, in trading days
+VOLATILITY_WINDOWS = {'1 month': 21, '3 months': 63, '1 year': 252, 'All': None}
+
+def build_profile(data):
+    """
+    Precompute a compact profile of a ticker's historical data, small enough for a language model prompt.
+
+    Args:
+        data (pd.DataFrame): Historical data with a 'Date' column and the price columns.
+
+    Returns:
+        dict: Schema ('schema'), summary statistics ('summary'), period returns ('returns'),
+            annualized volatility ('volatility'), extremes ('extremes') and monthly aggregates
+            ('monthly'), each as a small DataFrame.
+    """
+    data = data.sort_values('Date').reset_index(drop=True)
+    dates = pd.DatetimeIndex(data['Date']).tz_localize(None)
+    close = data['Close'].to_numpy(dtype=np.float64)
+    log_returns = np.diff(np.log(close))
+    annualization = 365 if (dates.dayofweek >= 5).any() else 252  # Assets trading on weekends
+
+    schema = pd.DataFrame({
+        'Column': data.columns,
+        'Type': [str(dtype) for dtype in data.dtypes],
+        'Missing': data.isna().sum().to_numpy(),
+    })
+
+    summary = data.drop(columns='Date').describe().T[['mean', 'std', 'min', '50%', 'max']]
+
+    # Period returns, measured from the last close on or before the start of each window
+    last_date = dates[-1]
+    returns = {}
+    for label, days in RETURN_WINDOWS.items():
+        start = 0 if days is None else dates.searchsorted(last_date - pd.Timedelta(days=days), side='right') - 1
+        if start >= 0:
+            returns[label] = close[-1] / close[start] - 1
+    returns = pd.DataFrame({'Return': returns})
+
+    volatility = pd.DataFrame({'Annualized Volatility': {
+        label: log_returns[-window:].std() * np.sqrt(annualization) if window else log_returns.std() * np.sqrt(annualization)
+        for label, window in VOLATILITY_WINDOWS.items()
+        if window is None or len(log_returns) >= window
+    }})
+
+    # Extremes, with the date each one happened
+    running_max = np.maximum.accumulate(close)
+    drawdown = close / running_max - 1
+    trough = int(drawdown.argmin())
+    extremes = pd.DataFrame([
+        ('Highest close', close.max(), dates[close.argmax()]),
+        ('Lowest close', close.min(), dates[close.argmin()]),
+        ('Largest daily gain', np.expm1(log_returns.max()), dates[log_returns.argmax() + 1]),
+        ('Largest daily loss', np.expm1(log_returns.min()), dates[log_returns.argmin() + 1]),
+        ('Maximum drawdown', drawdown[trough], dates[trough]),
+        ('Highest volume', data['Volume'].max(), dates[data['Volume'].to_numpy().argmax()]),
+    ], columns=['Metric', 'Value', 'Date']).set_index('Metric')
+
+    monthly = data.set_index(dates).resample('ME').agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+    monthly = monthly.dropna(subset=['Close'])
+    monthly['Return'] = monthly['Close'].pct_change()
+    monthly.index = monthly.index.strftime('%Y-%m')
+    monthly.index.name = 'Month'
+
+    return {
+        'schema': schema,
+        'rows': len(data),
+        'start': dates[0],
+        'end': dates[-1],
+        'summary': summary,
+        'returns': returns,
+        'volatility': volatility,
+        'extremes': extremes,
+        'monthly': monthly,
+    }
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_profile(fingerprint, _data):
+    """
+    Build a profile once per data fingerprint (`_data` is identified by its fingerprint and not hashed).
+    """
+    return build_profile(_data)
+
+def get_profile(data):
+    """
+    Return the profile of a ticker's historical data, computed once per data content.
+
+    Args:
+        data (pd.DataFrame): Historical data with a 'Date' column and the price columns.
+
+    Returns:
+        dict: Output of `build_profile`.
+    """
+    return cached_profile(data_fingerprint(data), data)
+
+def profile_prompt(profile, ticker):
+    """
+    Render a profile as compact text for a language model prompt (tables as CSV, which takes
+    fewer tokens than padded tables).
+
+    Args:
+        profile (dict): Output of `build_profile`.
+        ticker (str): The ticker symbol.
+
+    Returns:
+        str: The profile text.
+    """
+    schema = ", ".join(f"{column} ({dtype})" for column, dtype in zip(profile['schema']['Column'], profile['schema']['Type']))
+    summary = profile['summary'].rename(columns={'50%': 'median'}).to_csv(float_format='%.2f')
+    returns = ", ".join(f"{label}: {value:.2%}" for label, value in profile['returns']['Return'].items())
+    volatility = ", ".join(f"{label}: {value:.2%}" for label, value in profile['volatility']['Annualized Volatility'].items())
+
+    formats = {'Largest daily gain': '.2%', 'Largest daily loss': '.2%', 'Maximum drawdown': '.2%', 'Highest volume': ',.0f'}
+    extremes = "\n".join(
+        f"{metric}: {value:{formats.get(metric, ',.2f')}} on {date:%Y-%m-%d}"
+        for metric, (value, date) in profile['extremes'].iterrows()
+    )
+    volumes = profile['monthly']['Volume']
+    if not volumes.empty:
+        extremes += f"\nHighest monthly volume: {volumes.max():,.0f} in {volumes.idxmax()}"
+
+    monthly = profile['monthly'][['High', 'Low', 'Close', 'Volume', 'Return']].assign(
+        Volume=profile['monthly']['Volume'] / 1e6, Return=profile['monthly']['Return'] * 100,
+    ).rename(columns={'Volume': 'Volume (M)', 'Return': 'Return (%)'})
+
+    return "\n\n".join([
+        f"Daily data of {ticker}: {profile['rows']:,} rows from {profile['start']:%Y-%m-%d} to {profile['end']:%Y-%m-%d}.\nColumns: {schema}",
+        "Summary statistics:\n" + summary.strip(),
+        f"Returns up to the last date: {returns}",
+        f"Annualized volatility of daily log returns: {volatility}",
+        "Extremes:\n" + extremes,
+        "Monthly aggregates:\n" + monthly.to_csv(float_format='%.1f').strip(),
+    ])
@@ -0,0 +1,114 @@
+from collections import OrderedDict, namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+# Number of shared memory blocks a worker process keeps attached
+MAX_ATTACHED = 32
+
+# Picklable reference to a frame published in shared memory: block name, number of rows,
+# and (column, dtype, byte offset) of each column
+SharedFrameHandle = namedtuple("SharedFrameHandle", ["name", "length", "columns"])
+
+# Blocks attached by this process, most recently used last
+_attached = OrderedDict()
+
+class SharedFrame:
+    """
+    Publish the columns of a DataFrame in one shared memory block, so worker processes can
+    read them by handle instead of receiving a pickled copy with every task.
+
+    Only numeric, boolean and datetime columns are supported. The block is owned by the
+    publishing process and removed by `close` (or when leaving the `with` block), which must
+    only happen once every task using the handle is done.
+
+    Args:
+        data (pd.DataFrame): Frame to publish.
+
+    Example:
+        with SharedFrame(data) as shared:
+            executor.submit(task, shared.handle)
+    """
+
+    def __init__(self, data):
+        columns, offset = [], 0
+        arrays = []
+        for column in data.columns:
+            array = np.ascontiguousarray(data[column].to_numpy())
+            if array.dtype.kind not in "biufM":
+                raise TypeError(f"Column {column!r} of dtype {array.dtype} cannot be shared.")
+            offset = -(-offset // 8) * 8  # Align each column on 8 bytes
+            columns.append((column, array.dtype.str, offset))
+            arrays.append((array, offset))
+            offset += array.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for array, start in arrays:
+            self.shm.buf[start:start + array.nbytes] = array.view(np.uint8)
+        self.handle = SharedFrameHandle(self.shm.name, len(data), tuple(columns))
+
+    def close(self):
+        """
+        Release the shared memory block.
+        """
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def attach_shm(name):
+    """
+    Attach a shared memory block by name, reusing this process's attachment if any.
+    """
+    shm = _attached.get(name)
+    if shm is not None:
+        _attached.move_to_end(name)
+        return shm
+
+    # Pool workers share the publisher's resource tracker, so the block is only unlinked by its owner
+    shm = shared_memory.SharedMemory(name=name)
+    _attached[name] = shm
+
+    # Detach the least recently used blocks, unless a frame still references them
+    while len(_attached) > MAX_ATTACHED:
+        oldest_name, oldest = next(iter(_attached.items()))
+        try:
+            oldest.close()
+        except BufferError:
+            break
+        del _attached[oldest_name]
+    return shm
+
+def attach_frame(handle):
+    """
+    Rebuild a published DataFrame as read-only NumPy views on the shared memory (no copy).
+
+    Args:
+        handle (SharedFrameHandle): Handle of the published frame.
+
+    Returns:
+        pd.DataFrame: Frame whose columns are views on the shared block.
+    """
+    shm = attach_shm(handle.name)
+    columns = {}
+    for column, dtype, offset in handle.columns:
+        array = np.ndarray((handle.length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        array.flags.writeable = False
+        columns[column] = array
+    return pd.DataFrame(columns, copy=False)
+
+def as_frame(data):
+    """
+    Return `data` itself if it is a DataFrame, or the frame it refers to if it is a `SharedFrameHandle`.
+
+    Lets worker functions accept either, so they still work without a pool.
+    """
+    if isinstance(data, SharedFrameHandle):
+        return attach_frame(data)
+    return data
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Future
+import streamlit as st
+
+class LeaderAborted(Exception):
+    """
+    Raised to the waiting callers when the call they were waiting on was interrupted
+    (e.g., its Streamlit script was stopped) rather than failing on its own.
+    """
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls so that only one of them does the work.
+
+    The first caller for a key runs the function; callers arriving with the same key while it
+    is in flight wait for it and share its result or exception. Nothing is cached once the
+    call completes.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` once per key among concurrent callers.
+
+        Args:
+            key: Hashable key identifying identical calls.
+            fn: Function to run.
+
+        Returns:
+            The result of the call (shared by every caller with the same key).
+        """
+        while True:
+            with self.lock:
+                future = self.calls.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self.calls[key] = future
+
+            if leader:
+                break
+            try:
+                return future.result()
+            except LeaderAborted:
+                continue  # The leader was interrupted, so try to become the leader
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Script interruptions only concern the leader's session, so let the followers retry
+            future.set_exception(LeaderAborted())
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+
+@st.cache_resource(show_spinner=False)
+def get_single_flight():
+    """
+    Return the process-wide single-flight group.
+
+    Returns:
+        SingleFlight: Group shared by every session.
+    """
+    return SingleFlight()
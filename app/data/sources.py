@@ -0,0 +1,402 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import random
+import time
+import zlib
+from io import StringIO
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import yfinance as yf
+import streamlit as st
+from .client import get_session
+
+# Data source settings, overridable through environment variables
+DATA_SOURCE = os.getenv("DATA_SOURCE", "yahoo")          # Backend: 'yahoo', 'local' or 'synthetic'
+DATA_DIR = os.getenv("DATA_DIR", "data")                 # Directory used by the local backend
+DATA_LATENCY = float(os.getenv("DATA_LATENCY", "0"))     # Injected latency (seconds) per call, local/synthetic only
+DATA_SEED = int(os.getenv("DATA_SEED", "42"))            # Seed of the synthetic generator
+
+# Columns returned by every backend, in the same order as yfinance
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+# Length in minutes of each supported intraday bar interval (yfinance interval strings)
+INTRADAY_MINUTES = {'1m': 1, '2m': 2, '5m': 5, '15m': 15, '30m': 30, '1h': 60}
+
+# Columns of the symbol listings returned by `DataSource.symbols`
+SYMBOL_COLUMNS = ['symbol', 'name', 'quote_type']
+
+# Nasdaq Trader symbol directories (all US-listed stocks and ETFs)
+NASDAQ_LISTINGS = [
+    ("https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt", "Symbol"),
+    ("https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt", "ACT Symbol"),
+]
+
+# yfinance period strings mapped to offsets from the end date
+PERIODS = {
+    "1d": pd.DateOffset(days=1), "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3), "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2), "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+class DataSource(ABC):
+    """
+    Interface for historical prices and ticker metadata.
+
+    Backends return data shaped like yfinance: `download` returns a DataFrame indexed by 'Date'
+    with the columns in `PRICE_COLUMNS` (empty if the ticker is unknown), and `info` returns
+    a dictionary using the `Ticker.info` keys (empty if the ticker is unknown). Backends missing
+    one of the abstract methods fail when they are created.
+    """
+
+    @abstractmethod
+    def download(self, ticker, start=None, end=None, period=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def info(self, ticker):
+        raise NotImplementedError
+
+    @abstractmethod
+    def download_intraday(self, ticker, start, end, interval):
+        """
+        Return the intraday bars of a ticker between `start` (included) and `end` (excluded), with
+        the columns in `PRICE_COLUMNS` indexed by the bar's start time in exchange local time.
+        """
+        raise NotImplementedError
+
+    def download_many(self, tickers, start=None, end=None, period=None):
+        """
+        Return the close prices of several tickers as one DataFrame indexed by 'Date', with one
+        column per ticker (NaN where a ticker has no price). Backends with a batched endpoint
+        override this to fetch every ticker in one call.
+        """
+        closes = {ticker: self.download(ticker, start=start, end=end, period=period)['Close'] for ticker in tickers}
+        return pd.DataFrame(closes).rename_axis('Date')
+
+    def symbols(self):
+        """
+        Return the listing of known symbols, with columns `SYMBOL_COLUMNS`.
+        """
+        return pd.DataFrame(columns=SYMBOL_COLUMNS)
+
+class YahooSource(DataSource):
+    """
+    Backend fetching data from Yahoo Finance through the shared rate-limited session.
+    """
+
+    def download(self, ticker, start=None, end=None, period=None):
+        if period:
+            return yf.download(ticker, period=period, session=get_session())
+        return yf.download(ticker, start=start, end=end, session=get_session())
+
+    def info(self, ticker):
+        return yf.Ticker(ticker, session=get_session()).info
+
+    def download_intraday(self, ticker, start, end, interval):
+        data = yf.download(ticker, start=start, end=end, interval=interval, session=get_session())
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        if isinstance(data.index, pd.DatetimeIndex) and data.index.tz is not None:
+            data.index = data.index.tz_localize(None)  # Keep the exchange's wall-clock time
+        return data.rename_axis('Date')
+
+    def download_many(self, tickers, start=None, end=None, period=None):
+        # One multi-symbol request instead of one per ticker
+        tickers = list(tickers)
+        if period:
+            data = yf.download(tickers, period=period, group_by='column', session=get_session())
+        else:
+            data = yf.download(tickers, start=start, end=end, group_by='column', session=get_session())
+        if data.empty:
+            return pd.DataFrame(columns=tickers, index=pd.DatetimeIndex([], name='Date'))
+        closes = data['Close'] if isinstance(data.columns, pd.MultiIndex) else data[['Close']].set_axis(tickers, axis=1)
+        return closes.reindex(columns=tickers).rename_axis('Date')
+
+    def symbols(self):
+        # Yahoo Finance has no listing endpoint, so use the Nasdaq Trader symbol directories
+        listings = []
+        for url, symbol_column in NASDAQ_LISTINGS:
+            response = get_session().get(url)
+            response.raise_for_status()
+            listing = pd.read_csv(StringIO(response.text), sep="|", dtype=str)
+            listing = listing[listing['Test Issue'] == 'N']  # Drops test issues and the trailing file timestamp row
+            listings.append(pd.DataFrame({
+                'symbol': listing[symbol_column].str.replace('.', '-', regex=False),  # Yahoo uses '-' for share classes
+                'name': listing['Security Name'],
+                'quote_type': listing['ETF'].map({'Y': 'ETF'}).fillna('EQUITY'),
+            }))
+        return pd.concat(listings, ignore_index=True).drop_duplicates('symbol')
+
+class OfflineSource(DataSource):
+    """
+    Base class for the offline backends, adding latency injection and date-window slicing.
+
+    Args:
+        latency (float): Mean delay (seconds) added to each call, with +/-50% uniform jitter.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def wait(self):
+        if self.latency > 0:
+            time.sleep(self.latency * random.uniform(0.5, 1.5))
+
+    def download(self, ticker, start=None, end=None, period=None):
+        self.wait()
+        data = self.history(ticker)
+        if data.empty:
+            return data
+
+        # Resolve the requested window the same way yfinance does (end date excluded)
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp("today").normalize() + pd.Timedelta(days=1)
+        if period in PERIODS:
+            start = end - PERIODS[period]
+        elif period == "ytd":
+            start = pd.Timestamp(year=end.year, month=1, day=1)
+        start = pd.Timestamp(start) if start is not None else data.index[0]
+
+        return data.loc[(data.index >= start) & (data.index < end)].copy()
+
+    def info(self, ticker):
+        self.wait()
+        return self.metadata(ticker)
+
+    def download_intraday(self, ticker, start, end, interval):
+        self.wait()
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        data = self.intraday_history(ticker, start, end, interval)
+        return data.loc[(data.index >= start) & (data.index < end)].copy()
+
+    @abstractmethod
+    def history(self, ticker):
+        """
+        Return the full daily history of a ticker, shaped like `download`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def intraday_history(self, ticker, start, end, interval):
+        """
+        Return the intraday bars of a ticker covering at least `start` to `end`, shaped like `download_intraday`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def metadata(self, ticker):
+        """
+        Return the metadata of a ticker, shaped like `info`.
+        """
+        raise NotImplementedError
+
+class LocalFileSource(OfflineSource):
+    """
+    Backend reading one Parquet or CSV file per ticker from a local directory.
+
+    Files are named after the ticker (e.g. `AAPL.parquet` or `AAPL.csv`) and hold a 'Date' column
+    plus the price columns. Metadata is read from an optional `AAPL.json` file.
+
+    Args:
+        directory (str): Directory holding the files.
+        latency (float): Mean delay (seconds) added to each call.
+    """
+
+    def __init__(self, directory=DATA_DIR, latency=0.0):
+        super().__init__(latency)
+        self.directory = Path(directory)
+
+    def history(self, ticker):
+        parquet_path = self.directory / f"{ticker}.parquet"
+        csv_path = self.directory / f"{ticker}.csv"
+
+        if parquet_path.exists():
+            data = pd.read_parquet(parquet_path)
+        elif csv_path.exists():
+            data = pd.read_csv(csv_path, parse_dates=['Date'])
+        else:
+            return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+
+        if 'Date' in data.columns:
+            data = data.set_index('Date')
+        data.index = pd.to_datetime(data.index)
+        data.index.name = 'Date'
+        return data.sort_index()[PRICE_COLUMNS]
+
+    def intraday_history(self, ticker, start, end, interval):
+        # Intraday bars are stored next to the daily file, e.g. `AAPL.5m.parquet`
+        path = self.directory / f"{ticker}.{interval}.parquet"
+        if not path.exists():
+            return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+        data = pd.read_parquet(path, filters=[('Date', '>=', start), ('Date', '<', end)])
+        if 'Date' in data.columns:
+            data = data.set_index('Date')
+        return data.sort_index()[PRICE_COLUMNS]
+
+    def metadata(self, ticker):
+        json_path = self.directory / f"{ticker}.json"
+        if json_path.exists():
+            with open(json_path) as f:
+                return json.load(f)
+
+        # Fall back to minimal metadata when only prices are available
+        if (self.directory / f"{ticker}.parquet").exists() or (self.directory / f"{ticker}.csv").exists():
+            return {"symbol": ticker, "longName": ticker, "quoteType": guess_quote_type(ticker)}
+        return {}
+
+    def symbols(self):
+        tickers = sorted({path.stem for pattern in ["*.parquet", "*.csv"] for path in self.directory.glob(pattern)})
+        rows = []
+        for ticker in tickers:
+            metadata = self.metadata(ticker)
+            rows.append({
+                'symbol': ticker,
+                'name': metadata.get('longName', ticker),
+                'quote_type': metadata.get('quoteType', guess_quote_type(ticker)),
+            })
+        return pd.DataFrame(rows, columns=SYMBOL_COLUMNS)
+
+class SyntheticSource(OfflineSource):
+    """
+    Backend generating deterministic geometric Brownian motion series for any ticker.
+
+    The same ticker and seed always produce the same series, and every date window is a slice
+    of one series starting on `origin`, so overlapping requests return consistent prices.
+
+    Args:
+        seed (int): Seed combined with the ticker to derive each series.
+        latency (float): Mean delay (seconds) added to each call.
+        origin (str): First date of every generated series.
+    """
+
+    def __init__(self, seed=DATA_SEED, latency=0.0, origin="2000-01-03"):
+        super().__init__(latency)
+        self.seed = seed
+        self.origin = pd.Timestamp(origin)
+
+    def rng(self, ticker):
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+
+    def history(self, ticker):
+        quote_type = guess_quote_type(ticker)
+        if quote_type in ["FUTURE", "OPTION"]:
+            return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+
+        # Crypto trades every day, everything else on business days
+        freq = 'D' if quote_type == "CRYPTOCURRENCY" else 'B'
+        dates = pd.date_range(self.origin, pd.Timestamp("today").normalize(), freq=freq, name='Date')
+
+        rng = self.rng(ticker)
+        start_price = rng.uniform(10, 500)
+        drift = rng.uniform(-0.05, 0.15) / 252
+        volatility = rng.uniform(0.15, 0.6) / np.sqrt(252)
+
+        # Close prices follow a GBM, the other columns are derived from it
+        log_returns = drift - 0.5 * volatility ** 2 + volatility * rng.standard_normal(len(dates))
+        close = start_price * np.exp(np.cumsum(log_returns))
+        spread = np.abs(rng.standard_normal(len(dates))) * volatility * close
+        open_ = np.concatenate(([start_price], close[:-1]))
+        volume = rng.integers(1_000_000, 50_000_000, len(dates)) if quote_type == "EQUITY" else np.zeros(len(dates), dtype=int)
+
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Close': close,
+            'Adj Close': close,
+            'Volume': volume,
+        }, index=dates)
+
+    def intraday_history(self, ticker, start, end, interval):
+        daily = self.history(ticker)
+        daily = daily.loc[(daily.index >= start.normalize()) & (daily.index < end)]
+        if daily.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+
+        # Crypto trades around the clock, everything else from 09:30 to 16:00
+        around_the_clock = guess_quote_type(ticker) == "CRYPTOCURRENCY"
+        session_start = pd.Timedelta(0) if around_the_clock else pd.Timedelta(hours=9, minutes=30)
+        minutes = INTRADAY_MINUTES[interval]
+        bars = (1440 if around_the_clock else 390) // minutes
+
+        # Each day is a Brownian bridge from its daily open to its daily close, drawn from a
+        # generator seeded by the day, so every request window sees the same bars
+        noise = np.empty((len(daily), bars))
+        for i, day in enumerate(daily.index):
+            rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode()), day.toordinal()])
+            noise[i] = rng.standard_normal(bars)
+        log_open = np.log(daily['Open'].to_numpy())[:, None]
+        log_close = np.log(daily['Close'].to_numpy())[:, None]
+        day_range = np.log(daily['High'].to_numpy() / daily['Low'].to_numpy())[:, None]  # Scale of the intraday moves
+        walk = np.cumsum(noise, axis=1) * day_range / (2 * np.sqrt(bars))
+        steps = np.arange(1, bars + 1) / bars
+        path = log_open + steps * (log_close - log_open) + walk - steps * walk[:, -1:]
+
+        close = np.exp(path)
+        open_ = np.concatenate([np.exp(log_open), close[:, :-1]], axis=1)
+        spread = np.abs(noise) * 1e-3 * close
+        volume = np.repeat(daily['Volume'].to_numpy()[:, None] // bars, bars, axis=1)
+        dates = (daily.index.to_numpy()[:, None] + session_start.to_timedelta64() + np.arange(bars) * np.timedelta64(minutes, 'm')).ravel()
+
+        return pd.DataFrame({
+            'Open': open_.ravel(),
+            'High': (np.maximum(open_, close) + spread).ravel(),
+            'Low': (np.minimum(open_, close) - spread).ravel(),
+            'Close': close.ravel(),
+            'Adj Close': close.ravel(),
+            'Volume': volume.ravel(),
+        }, index=pd.DatetimeIndex(dates, name='Date'))
+
+    def metadata(self, ticker):
+        rng = self.rng(ticker)
+        close = self.history(ticker)['Close']
+        if close.empty:
+            return {"symbol": ticker, "quoteType": guess_quote_type(ticker)}
+        return {
+            "symbol": ticker,
+            "longName": f"Synthetic {ticker}",
+            "quoteType": guess_quote_type(ticker),
+            "currentPrice": round(float(close.iloc[-1]), 2),
+            "previousClose": round(float(close.iloc[-2]), 2),
+            "fiftyTwoWeekHigh": round(float(close.iloc[-252:].max()), 2),
+            "fiftyTwoWeekLow": round(float(close.iloc[-252:].min()), 2),
+            "marketCap": int(rng.uniform(1e9, 3e12)),
+            "beta": round(float(rng.uniform(0.5, 2)), 2),
+            "forwardPE": round(float(rng.uniform(5, 60)), 2),
+        }
+
+def guess_quote_type(ticker):
+    """
+    Infer the Yahoo Finance quote type from the ticker suffix (used by the offline backends).
+
+    Args:
+        ticker (str): The ticker symbol.
+
+    Returns:
+        str: Quote type (e.g., 'EQUITY', 'CRYPTOCURRENCY', 'CURRENCY').
+    """
+    if ticker.endswith("=X"):
+        return "CURRENCY"
+    if ticker.endswith("=F"):
+        return "FUTURE"
+    if ticker.startswith("^"):
+        return "INDEX"
+    if ticker.endswith(("-USD", "-EUR")):
+        return "CRYPTOCURRENCY"
+    return "EQUITY"
+
+@st.cache_resource(show_spinner=False)
+def get_data_source():
+    """
+    Return the process-wide data source selected by the `DATA_SOURCE` environment variable.
+
+    Returns:
+        DataSource: The configured backend.
+    """
+    if DATA_SOURCE == "local":
+        return LocalFileSource(DATA_DIR, latency=DATA_LATENCY)
+    if DATA_SOURCE == "synthetic":
+        return SyntheticSource(DATA_SEED, latency=DATA_LATENCY)
+    return YahooSource()
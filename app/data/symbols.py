@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+import pandas as pd
+import streamlit as st
+from .sources import get_data_source, SYMBOL_COLUMNS
+
+# Symbol index settings, overridable through environment variables
+SYMBOL_INDEX_PATH = Path(os.getenv("SYMBOL_INDEX_PATH", ".cache/symbols.csv"))   # Local copy of the index
+SYMBOL_INDEX_REFRESH = int(os.getenv("SYMBOL_INDEX_REFRESH", str(24 * 3600)))   # Seconds between refreshes
+
+class SymbolIndex:
+    """
+    In-memory index of ticker symbols kept as sorted parallel lists.
+
+    Exact lookups and prefix searches are binary searches over the sorted symbols, so they
+    answer in microseconds without touching the network. The lists are never modified in
+    place: `add` builds new ones and swaps them in as one tuple, so readers always see a
+    consistent snapshot without taking the lock.
+
+    Args:
+        listing (pd.DataFrame): Symbols with columns 'symbol', 'name' and 'quote_type'.
+    """
+
+    def __init__(self, listing):
+        listing = listing.dropna(subset=['symbol']).drop_duplicates('symbol').sort_values('symbol')
+        self.entries = (
+            listing['symbol'].tolist(),
+            listing['name'].fillna(listing['symbol']).tolist(),
+            listing['quote_type'].fillna('Unknown').tolist(),
+        )
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries[0])
+
+    def lookup(self, symbol):
+        """
+        Return the (name, quote type) of a symbol, or None if it is not in the index.
+        """
+        symbols, names, types = self.entries
+        i = bisect_left(symbols, symbol)
+        if i < len(symbols) and symbols[i] == symbol:
+            return names[i], types[i]
+        return None
+
+    def prefix(self, prefix, limit=10):
+        """
+        Return up to `limit` (symbol, name, quote type) tuples whose symbol starts with `prefix`.
+        """
+        if not prefix:
+            return []
+        symbols, names, types = self.entries
+        start = bisect_left(symbols, prefix)
+        end = min(bisect_left(symbols, prefix + "\uffff"), start + limit)
+        return list(zip(symbols[start:end], names[start:end], types[start:end]))
+
+    def add(self, symbol, name, quote_type):
+        """
+        Add a symbol learned from the data source, and append it to the local copy of the index.
+        """
+        with self.lock:
+            if self.lookup(symbol) is not None:
+                return
+            symbols, names, types = self.entries
+            i = bisect_left(symbols, symbol)
+            self.entries = (
+                symbols[:i] + [symbol] + symbols[i:],
+                names[:i] + [name or symbol] + names[i:],
+                types[:i] + [quote_type or 'Unknown'] + types[i:],
+            )
+
+            try:
+                SYMBOL_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+                header = not SYMBOL_INDEX_PATH.exists()
+                pd.DataFrame([[symbol, name, quote_type]], columns=SYMBOL_COLUMNS).to_csv(
+                    SYMBOL_INDEX_PATH, mode="a", header=header, index=False
+                )
+            except OSError:
+                pass  # The index still works in memory
+
+def refresh_symbol_index():
+    """
+    Download the symbol listing from the data source and save it as the local index.
+
+    Symbols learned since the last refresh (e.g., cryptocurrencies or currencies validated
+    by users) are kept.
+
+    Returns:
+        pd.DataFrame: The refreshed listing.
+    """
+    listing = get_data_source().symbols()
+    if SYMBOL_INDEX_PATH.exists():
+        previous = pd.read_csv(SYMBOL_INDEX_PATH, dtype=str, keep_default_na=False)
+        listing = pd.concat([listing, previous[~previous['symbol'].isin(listing['symbol'])]], ignore_index=True)
+
+    SYMBOL_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    listing[SYMBOL_COLUMNS].to_csv(SYMBOL_INDEX_PATH, index=False)
+    refresh_marker().touch()  # Appending learned symbols must not postpone the next refresh
+    return listing
+
+def refresh_marker():
+    """
+    Return the path of the file whose modification time records the last refresh.
+    """
+    return SYMBOL_INDEX_PATH.with_suffix(".refreshed")
+
+@st.cache_resource(show_spinner=False, ttl=SYMBOL_INDEX_REFRESH)
+def get_symbol_index():
+    """
+    Return the process-wide symbol index, refreshing the local copy when it is older than
+    `SYMBOL_INDEX_REFRESH` seconds.
+
+    Returns:
+        SymbolIndex: The symbol index (empty if no listing is available).
+    """
+    marker = refresh_marker()
+    stale = not marker.exists() or time.time() - marker.stat().st_mtime > SYMBOL_INDEX_REFRESH
+    if stale:
+        try:
+            return SymbolIndex(refresh_symbol_index())
+        except Exception as e:
+            print(f"Error refreshing the symbol index: {e}")
+
+    if SYMBOL_INDEX_PATH.exists():
+        return SymbolIndex(pd.read_csv(SYMBOL_INDEX_PATH, dtype=str, keep_default_na=False))
+    return SymbolIndex(pd.DataFrame(columns=SYMBOL_COLUMNS))
@@ -1,3 +1,9 @@
 from .prophet import *
 from .arima import *
 from .metrics import *
+from .registry import *
+from .tuning import *
+from .scenarios import *
+from .portfolio import *
+from .backtest import *
+from .intraday import *
@@ -1,43 +1,102 @@
+import numpy as np
 import pandas as pd
-from pmdarima import auto_arima
+from pmdarima import auto_arima, ARIMA as PmdARIMA
 from statsmodels.tsa.arima.model import ARIMA
 from sklearn.model_selection import TimeSeriesSplit
 import plotly.graph_objects as go
 import streamlit as st
+from app.data.calendar import future_sessions
+from .intervals import INTERVAL_METHOD, INTERVAL_SAMPLES, INTERVAL_WIDTH, simulated_bounds, add_interval_band
 
-def fit_arima_model(data, period):
+def train_arima_model(data, params=None):
     """
-    Fits an ARIMA model and forecasts future values.
+    Fits an ARIMA model, automatically selecting the best order with AutoARIMA
+    unless a known order is given.
 
     Args:
         data: Historical data.
-        period: Number of periods (days) to forecast into the future.
+        params (dict): Optional 'order' and 'seasonal_order' (e.g., saved by `search_arima_order`).
 
     Returns:
         m_arima (AutoARIMA): Fitted ARIMA model.
-        forecast_df: DataFrame containing forecasted values and corresponding dates.
     """
+    if params and params.get('order'):
+        m_arima = PmdARIMA(
+            order=tuple(params['order']),
+            seasonal_order=tuple(params.get('seasonal_order') or (0, 0, 0, 0)),
+            suppress_warnings=True,
+        ).fit(data['Close'])
+        print(m_arima.summary())
+        return m_arima
 
-    # Automatically find the best ARIMA order using AutoARIMA
     m_arima = auto_arima(
                 data['Close'],
                 trace=True,              # Show model fitting process
                 suppress_warnings=True,  # Suppress irrelevant warnings
             )
     print(m_arima.summary())
+    return m_arima
+
+def forecast_arima_model(m_arima, data, period, interval_method=INTERVAL_METHOD, samples=INTERVAL_SAMPLES, width=INTERVAL_WIDTH, future_dates=None):
+    """
+    Forecasts future values with a fitted ARIMA model.
+
+    Args:
+        m_arima (AutoARIMA): Fitted ARIMA model.
+        data: Historical data the model was fitted on.
+        period: Horizon in days; only the trading sessions of the series within it are forecast.
+        interval_method (str): 'analytic' (closed-form confidence intervals), 'simulation'
+            (quantiles of `samples` simulated paths) or 'none'.
+        samples (int): Number of simulated paths for the 'simulation' method.
+        width (float): Coverage of the prediction intervals.
+        future_dates (pd.DatetimeIndex): Dates of the forecast steps, instead of the next trading sessions (e.g. intraday bar times).
+
+    Returns:
+        forecast_df: DataFrame containing forecasted values and corresponding dates,
+            with 'Lower' and 'Upper' bounds unless `interval_method` is 'none'.
+    """
+
+    # One step per trading session of the horizon, so weekends and holidays are not forecast
+    forecast_dates = future_dates if future_dates is not None else future_sessions(data['Date'], period)
+    steps = len(forecast_dates)
 
     # Forecast for the specified future periods
-    future_forecast = m_arima.predict(n_periods=period)
+    if interval_method == "analytic":
+        future_forecast, conf_int = m_arima.predict(n_periods=steps, return_conf_int=True, alpha=1 - width)
+        lower, upper = conf_int[:, 0], conf_int[:, 1]
+    else:
+        future_forecast = m_arima.predict(n_periods=steps)
 
-    # Generate future dates for the forecast period
-    forecast_dates = pd.date_range(start=data['Date'].iloc[-1] + pd.Timedelta(days=1), periods=period, freq='D')
+    if interval_method == "simulation":
+        # Simulate all paths at once from the end of the sample
+        paths = m_arima.arima_res_.simulate(steps, anchor='end', repetitions=samples)
+        lower, upper = simulated_bounds(np.asarray(paths).reshape(steps, samples), width)
 
     # Create a DataFrame to store forecasted values along with dates
     forecast_df = pd.DataFrame({
         'Date': forecast_dates,
-        'Forecast': future_forecast
+        'Forecast': np.asarray(future_forecast)
     })
+    if interval_method in ["analytic", "simulation"]:
+        forecast_df['Lower'] = lower
+        forecast_df['Upper'] = upper
 
+    return forecast_df
+
+def fit_arima_model(data, period):
+    """
+    Fits an ARIMA model and forecasts future values.
+
+    Args:
+        data: Historical data.
+        period: Number of periods (days) to forecast into the future.
+
+    Returns:
+        m_arima (AutoARIMA): Fitted ARIMA model.
+        forecast_df: DataFrame containing forecasted values and corresponding dates.
+    """
+    m_arima = train_arima_model(data)
+    forecast_df = forecast_arima_model(m_arima, data, period)
     return m_arima, forecast_df
 
 def cross_validation_arima(data, m_arima):
@@ -51,30 +110,35 @@ def cross_validation_arima(data, m_arima):
     Returns:
         results_df: DataFrame with actual and predicted values during cross-validation.
     """
-    
+    return pd.concat([fold_df for _, _, fold_df in cross_validation_arima_folds(data, m_arima)], ignore_index=True)
+
+def cross_validation_arima_folds(data, m_arima, n_splits=5):
+    """
+    Performs the rolling cross-validation of `cross_validation_arima` one split at a time,
+    so that callers can show results as each fold completes or stop early.
+
+    Args:
+        data : Historical data.
+        m_arima (AutoARIMA): Fitted ARIMA model.
+        n_splits (int): Number of splits.
+
+    Yields:
+        tuple: Fold number (from 1), number of folds and a DataFrame with the fold's actual and predicted values.
+    """
     data = data['Close']  # Extract close price series
-    
+
     # Initialize TimeSeriesSplit for cross-validation (rolling forward)
-    tscv = TimeSeriesSplit(n_splits=5)
- 
-    # List to store cross-validation results
-    results = []
+    tscv = TimeSeriesSplit(n_splits=n_splits)
 
     # Perform rolling cross-validation on splits
-    for train_index, test_index in tscv.split(data):
-        train, test = data.iloc[train_index], data.iloc[test_index]
+    for fold, (train_index, test_index) in enumerate(tscv.split(data), start=1):
+        test = data.iloc[test_index]
 
-        # Forecast for the test set (one-step ahead)
+        # Forecast for the test set
         predictions = m_arima.predict(n_periods=len(test))
 
         # Store actual vs predicted values
-        for actual, predicted in zip(test.values.flatten(), predictions):
-            results.append({'Actual': actual, 'Predicted': predicted})
-
-    # Convert the result list to a DataFrame
-    results_df = pd.DataFrame(results)
-    
-    return results_df
+        yield fold, n_splits, pd.DataFrame({'Actual': test.to_numpy(), 'Predicted': np.asarray(predictions)})
 
 def plot_arima_forecast(data, forecast):
     """
@@ -105,6 +169,10 @@ def plot_arima_forecast(data, forecast):
             hovertemplate='Actual: %{y:.2f}<extra></extra>',
         ))
 
+        # Plot the prediction interval band
+        if 'Lower' in forecast and 'Upper' in forecast:
+            add_interval_band(fig, forecast['Date'], forecast['Lower'], forecast['Upper'])
+
         # Plot forecasted data ('Predicted' line)
         fig.add_trace(go.Scatter(
             x=forecast['Date'],
@@ -0,0 +1,238 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from app.data.preprocess import preprocess
+from app.data.shared import SharedFrame, as_frame
+from .prophet import train_prophet_model, forecast_prophet_model
+from .arima import train_arima_model, forecast_arima_model
+from .tuning import load_model_params
+
+# Backtest settings, overridable through environment variables
+BACKTEST_DIR = Path(os.getenv("BACKTEST_DIR", ".cache/backtest"))              # Results store, one Parquet file per model and ticker
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "0")) or os.cpu_count()  # Number of worker processes
+BACKTEST_STEP = int(os.getenv("BACKTEST_STEP", "90"))                          # Days between cutoffs
+BACKTEST_INITIAL = int(os.getenv("BACKTEST_INITIAL", "730"))                   # Minimum days of training data before the first cutoff
+
+# Forecast horizons evaluated at each cutoff, in days
+BACKTEST_HORIZONS = (30, 90, 180, 365)
+
+# Fixed origin of the cutoff grid, so cutoffs are the same from one run to the next
+CUTOFF_ORIGIN = pd.Timestamp("2000-01-03")
+
+# Columns of the results store
+RESULT_COLUMNS = ['ticker', 'model', 'cutoff', 'horizon', 'points', 'mape', 'mae', 'rmse', 'computed_at']
+
+def backtest_cutoffs(dates, horizons=BACKTEST_HORIZONS, step=BACKTEST_STEP, initial=BACKTEST_INITIAL):
+    """
+    List the walk-forward cutoffs that can be fully evaluated on the given dates.
+
+    Cutoffs lie on a fixed grid of `step` days, so a later run with more data only adds new cutoffs
+    at the end. A cutoff needs `initial` days of history before it and the longest horizon after it.
+
+    Args:
+        dates (pd.Series): Dates of the history.
+        horizons (tuple): Forecast horizons in days.
+        step (int): Days between cutoffs.
+        initial (int): Minimum days of training data.
+
+    Returns:
+        list: Cutoff timestamps, oldest first.
+    """
+    first = dates.min() + pd.Timedelta(days=initial)
+    last = dates.max() - pd.Timedelta(days=max(horizons))
+    grid = pd.date_range(CUTOFF_ORIGIN, last, freq=f"{step}D")
+    return [cutoff for cutoff in grid if cutoff >= first]
+
+def evaluate_cutoff(data, model_selection, cutoff, horizons=BACKTEST_HORIZONS, params=None):
+    """
+    Fit a model on the data up to a cutoff and score its forecast at each horizon.
+
+    Runs in a worker process, so it only depends on its arguments.
+
+    Args:
+        data (pd.DataFrame or SharedFrameHandle): DataFrame with columns 'Date' and 'Close'.
+        model_selection (str): 'Prophet' or 'ARIMA'.
+        cutoff (pd.Timestamp): Last date of the training data.
+        horizons (tuple): Forecast horizons in days.
+        params (dict): Saved parameters of the model for this ticker.
+
+    Returns:
+        list: One dictionary per horizon with the number of scored points, MAPE (in %), MAE and RMSE
+            of the forecast over the days between the cutoff and the horizon.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    data = as_frame(data)
+    train = preprocess(data[data['Date'] <= cutoff])
+    period = max(horizons)
+
+    if model_selection == "Prophet":
+        forecast = forecast_prophet_model(train_prophet_model(train, params), period, interval_method="none")
+        forecast = forecast.rename(columns={'ds': 'Date', 'yhat': 'Forecast'})
+    else:
+        forecast = forecast_arima_model(train_arima_model(train, params), train, period, interval_method="none")
+
+    # Score the forecast on the dates that actually traded after the cutoff
+    scored = data[data['Date'] > cutoff].merge(forecast[['Date', 'Forecast']], on='Date')
+    days = (scored['Date'] - cutoff).dt.days.to_numpy()
+    errors = scored['Forecast'].to_numpy() - scored['Close'].to_numpy()
+    pct_errors = np.abs(errors / scored['Close'].to_numpy())
+
+    rows = []
+    for horizon in horizons:
+        within = days <= horizon
+        if not within.any():
+            continue
+        rows.append({
+            'horizon': horizon,
+            'points': int(within.sum()),
+            'mape': float(min(100 * pct_errors[within].mean(), 100)),  # Capped at 100 like `compute_metrics`
+            'mae': float(np.abs(errors[within]).mean()),
+            'rmse': float(np.sqrt(np.mean(errors[within] ** 2))),
+        })
+    return rows
+
+def results_path(ticker, model_selection):
+    return BACKTEST_DIR / model_selection / f"{ticker}.parquet"
+
+def load_backtest_results(ticker, model_selection):
+    """
+    Load the stored backtest results of a model for a ticker.
+
+    Args:
+        ticker (str): Ticker symbol.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+
+    Returns:
+        pd.DataFrame: One row per cutoff and horizon (empty if the ticker was never backtested).
+    """
+    path = results_path(ticker, model_selection)
+    if not path.exists():
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+def save_backtest_results(ticker, model_selection, rows):
+    """
+    Merge new result rows into the store of a model and ticker.
+
+    The file is rewritten through a temporary file, so readers never see a partial write.
+
+    Args:
+        ticker (str): Ticker symbol.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+        rows (list): New result rows.
+
+    Returns:
+        pd.DataFrame: All stored results of the model and ticker.
+    """
+    results = pd.concat([load_backtest_results(ticker, model_selection), pd.DataFrame(rows, columns=RESULT_COLUMNS)], ignore_index=True)
+    results['cutoff'] = pd.to_datetime(results['cutoff'])
+    results = results.drop_duplicates(['cutoff', 'horizon'], keep='last').sort_values(['cutoff', 'horizon']).reset_index(drop=True)
+
+    path = results_path(ticker, model_selection)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    results.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return results
+
+def run_backtest(histories, models=("Prophet", "ARIMA"), horizons=BACKTEST_HORIZONS, max_workers=BACKTEST_WORKERS, progress=None):
+    """
+    Run walk-forward backtests of several models on several tickers on a process pool.
+
+    Cutoffs already in the results store are skipped, so later runs only compute the new ones.
+    Results are saved as soon as every cutoff of a (ticker, model) pair is done.
+
+    Args:
+        histories (dict): DataFrame with columns 'Date' and 'Close' for each ticker.
+        models (tuple): Models to backtest.
+        horizons (tuple): Forecast horizons in days.
+        max_workers (int): Number of worker processes.
+        progress: Optional callback called with (ticker, model, cutoff, error) after each cutoff.
+
+    Returns:
+        dict: Number of cutoffs computed, skipped (already stored) and failed for each (ticker, model).
+    """
+    report = {}
+    tasks = {}
+    for ticker, data in histories.items():
+        data = data[['Date', 'Close']].reset_index(drop=True)
+        cutoffs = backtest_cutoffs(data['Date'], horizons)
+        for model_selection in models:
+            stored = load_backtest_results(ticker, model_selection)
+            # A cutoff is done once all its horizons are stored
+            done = set(pd.to_datetime(stored['cutoff'])[stored['horizon'] == max(horizons)])
+            missing = [cutoff for cutoff in cutoffs if cutoff not in done]
+            report[(ticker, model_selection)] = {'computed': 0, 'skipped': len(cutoffs) - len(missing), 'failed': 0}
+            if missing:
+                tasks[(ticker, model_selection)] = (data, missing, load_model_params(ticker, model_selection))
+
+    if not tasks:
+        return report
+
+    # Publish each history once in shared memory, so each task only carries a handle
+    shared = {}
+    for (ticker, _), (data, _, _) in tasks.items():
+        if ticker not in shared:
+            shared[ticker] = SharedFrame(data)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(evaluate_cutoff, shared[ticker].handle, model_selection, cutoff, horizons, params): (ticker, model_selection, cutoff)
+                for (ticker, model_selection), (_, cutoffs, params) in tasks.items()
+                for cutoff in cutoffs
+            }
+            pending = {key: len(cutoffs) for key, (_, cutoffs, _) in tasks.items()}
+            rows = {key: [] for key in tasks}
+
+            for future in as_completed(futures):
+                ticker, model_selection, cutoff = futures[future]
+                key = (ticker, model_selection)
+                error = None
+                try:
+                    computed_at = time.time()
+                    rows[key] += [
+                        {'ticker': ticker, 'model': model_selection, 'cutoff': cutoff, 'computed_at': computed_at, **row}
+                        for row in future.result()
+                    ]
+                    report[key]['computed'] += 1
+                except Exception as e:
+                    error = e
+                    report[key]['failed'] += 1
+                if progress:
+                    progress(ticker, model_selection, cutoff, error)
+
+                pending[key] -= 1
+                if pending[key] == 0 and rows[key]:
+                    save_backtest_results(ticker, model_selection, rows.pop(key))
+    finally:
+        for frame in shared.values():
+            frame.close()
+
+    return report
+
+def backtest_summary(results):
+    """
+    Summarize stored backtest results by horizon.
+
+    Args:
+        results (pd.DataFrame): Results returned by `load_backtest_results`.
+
+    Returns:
+        pd.DataFrame: Average MAPE, MAE and RMSE and number of cutoffs per horizon (empty if there are no results).
+    """
+    if results.empty:
+        return pd.DataFrame(columns=['Cutoffs', 'MAPE', 'MAE', 'RMSE'])
+    summary = results.groupby('horizon').agg(
+        Cutoffs=('cutoff', 'nunique'), MAPE=('mape', 'mean'), MAE=('mae', 'mean'), RMSE=('rmse', 'mean'),
+    )
+    summary.index = [f"{horizon} days" for horizon in summary.index]
+    summary.index.name = 'Horizon'
+    return summary
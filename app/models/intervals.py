@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import plotly.graph_objects as go
+from scipy.stats import norm
+
+# Prediction interval settings, overridable through environment variables
+INTERVAL_METHOD = os.getenv("INTERVAL_METHOD", "analytic")   # 'analytic', 'simulation' or 'none'
+INTERVAL_SAMPLES = int(os.getenv("INTERVAL_SAMPLES", "200"))  # Number of simulated paths for the 'simulation' method
+INTERVAL_WIDTH = float(os.getenv("INTERVAL_WIDTH", "0.8"))    # Coverage of the intervals (e.g., 0.8 for 80%)
+
+def normal_bounds(mean, std, width=INTERVAL_WIDTH):
+    """
+    Compute Gaussian interval bounds around a point forecast.
+
+    Args:
+        mean (np.ndarray): Point forecast.
+        std (float or np.ndarray): Standard deviation of the forecast error.
+        width (float): Coverage of the interval.
+
+    Returns:
+        tuple: Lower and upper bounds as arrays.
+    """
+    z = norm.ppf(0.5 + width / 2)
+    mean = np.asarray(mean, dtype=float)
+    return mean - z * std, mean + z * std
+
+def simulated_bounds(paths, width=INTERVAL_WIDTH):
+    """
+    Compute interval bounds from simulated paths in a single vectorized pass.
+
+    Args:
+        paths (np.ndarray): Simulated values with shape (periods, samples).
+        width (float): Coverage of the interval.
+
+    Returns:
+        tuple: Lower and upper bounds as arrays of length `periods`.
+    """
+    lower, upper = np.quantile(paths, [0.5 - width / 2, 0.5 + width / 2], axis=1)
+    return lower, upper
+
+def add_interval_band(fig, x, lower, upper, name='Prediction Interval'):
+    """
+    Add a shaded prediction interval band to a Plotly figure.
+
+    Args:
+        fig (go.Figure): Figure receiving the band.
+        x: Dates of the forecast.
+        lower: Lower bounds of the interval.
+        upper: Upper bounds of the interval.
+        name (str): Legend label of the band.
+    """
+    # Upper bound drawn first (invisible), then the lower bound filled up to it
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=upper,
+        mode='lines',
+        line=dict(width=0),
+        showlegend=False,
+        hovertemplate='Upper: %{y:.2f}<extra></extra>',
+    ))
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=lower,
+        mode='lines',
+        line=dict(width=0),
+        fill='tonexty',
+        fillcolor='rgba(255, 0, 0, 0.2)',
+        name=name,
+        hovertemplate='Lower: %{y:.2f}<extra></extra>',
+    ))
@@ -0,0 +1,90 @@
+import logging
+import pandas as pd
+import plotly.graph_objects as go
+from app.data.intraday import INTRADAY_FIT_BARS, downsample, future_bar_dates
+from .prophet import train_prophet_model, forecast_prophet_model
+from .arima import train_arima_model, forecast_arima_model
+from .intervals import add_interval_band
+
+def forecast_intraday(bars, model_selection, periods, fit_bars=INTRADAY_FIT_BARS):
+    """
+    Forecast the next intraday bars from a model fitted on the most recent aggregated bars.
+
+    Only the last `fit_bars` bars are used, so fitting cost does not grow with the stored
+    history, and forecasts are placed on the time slots the series trades.
+
+    Args:
+        bars (pd.DataFrame): Aggregated bars with columns 'Date' and 'Close', sorted by date.
+        model_selection (str): 'Prophet' or 'ARIMA'.
+        periods (int): Number of bars to forecast.
+        fit_bars (int): Number of most recent bars the model is fitted on.
+
+    Returns:
+        pd.DataFrame: 'Date', 'Forecast', 'Lower' and 'Upper' of each future bar.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    window = bars[['Date', 'Close']].iloc[-fit_bars:].reset_index(drop=True)
+    future_dates = future_bar_dates(window['Date'], periods)
+
+    if model_selection == "Prophet":
+        forecast = forecast_prophet_model(train_prophet_model(window), periods, future_dates=future_dates)
+        return forecast.rename(columns={'ds': 'Date', 'yhat': 'Forecast', 'yhat_lower': 'Lower', 'yhat_upper': 'Upper'})[
+            ['Date', 'Forecast', 'Lower', 'Upper']
+        ]
+    m_arima = train_arima_model(window)
+    return forecast_arima_model(m_arima, window, periods, future_dates=future_dates)
+
+def plot_intraday(bars, forecast=None):
+    """
+    Plot intraday close prices, downsampled to a bounded number of points, with an optional forecast.
+
+    Args:
+        bars (pd.DataFrame): Bars with columns 'Date' and 'Close'.
+        forecast (pd.DataFrame): Output of `forecast_intraday`, or None.
+
+    Returns:
+        fig (go.Figure): Plotly figure object.
+    """
+    common_font_style = dict(size=14, color='#ffffff')
+    shown = downsample(bars)
+    fig = go.Figure(go.Scatter(
+        x=shown['Date'], y=shown['Close'], mode='lines', name='Actual',
+        marker=dict(color='#87CEEB', size=3),
+        hovertemplate='Actual: %{y:.2f}<extra></extra>',
+    ))
+    if forecast is not None:
+        if 'Lower' in forecast:
+            add_interval_band(fig, forecast['Date'], forecast['Lower'], forecast['Upper'])
+        fig.add_trace(go.Scatter(
+            x=forecast['Date'], y=forecast['Forecast'], mode='lines', name='Forecast',
+            marker=dict(color='#FF0000', size=3),
+            hovertemplate='Forecast: %{y:.2f}<extra></extra>',
+        ))
+    fig.update_layout(
+        xaxis_title='Time',
+        yaxis_title='Close Price ($)',
+        margin=dict(t=20, b=0, l=0, r=0),
+        font=common_font_style,
+        hovermode='x',
+        showlegend=True,
+        # Hide nights and weekends, where there are no bars
+        xaxis=dict(rangebreaks=intraday_rangebreaks(bars['Date'])),
+        legend=dict(orientation='h', yanchor='bottom', y=1, xanchor='center', x=0.5, font=common_font_style)
+    )
+    return fig
+
+def intraday_rangebreaks(dates):
+    """
+    Build Plotly range breaks hiding the hours and days without bars.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if len(dates) == 0:
+        return []
+    breaks = []
+    if not (dates.dayofweek >= 5).any():
+        breaks.append(dict(bounds=['sat', 'mon']))
+    hours = dates.hour + dates.minute / 60
+    if hours.min() > 0:  # Series trading only part of the day
+        bar_hours = pd.Series(dates).diff().min() / pd.Timedelta(hours=1)
+        breaks.append(dict(bounds=[float(hours.max() + bar_hours), float(hours.min())], pattern='hour'))
+    return breaks
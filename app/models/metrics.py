@@ -14,10 +14,8 @@ def calculate_metrics(actual, predicted):
     Returns:
         pd.DataFrame: DataFrame containing MAE, MAPE, and RMSE metrics.
     """
-    mae = mean_absolute_error(actual, predicted)
-    rmse = np.sqrt(mean_squared_error(actual, predicted))
-    mape = mean_absolute_percentage_error(actual, predicted) * 100
-    if mape > 100: mape = 100   # Cap MAPE at 100 if it exceeds 100
+    metrics = compute_metrics(actual, predicted)
+    mae, rmse, mape = metrics['mae'], metrics['rmse'], metrics['mape']
     
     metrics_df = pd.DataFrame({
         'Metrics': ['MAPE (Mean Absolute Percentage Error)', 'MAE (Mean Absolute Error)', 'RMSE (Root Mean Squared Error)'],
@@ -26,3 +24,19 @@ def calculate_metrics(actual, predicted):
 
     return metrics_df
 
+def compute_metrics(actual, predicted):
+    """
+    Compute evaluation metrics as numbers.
+
+    Args:
+        actual: The actual values from the test data.
+        predicted: The forecasted values by cross validation process.
+
+    Returns:
+        dict: MAPE (in %, capped at 100), MAE and RMSE.
+    """
+    mae = mean_absolute_error(actual, predicted)
+    rmse = np.sqrt(mean_squared_error(actual, predicted))
+    mape = mean_absolute_percentage_error(actual, predicted) * 100
+    if mape > 100: mape = 100   # Cap MAPE at 100 if it exceeds 100
+    return {'mape': float(mape), 'mae': float(mae), 'rmse': float(rmse)}
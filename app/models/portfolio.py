@@ -0,0 +1,201 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from app.data.calendar import future_sessions
+from app.data.portfolio import price_matrix
+from app.data.preprocess import preprocess
+from app.data.shared import SharedFrame, as_frame
+from .prophet import train_prophet_model, forecast_prophet_model
+from .arima import train_arima_model, forecast_arima_model
+from .intervals import INTERVAL_WIDTH, normal_bounds, add_interval_band
+from .tuning import TUNING_WORKERS, load_model_params
+
+# Value of the portfolio today, used to turn weights into holdings
+PORTFOLIO_VALUE = 10_000
+
+def periods_per_year(dates):
+    """
+    Estimate the number of observations per year of a date series (about 252 for stocks, 365 for crypto).
+
+    Args:
+        dates (pd.Series): Sorted dates.
+
+    Returns:
+        int: Observations per year.
+    """
+    span_years = (dates.iloc[-1] - dates.iloc[0]).days / 365.25
+    return int(round(len(dates) / span_years)) if span_years > 0 else 252
+
+def portfolio_statistics(prices, weights, annualization=252):
+    """
+    Compute asset and portfolio return statistics from aligned prices, in one vectorized pass.
+
+    Args:
+        prices (np.ndarray): Close prices with shape (dates, assets).
+        weights (np.ndarray): Weight of each asset (summing to 1).
+        annualization (int): Number of periods per year.
+
+    Returns:
+        dict: Annualized mean log returns ('mean'), covariance ('cov'), volatilities ('volatility'),
+            correlation ('corr'), portfolio return and volatility ('portfolio_return', 'portfolio_volatility')
+            and the share of the portfolio variance contributed by each asset ('risk_contribution').
+    """
+    weights = np.asarray(weights, dtype=float)
+    returns = np.diff(np.log(prices), axis=0)
+
+    mean = returns.mean(axis=0) * annualization
+    cov = np.atleast_2d(np.cov(returns, rowvar=False)) * annualization
+    volatility = np.sqrt(np.diag(cov))
+    corr = cov / np.outer(volatility, volatility)
+
+    marginal = cov @ weights
+    portfolio_variance = float(weights @ marginal)
+    return {
+        'mean': mean,
+        'cov': cov,
+        'volatility': volatility,
+        'corr': corr,
+        'portfolio_return': float(weights @ mean),
+        'portfolio_volatility': float(np.sqrt(portfolio_variance)),
+        'risk_contribution': weights * marginal / portfolio_variance,
+    }
+
+def forecast_asset(data, ticker, model_selection, period, params=None, future_dates=None):
+    """
+    Fit one asset's model and return its point forecast. Runs in a worker process.
+
+    Args:
+        data (pd.DataFrame or SharedFrameHandle): Aligned prices, 'Date' column plus one column per ticker.
+        ticker (str): Ticker of the asset.
+        model_selection (str): 'Prophet' or 'ARIMA'.
+        period (int): Number of days to forecast.
+        params (dict): Saved parameters of the model for this asset.
+        future_dates (pd.DatetimeIndex): Sessions to forecast, shared by every asset of a portfolio.
+
+    Returns:
+        np.ndarray: Forecasted close prices, one per session after the last date.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    data = preprocess(as_frame(data)[['Date', ticker]].rename(columns={ticker: 'Close'}))
+    if model_selection == "Prophet":
+        m_prophet = train_prophet_model(data, params)
+        return forecast_prophet_model(m_prophet, period, interval_method="none", future_dates=future_dates)['yhat'].to_numpy()
+    m_arima = train_arima_model(data, params)
+    return forecast_arima_model(m_arima, data, period, interval_method="none", future_dates=future_dates)['Forecast'].to_numpy()
+
+def forecast_portfolio(data, weights, model_selection, period, width=INTERVAL_WIDTH, max_workers=TUNING_WORKERS):
+    """
+    Forecast the value of a portfolio by fitting one model per asset in parallel.
+
+    Holdings are the weights applied to `PORTFOLIO_VALUE` at the last price and kept constant,
+    so the historical value shows what today's holdings were worth. The prediction interval
+    comes from the portfolio volatility (asset covariance and weights), widening with the
+    square root of the horizon.
+
+    Args:
+        data (pd.DataFrame): Aligned prices, 'Date' column plus one column per ticker.
+        weights (dict): Weight of each ticker.
+        model_selection (str): 'Prophet' or 'ARIMA'.
+        period (int): Number of days to forecast.
+        width (float): Coverage of the prediction interval.
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        history (pd.DataFrame): 'Date' and portfolio 'Value'.
+        forecast (pd.DataFrame): 'Date', the forecast of each ticker, and the portfolio 'Forecast', 'Lower' and 'Upper'.
+    """
+    tickers = list(weights)
+    w = np.array([weights[ticker] for ticker in tickers])
+    prices = price_matrix(data, tickers)
+    holdings = w * PORTFOLIO_VALUE / prices[-1]
+    future_dates = future_sessions(data['Date'], period)  # Same sessions for every asset
+
+    # One model per asset, fitted on its own process from the prices published once in shared memory
+    with SharedFrame(data[['Date'] + tickers]) as shared, ProcessPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+        futures = [
+            executor.submit(
+                forecast_asset, shared.handle, ticker, model_selection, period, load_model_params(ticker, model_selection), future_dates
+            )
+            for ticker in tickers
+        ]
+        forecast_prices = np.column_stack([future.result() for future in futures])
+
+    forecast_value = forecast_prices @ holdings
+
+    # Portfolio volatility over each horizon, one observation per forecast session
+    annualization = periods_per_year(data['Date'])
+    stats = portfolio_statistics(prices, w, annualization)
+    steps = np.arange(1, len(future_dates) + 1)
+    sigma = stats['portfolio_volatility'] / np.sqrt(annualization) * np.sqrt(steps)
+    lower, upper = normal_bounds(np.log(forecast_value), sigma, width)
+
+    forecast = pd.DataFrame(forecast_prices, columns=tickers)
+    forecast.insert(0, 'Date', future_dates)
+    forecast['Forecast'] = forecast_value
+    forecast['Lower'] = np.exp(lower)
+    forecast['Upper'] = np.exp(upper)
+
+    history = pd.DataFrame({'Date': data['Date'], 'Value': prices @ holdings})
+    return history, forecast
+
+def plot_portfolio_forecast(history, forecast):
+    """
+    Plot the historical and forecasted portfolio value with its prediction interval.
+
+    Args:
+        history (pd.DataFrame): 'Date' and 'Value' returned by `forecast_portfolio`.
+        forecast (pd.DataFrame): Forecast returned by `forecast_portfolio`.
+
+    Returns:
+        fig (go.Figure): Plotly figure object.
+    """
+    try:
+        common_font_style = dict(size=14, color='#ffffff')
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatter(
+            x=history['Date'], y=history['Value'], mode='lines', name='Actual',
+            marker=dict(color='#87CEEB', size=3),
+            hovertemplate='Actual: %{y:.2f}<extra></extra>',
+        ))
+        add_interval_band(fig, forecast['Date'], forecast['Lower'], forecast['Upper'])
+        fig.add_trace(go.Scatter(
+            x=forecast['Date'], y=forecast['Forecast'], mode='lines', name='Forecast',
+            marker=dict(color='#FF0000', size=3),
+            hovertemplate='Forecast: %{y:.2f}<extra></extra>',
+        ))
+
+        fig.update_layout(
+            xaxis_title='Date',
+            yaxis_title='Portfolio Value ($)',
+            margin=dict(t=20, b=0, l=0, r=0),
+            font=common_font_style,
+            hovermode='x',
+            legend=dict(orientation='h', yanchor='bottom', y=1, xanchor='center', x=0.5, font=common_font_style)
+        )
+        return fig
+    except Exception as e:
+        st.error(f"Error plotting portfolio forecast: {e}")
+        return None
+
+def plot_correlation(corr, tickers):
+    """
+    Plot the correlation matrix of asset returns as a heatmap.
+
+    Args:
+        corr (np.ndarray): Correlation matrix.
+        tickers (list): Ticker symbols, in matrix order.
+
+    Returns:
+        fig (go.Figure): Plotly figure object.
+    """
+    fig = go.Figure(go.Heatmap(
+        z=corr, x=tickers, y=tickers, zmin=-1, zmax=1, colorscale='RdBu_r',
+        text=np.round(corr, 2), texttemplate='%{text}',
+        hovertemplate='%{x} / %{y}: %{z:.2f}<extra></extra>',
+    ))
+    fig.update_layout(margin=dict(t=20, b=0, l=0, r=0), font=dict(size=14, color='#ffffff'), yaxis=dict(autorange='reversed'))
+    return fig
@@ -1,31 +1,83 @@
 from prophet import Prophet
-from prophet.diagnostics import cross_validation
+from prophet.diagnostics import generate_cutoffs, single_cutoff_forecast
+import copy
 import warnings
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
+from app.data.calendar import future_sessions
+from .intervals import INTERVAL_METHOD, INTERVAL_SAMPLES, INTERVAL_WIDTH, normal_bounds, add_interval_band
 
-def fit_prophet_model(data, period):
+def train_prophet_model(data, params=None):
+    """
+    Fit a Prophet model to the provided data.
+
+    Uncertainty sampling is disabled by default so that cross-validation only computes point
+    forecasts; intervals are configured per forecast in `forecast_prophet_model`.
+
+    Args:
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+        params (dict): Optional keyword arguments passed to `Prophet`.
+
+    Returns:
+        m_prophet (Prophet): Fitted Prophet model.
+    """
+    data = data.reset_index()
+    df_train = data[['Date', 'Close']].rename(columns={"Date": "ds", "Close": "y"})
+    m_prophet = Prophet(**{'uncertainty_samples': 0, **(params or {})})
+    m_prophet.fit(df_train)
+    return m_prophet
+
+def forecast_prophet_model(m_prophet, period, interval_method=INTERVAL_METHOD, samples=INTERVAL_SAMPLES, width=INTERVAL_WIDTH, future_dates=None):
+    """
+    Forecast the given period after the last date seen by a fitted Prophet model.
+
+    Args:
+        m_prophet (Prophet): Fitted Prophet model.
+        period (int): Horizon in days; only the trading sessions of the series within it are forecast.
+        interval_method (str): 'analytic' (Gaussian band from the fitted observation noise, no sampling),
+            'simulation' (Prophet's vectorized sampling with `samples` draws) or 'none'.
+        samples (int): Number of uncertainty samples for the 'simulation' method.
+        width (float): Coverage of the prediction intervals.
+        future_dates (pd.DatetimeIndex): Dates to forecast instead of the next `period` days (e.g. intraday bar times).
+
+    Returns:
+        forecast (pd.DataFrame): Forecasted values, with 'yhat_lower' and 'yhat_upper' unless `interval_method` is 'none'.
+    """
+    # Work on a shallow copy so that the shared fitted model is never mutated
+    m_prophet = copy.copy(m_prophet)
+    m_prophet.uncertainty_samples = samples if interval_method == "simulation" else 0
+    m_prophet.interval_width = width
+
+    if future_dates is None:
+        future_dates = future_sessions(m_prophet.history['ds'], period)
+    future = pd.DataFrame({'ds': future_dates})
+    forecast = m_prophet.predict(future)
+
+    if interval_method == "analytic":
+        # sigma_obs is the fitted noise standard deviation on the scaled target
+        sigma = float(np.mean(m_prophet.params['sigma_obs'])) * m_prophet.y_scale
+        forecast['yhat_lower'], forecast['yhat_upper'] = normal_bounds(forecast['yhat'].values, sigma, width)
+
+    return forecast
+
+def fit_prophet_model(data, period, params=None):
     """
     Fit a Prophet model to the provided data and forecast for the given period.
 
     Args:
         data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
         period (int): Number of periods to forecast into the future.
+        params (dict): Optional keyword arguments passed to `Prophet`.
 
     Returns:
         m (Prophet): Fitted Prophet model.
         forecast (pd.DataFrame): Forecasted values.
     """
-    data = data.reset_index()
-    
     try:
-        df_train = data[['Date', 'Close']].rename(columns={"Date": "ds", "Close": "y"})
-        m_prophet = Prophet()
-        m_prophet.fit(df_train)
-        last_date = df_train['ds'].max()
-        future = m_prophet.make_future_dataframe(periods=period, freq='D')
-        future = future[future['ds'] > last_date]
-        forecast = m_prophet.predict(future)
+        m_prophet = train_prophet_model(data, params)
+        forecast = forecast_prophet_model(m_prophet, period)
         return m_prophet, forecast
     except Exception as e:
         print(f"Error fitting model: {e}")
@@ -46,14 +98,44 @@ def cross_validate_prophet(m_prophet, initial='730 days', period='180 days', hor
         df_cv (pd.DataFrame): Cross-validation results.
     """
     try:
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=FutureWarning)
-            df_cv = cross_validation(m_prophet, initial=initial, period=period, horizon=horizon)
-        return df_cv
+        return pd.concat([df_fold for _, _, df_fold in cross_validate_prophet_folds(m_prophet, initial, period, horizon)], ignore_index=True)
     except Exception as e:
         print(f"Error during cross-validation: {e}")
         return None
 
+def cross_validate_prophet_folds(m_prophet, initial='730 days', period='180 days', horizon='365 days'):
+    """
+    Cross-validate a fitted Prophet model one cutoff at a time, so that callers can show
+    results as each fold completes or stop early.
+
+    Args:
+        m_prophet (Prophet): Fitted Prophet model.
+        initial (str): Initial training period.
+        period (str): Period between successive validation sets.
+        horizon (str): Forecast horizon.
+
+    Yields:
+        tuple: Fold number (from 1), number of folds and the fold's cross-validation results
+            (same columns as Prophet's `cross_validation`). Nothing is yielded if the history is
+            shorter than the initial period plus the horizon.
+    """
+    df = m_prophet.history.copy().reset_index(drop=True)
+    horizon = pd.Timedelta(horizon)
+    try:
+        cutoffs = generate_cutoffs(df, horizon, pd.Timedelta(initial), pd.Timedelta(period))
+    except ValueError:
+        return  # Less data than the horizon
+
+    predict_columns = ['ds', 'yhat']
+    if m_prophet.uncertainty_samples:
+        predict_columns += ['yhat_lower', 'yhat_upper']
+
+    for fold, cutoff in enumerate(cutoffs, start=1):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=FutureWarning)
+            df_fold = single_cutoff_forecast(df, m_prophet, cutoff, horizon, predict_columns)
+        yield fold, len(cutoffs), df_fold
+
 def plot_prophet_forecast(m_prophet, forecast):
     """
     Plot the forecast using Plotly.
@@ -86,6 +168,10 @@ def plot_prophet_forecast(m_prophet, forecast):
             hovertemplate='Actual: %{y:.2f}<extra></extra>',
         ))
 
+        # Prediction interval band
+        if 'yhat_lower' in forecast and 'yhat_upper' in forecast:
+            add_interval_band(fig, forecast['ds'], forecast['yhat_lower'], forecast['yhat_upper'])
+
         # Forecast line
         fig.add_trace(go.Scatter(
             x=forecast['ds'], 
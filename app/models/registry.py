@@ -0,0 +1,200 @@
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+import pandas as pd
+import streamlit as st
+from app.data.loader import data_fingerprint
+from app.data.singleflight import get_single_flight
+from app.data.preprocess import prepare_data
+from .prophet import train_prophet_model
+from .arima import train_arima_model
+
+# Memory cap of the registry, overridable through an environment variable
+REGISTRY_MAX_BYTES = int(float(os.getenv("MODEL_REGISTRY_MAX_MB", "512")) * 1024 ** 2)
+
+# Training function of each model, called on a registry miss
+TRAINERS = {
+    "Prophet": lambda data, params: train_prophet_model(data, params),
+    "ARIMA": lambda data, params: train_arima_model(data, params),
+}
+
+class ModelRegistry:
+    """
+    Process-wide LRU store of fitted models shared by every session.
+
+    Each entry is a dictionary holding its key ('key'), the fitted model ('model'), its estimated size ('size')
+    and any result derived from it that does not depend on the horizon (e.g. 'cv', None until computed).
+    The least recently used entries are evicted once the total size exceeds `max_bytes`.
+
+    Args:
+        max_bytes (int): Memory cap of the registry, in bytes.
+    """
+
+    def __init__(self, max_bytes=REGISTRY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)  # Mark as most recently used
+            return entry
+
+    def put(self, key, model):
+        entry = {"key": key, "model": model, "size": estimate_model_bytes(model), "cv": None}
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)["size"]
+            self.entries[key] = entry
+            self.total_bytes += entry["size"]
+
+            # Evict least recently used entries, always keeping the one just added
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted["size"]
+        return entry
+
+    def get_result(self, entry, name):
+        """
+        Return a result stored on an entry (e.g. 'cv'), or None if it was not computed yet.
+        """
+        with self.lock:
+            return entry.get(name)
+
+    def set_result(self, entry, name, value):
+        """
+        Store a result derived from an entry's model, for every session holding the entry.
+        """
+        with self.lock:
+            entry[name] = value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+def estimate_model_bytes(model):
+    """
+    Estimate the memory held by a fitted model.
+
+    Args:
+        model: Fitted Prophet or ARIMA model.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    # Prophet keeps a reference to its Stan backend, so count its data and parameters instead
+    if hasattr(model, "history") and hasattr(model, "params"):
+        size = int(model.history.memory_usage(deep=True).sum())
+        size += sum(getattr(value, "nbytes", 0) for value in model.params.values())
+        return size
+    try:
+        return len(pickle.dumps(model))
+    except Exception:
+        return sys.getsizeof(model)
+
+@st.cache_resource(show_spinner=False)
+def get_model_registry():
+    """
+    Return the process-wide model registry.
+
+    Returns:
+        ModelRegistry: Registry shared by every session.
+    """
+    return ModelRegistry()
+
+def model_key(ticker, data, model_selection, params=None):
+    """
+    Build the registry key of a model fitted on the given data.
+
+    Args:
+        ticker (str): Ticker symbol of the data.
+        data (pd.DataFrame): Data the model is fitted on.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+        params (dict): Parameters the model is created with.
+
+    Returns:
+        tuple: Hashable key identifying the fitted model.
+    """
+    params = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)  # Lists (from saved JSON) are not hashable
+        for name, value in (params or {}).items()
+    ))
+    return (ticker, data_fingerprint(data), model_selection, params)
+
+def get_fitted_model(ticker, data, model_selection, params=None):
+    """
+    Return the registry entry of a fitted model, fitting it only if no session has done so yet.
+    Sessions requesting the same model at the same time wait for a single fit.
+
+    Models are fitted on the shared preprocessed series (see `prepare_data`), while the key
+    identifies the raw data.
+
+    Args:
+        ticker (str): Ticker symbol of the data.
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+        params (dict): Parameters the model is created with.
+
+    Returns:
+        dict: Registry entry holding the fitted model, or None if fitting failed.
+    """
+    registry = get_model_registry()
+    key = model_key(ticker, data, model_selection, params)
+
+    entry = registry.get(key)
+    if entry is not None:
+        return entry
+
+    def fit():
+        # Another caller may have finished the same fit just before this one started
+        entry = registry.get(key)
+        if entry is None:
+            entry = registry.put(key, TRAINERS[model_selection](prepare_data(data), params))
+        return entry
+
+    try:
+        return get_single_flight().do(("fit",) + key, fit)
+    except Exception as e:
+        print(f"Error fitting model: {e}")
+        return None
+
+def get_model_cv(entry, cross_validate, *args):
+    """
+    Return the cross-validation results of a registry entry, computing them once across sessions.
+
+    A failed cross-validation is stored as an empty result, so that it is not run again on every request.
+
+    Args:
+        entry (dict): Registry entry returned by `get_fitted_model`.
+        cross_validate: Cross-validation function of the model.
+        *args: Arguments passed to `cross_validate`.
+
+    Returns:
+        pd.DataFrame: Cross-validation results, empty if the cross-validation failed or no fold fits in the history.
+    """
+    registry = get_model_registry()
+
+    def compute():
+        # Another caller may have finished the same cross-validation just before this one started
+        df_cv = registry.get_result(entry, 'cv')
+        if df_cv is not None:
+            return df_cv
+        try:
+            df_cv = cross_validate(*args)
+        except Exception as e:
+            print(f"Error during cross-validation: {e}")
+            df_cv = None
+        df_cv = pd.DataFrame() if df_cv is None else df_cv
+        registry.set_result(entry, 'cv', df_cv)
+        return df_cv
+
+    df_cv = registry.get_result(entry, 'cv')
+    if df_cv is None:
+        df_cv = get_single_flight().do(("cv",) + entry['key'], compute)
+    return df_cv
@@ -0,0 +1,187 @@
+import copy
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# Scenario engine defaults
+SCENARIO_METHODS = ["bootstrap", "gbm", "residual"]
+FAN_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+THRESHOLD_RATIOS = (0.5, 0.8, 0.9, 1.0, 1.1, 1.2, 1.5, 2.0)
+VAR_LEVELS = (0.95, 0.99)
+
+def simulate_scenarios(prices, horizon, n_paths=10_000, method="bootstrap", periods_per_year=252,
+                       innovations=None, base_path=None, seed=None, chunk_size=2_000, fan_points=260,
+                       quantiles=FAN_QUANTILES, threshold_ratios=THRESHOLD_RATIOS, var_levels=VAR_LEVELS):
+    """
+    Simulate future price paths and summarize their distribution.
+
+    Paths are generated in chunks of `chunk_size` as cumulative sums of log-return increments,
+    fully vectorized in NumPy (float32). Only the log prices at `fan_points` evenly spaced steps
+    (plus every yearly checkpoint) are kept, so memory stays bounded by
+    `n_paths * fan_points` instead of `n_paths * horizon`.
+
+    Methods:
+        - 'bootstrap': resample historical daily log returns.
+        - 'gbm': geometric Brownian motion with the historical mean and volatility of log returns.
+        - 'residual': resample the model's one-step innovations around its point forecast `base_path`.
+
+    Args:
+        prices (np.ndarray): Historical close prices.
+        horizon (int): Number of future periods to simulate.
+        n_paths (int): Number of simulated paths.
+        method (str): One of `SCENARIO_METHODS`.
+        periods_per_year (int): Number of periods in a year (252 for trading days, 365 for crypto).
+        innovations (np.ndarray): Model innovations in log space (required by 'residual').
+        base_path (np.ndarray): Point forecast of length `horizon` (required by 'residual').
+        seed (int): Seed of the random generator.
+        chunk_size (int): Number of paths simulated at once.
+        fan_points (int): Number of steps kept for the quantile fan.
+        quantiles (tuple): Quantiles of the fan.
+        threshold_ratios (tuple): Price thresholds, as ratios of the last price.
+        var_levels (tuple): Confidence levels of the Value at Risk.
+
+    Returns:
+        dict: 'fan' (step and one column per quantile), 'thresholds' (probability of ending above
+            each threshold at each yearly checkpoint) and 'var' (VaR and CVaR of the return at each
+            yearly checkpoint) DataFrames.
+    """
+    prices = np.asarray(prices, dtype=float)
+    last_log_price = np.log(prices[-1])
+    returns = np.diff(np.log(prices)).astype(np.float32)
+    rng = np.random.default_rng(seed)
+
+    if method == "residual":
+        if innovations is None or base_path is None:
+            raise ValueError("The 'residual' method needs model innovations and a base path.")
+        increments_source = np.asarray(innovations, dtype=np.float32)
+        increments_source = increments_source - increments_source.mean()  # Drift comes from the forecast
+        origin = np.log(np.asarray(base_path, dtype=float)).astype(np.float32)
+    else:
+        origin = np.float32(last_log_price)
+    mu, sigma = np.float32(returns.mean()), np.float32(returns.std())
+
+    # Steps kept for the fan: evenly spaced, plus the yearly checkpoints and the last step
+    checkpoints = [min(year * periods_per_year, horizon) - 1 for year in range(1, int(np.ceil(horizon / periods_per_year)) + 1)]
+    steps = np.unique(np.concatenate([np.linspace(0, horizon - 1, min(fan_points, horizon)).astype(int), checkpoints]))
+    origin_at_steps = origin[steps] if np.ndim(origin) else origin
+
+    kept = np.empty((n_paths, len(steps)), dtype=np.float32)
+    for start in range(0, n_paths, chunk_size):
+        n = min(chunk_size, n_paths - start)
+        if method == "gbm":
+            increments = rng.standard_normal((n, horizon), dtype=np.float32)
+            increments *= sigma
+            increments += mu
+        elif method == "bootstrap":
+            increments = returns[rng.integers(0, len(returns), (n, horizon))]
+        else:
+            increments = increments_source[rng.integers(0, len(increments_source), (n, horizon))]
+        np.cumsum(increments, axis=1, out=increments)
+        kept[start:start + n] = increments[:, steps] + origin_at_steps
+
+    last_price = prices[-1]
+    fan = pd.DataFrame(np.exp(np.quantile(kept, quantiles, axis=0)).T, columns=[f"q{int(q * 100):02d}" for q in quantiles])
+    fan.insert(0, 'step', steps + 1)
+
+    # Probabilities and risk at each yearly checkpoint
+    threshold_rows, var_rows = [], []
+    for year, checkpoint in enumerate(checkpoints, start=1):
+        column = np.searchsorted(steps, checkpoint)
+        values = np.exp(kept[:, column].astype(float))
+        period_returns = values / last_price - 1
+        label = f"{year}Y" if (checkpoint + 1) % periods_per_year == 0 else f"{(checkpoint + 1) / periods_per_year:.1f}Y"
+
+        threshold_rows.append({'Horizon': label, **{
+            f"> ${last_price * ratio:,.2f}": float(np.mean(values > last_price * ratio)) for ratio in threshold_ratios
+        }})
+        for level in var_levels:
+            cutoff = np.quantile(period_returns, 1 - level)
+            var_rows.append({
+                'Horizon': label,
+                'Confidence': f"{level:.0%}",
+                'VaR': float(-cutoff),
+                'CVaR': float(-period_returns[period_returns <= cutoff].mean()),
+            })
+
+    return {
+        'fan': fan,
+        'thresholds': pd.DataFrame(threshold_rows).set_index('Horizon'),
+        'var': pd.DataFrame(var_rows).set_index(['Horizon', 'Confidence']),
+    }
+
+def model_innovations(model, prices=None):
+    """
+    Extract one-step innovations of a fitted model in log space, for the 'residual' method.
+
+    For ARIMA, these are the model residuals relative to the fitted values. For Prophet, whose
+    in-sample residuals are autocorrelated, they are the first differences of the log residuals.
+
+    Args:
+        model: Fitted Prophet or ARIMA model.
+        prices (np.ndarray): Close prices the ARIMA model was fitted on.
+
+    Returns:
+        np.ndarray: Innovations in log space.
+    """
+    if hasattr(model, "history"):  # Prophet
+        m_prophet = copy.copy(model)
+        m_prophet.uncertainty_samples = 0
+        fitted = m_prophet.predict(model.history[['ds']])['yhat'].values
+        log_residuals = np.log(model.history['y'].values / np.maximum(fitted, 1e-9))
+        return np.diff(log_residuals)
+
+    residuals = np.asarray(model.resid())
+    prices = np.asarray(prices, dtype=float)
+    fitted = prices - residuals
+    # Skip the first observations, whose residuals absorb the differencing
+    skip = model.order[1] + 1
+    return np.log(prices[skip:] / np.maximum(fitted[skip:], 1e-9))
+
+def plot_scenario_fan(data, fan, dates):
+    """
+    Plot the quantile fan of simulated prices after the historical prices.
+
+    Args:
+        data (pd.DataFrame): Historical data with 'Date' and 'Close'.
+        fan (pd.DataFrame): Quantile fan returned by `simulate_scenarios`.
+        dates (pd.DatetimeIndex): Date of each fan step.
+
+    Returns:
+        fig (go.Figure): Plotly figure object.
+    """
+    try:
+        common_font_style = dict(size=14, color='#ffffff')
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatter(
+            x=data['Date'], y=data['Close'], mode='lines', name='Actual',
+            marker=dict(color='#87CEEB', size=3),
+            hovertemplate='Actual: %{y:.2f}<extra></extra>',
+        ))
+
+        # Outer (5-95%) and inner (25-75%) bands, then the median
+        for lower, upper, opacity, name in [('q05', 'q95', 0.15, '5–95%'), ('q25', 'q75', 0.3, '25–75%')]:
+            fig.add_trace(go.Scatter(x=dates, y=fan[upper], mode='lines', line=dict(width=0), showlegend=False,
+                                     hovertemplate=f'{upper}: %{{y:.2f}}<extra></extra>'))
+            fig.add_trace(go.Scatter(x=dates, y=fan[lower], mode='lines', line=dict(width=0), fill='tonexty',
+                                     fillcolor=f'rgba(255, 0, 0, {opacity})', name=name,
+                                     hovertemplate=f'{lower}: %{{y:.2f}}<extra></extra>'))
+        fig.add_trace(go.Scatter(
+            x=dates, y=fan['q50'], mode='lines', name='Median',
+            marker=dict(color='#FF0000', size=3),
+            hovertemplate='Median: %{y:.2f}<extra></extra>',
+        ))
+
+        fig.update_layout(
+            xaxis_title='Date',
+            yaxis_title='Close Price ($)',
+            margin=dict(t=20, b=0, l=0, r=0),
+            font=common_font_style,
+            hovermode='x',
+            legend=dict(orientation='h', yanchor='bottom', y=1, xanchor='center', x=0.5, font=common_font_style)
+        )
+        return fig
+    except Exception as e:
+        st.error(f"Error plotting scenarios: {e}")
+        return None
@@ -0,0 +1,317 @@
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from pmdarima import ARIMA
+from pmdarima.arima import ndiffs, nsdiffs
+from app.data.preprocess import prepare_data
+from app.data.shared import SharedFrame, SharedFrameHandle, attach_frame, as_frame
+
+# Tuning settings, overridable through environment variables
+TUNING_DIR = Path(os.getenv("TUNING_DIR", ".cache/tuning"))           # Where the best parameters per ticker are saved
+TUNING_WORKERS = int(os.getenv("TUNING_WORKERS", "0")) or os.cpu_count()  # Number of worker processes
+ARIMA_SEARCH_BUDGET = float(os.getenv("ARIMA_SEARCH_BUDGET", "60"))     # Wall-clock budget (seconds) of the ARIMA search
+
+# Prophet hyperparameter search space
+PROPHET_PARAM_GRID = {
+    'changepoint_prior_scale': [0.001, 0.01, 0.1, 0.5],
+    'seasonality_prior_scale': [0.01, 0.1, 1.0, 10.0],
+    'seasonality_mode': ['additive', 'multiplicative'],
+}
+
+def prophet_cutoffs(ds, initial='730 days', period='180 days', horizon='365 days'):
+    """
+    Generate cross-validation cutoffs the same way as Prophet, most recent first.
+
+    Args:
+        ds (pd.Series): Dates of the history.
+        initial (str): Minimum training period before the first cutoff.
+        period (str): Spacing between cutoffs.
+        horizon (str): Forecast horizon after each cutoff.
+
+    Returns:
+        list: Cutoff timestamps, from the most recent to the oldest.
+    """
+    initial, period, horizon = pd.Timedelta(initial), pd.Timedelta(period), pd.Timedelta(horizon)
+    cutoff = ds.max() - horizon
+    cutoffs = []
+    while cutoff >= ds.min() + initial:
+        cutoffs.append(cutoff)
+        cutoff -= period
+    return cutoffs
+
+def evaluate_prophet_candidate(df, params, cutoffs, horizon):
+    """
+    Fit a Prophet candidate at each cutoff and accumulate its absolute percentage errors.
+
+    Runs in a worker process, so it only depends on its arguments.
+
+    Args:
+        df (pd.DataFrame or SharedFrameHandle): History with columns 'ds' and 'y'.
+        params (dict): Prophet hyperparameters of the candidate.
+        cutoffs (list): Cutoffs to evaluate.
+        horizon (pd.Timedelta): Forecast horizon after each cutoff.
+
+    Returns:
+        tuple: Sum of absolute percentage errors and number of predicted points.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    logging.getLogger('prophet').setLevel(logging.WARNING)
+    df = as_frame(df)
+
+    total, count = 0.0, 0
+    for cutoff in cutoffs:
+        train = df[df['ds'] <= cutoff]
+        test = df[(df['ds'] > cutoff) & (df['ds'] <= cutoff + horizon)]
+        m_prophet = Prophet(uncertainty_samples=0, **params)
+        m_prophet.fit(train)
+        yhat = m_prophet.predict(test[['ds']])['yhat'].values
+        total += float(np.sum(np.abs((test['y'].values - yhat) / test['y'].values)))
+        count += len(test)
+    return total, count
+
+def tune_prophet(data, ticker=None, grid=PROPHET_PARAM_GRID, rungs=(1, 2, None), eta=3,
+                 initial='730 days', period='180 days', horizon='365 days', max_workers=TUNING_WORKERS):
+    """
+    Search Prophet hyperparameters with successive halving, evaluating candidates in parallel.
+
+    Every candidate is first scored on the most recent cutoff only; the best 1/`eta` move on to
+    the next rung, which adds older cutoffs, until the last rung scores the survivors on all cutoffs.
+    Errors already computed on a cutoff are reused in later rungs.
+
+    Args:
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close'.
+        ticker (str): If given, the best parameters are saved for this ticker.
+        grid (dict): Search space, mapping each Prophet argument to its candidate values.
+        rungs (tuple): Number of cutoffs used at each rung (None for all of them).
+        eta (int): Fraction of candidates kept after each rung is 1/eta.
+        initial (str): Minimum training period before the first cutoff.
+        period (str): Spacing between cutoffs.
+        horizon (str): Forecast horizon after each cutoff.
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        best_params (dict): Best hyperparameters found.
+        results_df (pd.DataFrame): MAPE of every candidate on the cutoffs it was evaluated on.
+
+    Raises:
+        ValueError: If the history is shorter than `initial` plus `horizon`, leaving no cutoff to score on.
+    """
+    df = prepare_data(data)[['Date', 'Close']].rename(columns={"Date": "ds", "Close": "y"})
+    cutoffs = prophet_cutoffs(df['ds'], initial, period, horizon)
+    if not cutoffs:
+        raise ValueError(f"Not enough history to tune Prophet: at least {initial} of training data plus a {horizon} horizon are needed.")
+    horizon = pd.Timedelta(horizon)
+
+    candidates = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    # Accumulated (error sum, point count, evaluated cutoffs) of each candidate
+    scores = {i: (0.0, 0, 0) for i in range(len(candidates))}
+    survivors = list(scores)
+
+    # Workers read the history from shared memory, so each task only carries a handle
+    with SharedFrame(df) as shared, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rung, n_cutoffs in enumerate(rungs):
+            n_cutoffs = len(cutoffs) if n_cutoffs is None else min(n_cutoffs, len(cutoffs))
+
+            # Only evaluate the cutoffs not already scored in previous rungs
+            futures = {
+                i: executor.submit(evaluate_prophet_candidate, shared.handle, candidates[i], cutoffs[scores[i][2]:n_cutoffs], horizon)
+                for i in survivors
+            }
+            for i, future in futures.items():
+                total, count = future.result()
+                scores[i] = (scores[i][0] + total, scores[i][1] + count, n_cutoffs)
+
+            # Keep the best candidates for the next rung
+            survivors.sort(key=lambda i: scores[i][0] / max(scores[i][1], 1))
+            if rung < len(rungs) - 1:
+                survivors = survivors[:max(1, math.ceil(len(survivors) / eta))]
+
+    results_df = pd.DataFrame([
+        {**candidates[i], 'cutoffs': n, 'mape': 100 * total / max(count, 1)}
+        for i, (total, count, n) in scores.items()
+    ]).sort_values(['cutoffs', 'mape'], ascending=[False, True]).reset_index(drop=True)
+
+    best_params = candidates[survivors[0]]
+    if ticker:
+        save_model_params(ticker, "Prophet", best_params, mape=float(results_df['mape'].iloc[0]))
+    return best_params, results_df
+
+def evaluate_arima_candidate(y, order, seasonal_order):
+    """
+    Fit one ARIMA candidate and return it with its AIC.
+
+    Runs in a worker process, so it only depends on its arguments.
+
+    Args:
+        y (np.ndarray or SharedFrameHandle): Close prices, or the handle of a shared frame with a 'Close' column.
+        order (tuple): Non-seasonal (p, d, q) order.
+        seasonal_order (tuple): Seasonal (P, D, Q, m) order.
+
+    Returns:
+        tuple: AIC of the candidate (inf if the fit failed) and the fitted model (None if it failed).
+    """
+    try:
+        if isinstance(y, SharedFrameHandle):
+            y = attach_frame(y)['Close'].to_numpy()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            m_arima = ARIMA(order=order, seasonal_order=seasonal_order, suppress_warnings=True).fit(y)
+        return float(m_arima.aic()), m_arima
+    except Exception:
+        return float("inf"), None
+
+def search_arima_order(data, ticker=None, max_p=3, max_q=3, seasonal_period=5, max_seasonal_order=1,
+                       budget=ARIMA_SEARCH_BUDGET, max_workers=TUNING_WORKERS):
+    """
+    Search ARIMA orders, including seasonal ones, in parallel under a hard wall-clock budget.
+
+    The differencing orders are chosen with unit-root tests, then every (p, q) and seasonal
+    (P, Q) combination is fitted on a process pool, simplest candidates first. All candidates
+    share the same d and D, since AICs of differently differenced series are not comparable.
+    When the budget runs out, the pool is terminated, which drops the pending candidates and
+    stops the ones still fitting, and the best model found so far is returned.
+
+    Args:
+        data (pd.DataFrame): DataFrame with columns 'Date' and 'Close' (preprocessed like every fit).
+        ticker (str): If given, the best order is saved for this ticker.
+        max_p (int): Maximum non-seasonal AR order.
+        max_q (int): Maximum non-seasonal MA order.
+        seasonal_period (int): Seasonal period m (5 for a trading week); 0 disables seasonal candidates.
+        max_seasonal_order (int): Maximum seasonal AR and MA orders.
+        budget (float): Wall-clock budget of the search, in seconds.
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        m_arima (ARIMA): Best fitted model, or None if no candidate could be fitted in time.
+        report (dict): Best order and AIC, number of candidates evaluated, total candidates, elapsed time.
+    """
+    start = time.monotonic()
+    y = prepare_data(data)['Close'].to_numpy(dtype=float)
+
+    # Differencing orders from unit-root tests, as auto_arima does
+    d = ndiffs(y, test='kpss')
+    D = nsdiffs(y, m=seasonal_period, test='ocsb') if seasonal_period > 1 else 0
+
+    # Candidate orders, simplest first so that a short budget still covers the cheap ones;
+    # every seasonal order uses the same D so that their likelihoods are computed on the same series
+    seasonal_orders = [(0, 0, 0, 0)]
+    if seasonal_period > 1:
+        seasonal_orders = [
+            (P, D, Q, seasonal_period) if P or Q or D else (0, 0, 0, 0)
+            for P in range(max_seasonal_order + 1) for Q in range(max_seasonal_order + 1)
+        ]
+    candidates = sorted(
+        [((p, d, q), seasonal) for p in range(max_p + 1) for q in range(max_q + 1) for seasonal in seasonal_orders],
+        key=lambda candidate: sum(candidate[0]) + sum(candidate[1][:3]),
+    )
+
+    best_aic, best_model, best_candidate = float("inf"), None, None
+    evaluated = 0
+
+    # Workers read the prices from shared memory, so each task only carries a handle. A
+    # multiprocessing pool (rather than an executor) can stop its running tasks on terminate().
+    shared = SharedFrame(pd.DataFrame({'Close': y}))
+    results = queue.Queue()
+    pool = multiprocessing.Pool(processes=min(max_workers, len(candidates)))
+    try:
+        for candidate in candidates:
+            pool.apply_async(
+                evaluate_arima_candidate, (shared.handle, *candidate),
+                callback=lambda result, candidate=candidate: results.put((candidate, result)),
+                error_callback=lambda error, candidate=candidate: results.put((candidate, (float("inf"), None))),
+            )
+        while evaluated < len(candidates):
+            remaining = budget - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            try:
+                candidate, (aic, m_arima) = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            evaluated += 1
+            if aic < best_aic:
+                best_aic, best_model, best_candidate = aic, m_arima, candidate
+    finally:
+        # Once the budget is spent, stop the candidates still running instead of letting them finish
+        if evaluated < len(candidates):
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+        shared.close()
+
+    report = {
+        'order': best_candidate[0] if best_candidate else None,
+        'seasonal_order': best_candidate[1] if best_candidate else None,
+        'aic': best_aic,
+        'evaluated': evaluated,
+        'candidates': len(candidates),
+        'elapsed': time.monotonic() - start,
+        'timed_out': evaluated < len(candidates),
+    }
+
+    if ticker and best_candidate:
+        params = {'order': list(best_candidate[0]), 'seasonal_order': list(best_candidate[1])}
+        save_model_params(ticker, "ARIMA", params, **{key: report[key] for key in ['aic', 'evaluated', 'candidates', 'elapsed']})
+    return best_model, report
+
+def save_model_params(ticker, model_selection, params, **details):
+    """
+    Save the tuned parameters of a model for a ticker, so that later fits reuse them.
+
+    Args:
+        ticker (str): Ticker symbol.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+        params (dict): Parameters to save.
+        **details: Additional information stored alongside (e.g., the validation score).
+    """
+    path = TUNING_DIR / model_selection / f"{ticker}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"params": params, "saved_at": time.time(), **details}, f)
+
+def load_tuning_record(ticker, model_selection):
+    """
+    Load everything saved by the last tuning run of a model for a ticker.
+
+    Args:
+        ticker (str): Ticker symbol.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+
+    Returns:
+        dict: Saved record with the 'params' and the run details, or None if the model was never tuned for this ticker.
+    """
+    path = TUNING_DIR / model_selection / f"{ticker}.json"
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            record = json.load(f)
+        return record if "params" in record else None
+    except (OSError, ValueError):
+        return None
+
+def load_model_params(ticker, model_selection):
+    """
+    Load the tuned parameters of a model for a ticker.
+
+    Args:
+        ticker (str): Ticker symbol.
+        model_selection (str): Name of the model ('Prophet' or 'ARIMA').
+
+    Returns:
+        dict: Saved parameters, or None if the model was never tuned for this ticker.
+    """
+    record = load_tuning_record(ticker, model_selection)
+    return record["params"] if record else None
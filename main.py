@@ -25,6 +25,21 @@ def main():
     # Load custom CSS for styling the app
     load_css("app/static/styles.css")
 
+    # Screener page: filter and rank the fundamentals snapshot of every stored stock
+    if st.session_state.page == "Screener":
+        screener_page()
+        return
+
+    # Portfolio mode: forecast several weighted tickers together
+    if st.sidebar.toggle("📂 Portfolio mode", disabled=st.session_state.running, key="portfolio_mode"):
+        weights = get_user_portfolio()
+        if weights:
+            # Load the aligned historical prices of all tickers in one batched download
+            data = load_portfolio(tuple(weights))
+            if data is not None:
+                portfolio_section(data, weights)
+        return
+
     # Get user input for the ticker symbol
     user_ticker_input = get_user_ticker()
 
@@ -33,14 +48,20 @@ def main():
 
     # If the ticker is valid, proceed with data loading and action selection
     if valid_ticker is not None:
-        # Display the long name (company name) for the valid ticker
-        st.sidebar.write(get_ticker_name(valid_ticker))
+        # Start fetching the metadata (when needed) so that it arrives while the history loads
+        info_future = start_info_fetch(valid_ticker)
+
+        # Keep the place of the long name (company name), displayed once the metadata is in
+        name_area = st.sidebar.empty()
 
         # Load the historical financial data for the ticker
         data = load_data(valid_ticker)
 
+        # Display the long name (company name) for the valid ticker
+        name_area.write(get_ticker_name(valid_ticker, info_future))
+
         # Allow the user to choose between exploring data, asking AI, or forecasting
-        action_selector(data, valid_ticker)
+        action_selector(data, valid_ticker, info_future)
 
 # Execute the main function when the script is run
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+"""
+Walk-forward backtest of the forecasting models.
+
+Fits each model at every cutoff (every `--step` days) of each ticker's history on a process pool,
+and stores per-cutoff, per-horizon errors under BACKTEST_DIR (one Parquet file per model and
+ticker). Cutoffs already stored are skipped, so running it again (e.g. daily) only computes the
+new ones. The Forecast page shows the stored results as the model's historical accuracy.
+
+Usage (from the repository root):
+    python scripts/backtest.py --tickers AAPL,MSFT,BTC-USD --models Prophet,ARIMA
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run walk-forward backtests of the Finance Predictor models.")
+    parser.add_argument("--tickers", required=True, help="Comma-separated tickers to backtest.")
+    parser.add_argument("--models", default="Prophet,ARIMA", help="Comma-separated models to backtest.")
+    parser.add_argument("--horizons", default=None, help="Comma-separated forecast horizons in days (default: 30,90,180,365).")
+    parser.add_argument("--years", type=int, default=5, help="Years of history to load per ticker.")
+    parser.add_argument("--step", type=int, default=None, help="Days between cutoffs (default: BACKTEST_STEP).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: BACKTEST_WORKERS).")
+    parser.add_argument("--source", default=None, choices=["yahoo", "local", "synthetic"], help="Data source (default: DATA_SOURCE).")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    # Settings are read when the app modules are imported, so configure them first
+    if args.source:
+        os.environ["DATA_SOURCE"] = args.source
+    if args.step:
+        os.environ["BACKTEST_STEP"] = str(args.step)
+    os.chdir(ROOT)  # Stores default to paths relative to the repository root
+    sys.path.insert(0, str(ROOT))
+
+    from app.data.loader import fetch_history
+    from app.models.backtest import BACKTEST_HORIZONS, BACKTEST_WORKERS, run_backtest, load_backtest_results, backtest_summary
+
+    tickers = [ticker.strip().upper() for ticker in args.tickers.split(",") if ticker.strip()]
+    models = tuple(args.models.split(","))
+    horizons = tuple(int(h) for h in args.horizons.split(",")) if args.horizons else BACKTEST_HORIZONS
+
+    # Load every history concurrently; the data source rate-limits the requests
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        loaded = dict(zip(tickers, executor.map(lambda ticker: fetch_history(ticker, args.years), tickers)))
+    histories = {ticker: data for ticker, data in loaded.items() if data is not None and not data.empty}
+    for ticker in sorted(set(tickers) - set(histories)):
+        print(f"Skipping {ticker}: no data found.")
+
+    start = time.perf_counter()
+
+    def progress(ticker, model, cutoff, error):
+        status = f"failed ({error})" if error else "done"
+        print(f"[{time.perf_counter() - start:7.1f}s] {ticker:<10} {model:<8} {cutoff:%Y-%m-%d} {status}", flush=True)
+
+    report = run_backtest(histories, models, horizons, max_workers=args.workers or BACKTEST_WORKERS, progress=progress)
+
+    print(f"\nFinished in {time.perf_counter() - start:.1f}s")
+    for (ticker, model), counts in report.items():
+        print(f"\n=== {ticker} / {model}: {counts['computed']} computed, {counts['skipped']} already stored, {counts['failed']} failed")
+        summary = backtest_summary(load_backtest_results(ticker, model))
+        if not summary.empty:
+            print(summary.round(2).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Prompt-size benchmark of the Ask AI agent.
+
+Runs the same questions through the agent built on the raw daily frame (the previous behaviour)
+and through the agent built on the precomputed profile, both driven by a local fake language
+model, and reports the number of model calls and prompt tokens per question. The fake model
+behaves like a careful analyst: it answers when its prompt already contains the answer, and
+otherwise inspects the frame (unless the prompt describes its columns) and runs the code
+computing the answer, whose output is fed back by the real Python tool.
+
+Usage (from the repository root):
+    python scripts/benchmark_ask_ai.py --ticker AAPL
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Questions: text, phrase of the profile holding the answer (None if it does not), code computing it
+QUESTIONS = [
+    ("What is the highest closing price and when was it reached?", "Highest close",
+     "df.loc[df['Close'].idxmax(), ['Date', 'Close']]"),
+    ("What is the return over the last year?", "1 year:",
+     "df['Close'].iloc[-1] / df.loc[df['Date'] <= df['Date'].max() - pd.Timedelta(days=365), 'Close'].iloc[-1] - 1"),
+    ("What is the annualized volatility over the last 3 months?", "Annualized volatility",
+     "np.log(df['Close']).diff().tail(63).std() * np.sqrt(252)"),
+    ("Which month had the largest total volume?", "Highest monthly volume",
+     "df.set_index('Date')['Volume'].resample('ME').sum().idxmax()"),
+    ("What was the closing price on the first trading day of 2024?", None,
+     "df.loc[df['Date'] >= '2024-01-01', ['Date', 'Close']].iloc[0]"),
+]
+
+# Steps an analyst runs to discover an unknown frame before computing the answer
+INSPECTION_STEPS = ["df.head()", "df.dtypes"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the prompt size of the raw-frame and profile-based Ask AI agents.")
+    parser.add_argument("--ticker", default="AAPL", help="Ticker whose data the agents answer about.")
+    parser.add_argument("--source", default="synthetic", choices=["synthetic", "local", "yahoo"], help="Data source to use.")
+    return parser.parse_args()
+
+def approx_tokens(text):
+    """
+    Approximate the number of tokens of a prompt (about 4 characters per token for English and numbers).
+    """
+    return len(text) // 4
+
+def make_fake_analyst():
+    from langchain_core.language_models.llms import LLM
+
+    class FakeAnalyst(LLM):
+        """
+        Deterministic stand-in for the chat model, recording the size of every prompt it receives.
+        """
+        calls: List[int] = []
+
+        @property
+        def _llm_type(self):
+            return "fake-analyst"
+
+        def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+            self.calls.append(approx_tokens(prompt))
+            context, _, scratchpad = prompt.rpartition("Question: ")
+            question = scratchpad.splitlines()[0].strip()
+            _, marker, code = next(spec for spec in QUESTIONS if spec[0] == question)
+
+            if marker and marker in context:
+                line = next(line for line in context.splitlines() if marker in line)
+                return f"Thought: The profile answers this.\nFinal Answer: {line.strip()}"
+
+            # Inspect the frame first unless the prompt already lists its columns
+            steps = ([] if "Columns:" in context else INSPECTION_STEPS) + [code]
+            done = scratchpad.count("Observation:")
+            if done < len(steps):
+                return f"Thought: I need to look at the data.\nAction: python_repl_ast\nAction Input: {steps[done]}"
+            observation = re.findall(r"Observation: (.*?)(?:\nThought:|$)", scratchpad, re.S)[-1]
+            return f"Thought: I now know the final answer.\nFinal Answer: {observation.strip()}"
+
+    return FakeAnalyst()
+
+def run_agent(build, questions):
+    """
+    Ask every question to a fresh agent and collect the model calls and prompt tokens.
+
+    Returns:
+        list: One (question, calls, prompt tokens, largest prompt, seconds) row per question.
+    """
+    rows = []
+    for question, _, _ in questions:
+        llm = make_fake_analyst()
+        agent = build(llm)
+        start = time.perf_counter()
+        agent.invoke(question)
+        elapsed = time.perf_counter() - start
+        rows.append((question, len(llm.calls), sum(llm.calls), max(llm.calls), elapsed))
+    return rows
+
+def main():
+    args = parse_args()
+
+    # Settings are read when the app modules are imported, so configure them first
+    os.environ["DATA_SOURCE"] = args.source
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+    from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
+    from app.data import fetch_history, get_profile
+    from app.components.ask_ai import create_ask_ai_agent
+
+    data = fetch_history(args.ticker)
+
+    start = time.perf_counter()
+    get_profile(data)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    get_profile(data)
+    warm = time.perf_counter() - start
+    print(f"Profile of {args.ticker} ({len(data):,} rows): built in {cold * 1000:.1f} ms, cached lookup in {warm * 1000:.1f} ms")
+
+    agents = {
+        "raw frame": lambda llm: create_pandas_dataframe_agent(llm, data, allow_dangerous_code=True),
+        "profile": lambda llm: create_ask_ai_agent(llm, data, args.ticker, verbose=False),
+    }
+    totals = {}
+    for name, build in agents.items():
+        rows = run_agent(build, QUESTIONS)
+        print(f"\n{name}")
+        print(f"{'question':<62} {'calls':>5} {'tokens':>8} {'largest':>8} {'seconds':>8}")
+        for question, calls, tokens, largest, elapsed in rows:
+            print(f"{question[:60]:<62} {calls:>5} {tokens:>8,} {largest:>8,} {elapsed:>8.2f}")
+        totals[name] = (sum(row[1] for row in rows), sum(row[2] for row in rows))
+        print(f"{'total':<62} {totals[name][0]:>5} {totals[name][1]:>8,}")
+
+    (raw_calls, raw_tokens), (calls, tokens) = totals["raw frame"], totals["profile"]
+    print(f"\nProfile agent: {calls} calls instead of {raw_calls}, {tokens:,} prompt tokens instead of {raw_tokens:,}")
+
+if __name__ == "__main__":
+    main()
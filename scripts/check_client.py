@@ -0,0 +1,164 @@
+"""
+Check of the rate-limited HTTP client against a local stand-in server.
+
+Starts a threaded HTTP server on localhost that fails on purpose (429 and 5xx responses a set
+number of times, slow responses), drives `RateLimitedSession` against it, and checks that:
+    - throttled and failing requests are retried until they succeed,
+    - retries stop after `max_retries` and the last response is returned,
+    - requests never start faster than the token bucket allows,
+    - no more than `max_concurrency` requests are in flight at once.
+
+Usage (from the repository root):
+    python scripts/check_client.py
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        /ok: 200 right away.
+        /fail/<status>/<times>/<key>: <status> for the first <times> requests of <key>, then 200.
+        /slow/<seconds>: 200 after <seconds>.
+    """
+    lock = threading.Lock()
+    attempts = Counter()
+    starts = []
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.starts.append(time.monotonic())
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            parts = self.path.strip("/").split("/")
+            status = 200
+            if parts[0] == "fail":
+                with cls.lock:
+                    cls.attempts[parts[3]] += 1
+                    if cls.attempts[parts[3]] <= int(parts[2]):
+                        status = int(parts[1])
+            elif parts[0] == "slow":
+                time.sleep(float(parts[1]))
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.attempts.clear()
+            cls.starts.clear()
+            cls.in_flight = cls.max_in_flight = 0
+
+    def log_message(self, *args):
+        pass
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check the rate-limited client against a local HTTP stand-in.")
+    parser.add_argument("--rate", type=float, default=20, help="Requests per second of the rate-limit check.")
+    parser.add_argument("--burst", type=int, default=5, help="Burst size of the rate-limit check.")
+    parser.add_argument("--requests", type=int, default=40, help="Requests sent by the rate-limit check.")
+    return parser.parse_args()
+
+def max_window_count(starts, window):
+    """
+    Return the largest number of request starts within any `window` seconds.
+    """
+    starts = sorted(starts)
+    best, first = 0, 0
+    for last, start in enumerate(starts):
+        while start - starts[first] > window:
+            first += 1
+        best = max(best, last - first + 1)
+    return best
+
+def main():
+    args = parse_args()
+
+    # Settings are read when the app modules are imported, so configure them first
+    os.environ.setdefault("YF_BACKOFF_BASE", "0.01")
+    os.environ.setdefault("YF_BACKOFF_CAP", "0.05")
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    # Outside `streamlit run`, every cached function warns that it falls back to an in-memory cache
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    from app.data.client import RateLimitedSession
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    failures = []
+
+    def check(name, passed, detail):
+        print(f"{'PASS' if passed else 'FAIL'}  {name}: {detail}")
+        if not passed:
+            failures.append(name)
+
+    try:
+        # Retries on throttling and transient server errors, until the request succeeds
+        session = RateLimitedSession(rate=1000, burst=1000, max_concurrency=4, max_retries=4)
+        for status in (429, 500, 502, 503, 504):
+            StandInHandler.reset()
+            response = session.get(f"{base}/fail/{status}/3/{status}")
+            attempts = StandInHandler.attempts[str(status)]
+            check(f"retry {status}", response.status_code == 200 and attempts == 4, f"status {response.status_code} after {attempts} attempts")
+
+        # Non-retryable statuses are returned at once
+        StandInHandler.reset()
+        response = session.get(f"{base}/fail/404/1/missing")
+        check("no retry 404", response.status_code == 404 and StandInHandler.attempts["missing"] == 1,
+              f"status {response.status_code} after {StandInHandler.attempts['missing']} attempt(s)")
+
+        # Retries stop after max_retries and the last response is returned
+        StandInHandler.reset()
+        session = RateLimitedSession(rate=1000, burst=1000, max_concurrency=4, max_retries=2)
+        response = session.get(f"{base}/fail/503/10/exhausted")
+        attempts = StandInHandler.attempts["exhausted"]
+        check("retries exhausted", response.status_code == 503 and attempts == 3, f"status {response.status_code} after {attempts} attempts")
+
+        # Rate limit: after the burst, requests start at `rate` per second at most
+        StandInHandler.reset()
+        session = RateLimitedSession(rate=args.rate, burst=args.burst, max_concurrency=8, max_retries=0)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: session.get(f"{base}/ok"), range(args.requests)))
+        elapsed = time.monotonic() - start
+        expected = (args.requests - args.burst) / args.rate
+        busiest = max_window_count(StandInHandler.starts, 1.0)
+        check("rate limit", elapsed >= 0.95 * expected and busiest <= args.burst + args.rate + 1,
+              f"{args.requests} requests in {elapsed:.2f}s (at least {expected:.2f}s expected), at most {busiest} started in one second")
+
+        # Concurrency: slow requests never exceed the number of slots
+        StandInHandler.reset()
+        session = RateLimitedSession(rate=1000, burst=1000, max_concurrency=2, max_retries=0)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: session.get(f"{base}/slow/0.1"), range(8)))
+        check("concurrency", StandInHandler.max_in_flight <= 2, f"at most {StandInHandler.max_in_flight} requests in flight (limit 2)")
+    finally:
+        server.shutdown()
+
+    if failures:
+        print(f"\n{len(failures)} check(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll checks passed.")
+
+if __name__ == "__main__":
+    main()
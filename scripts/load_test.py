@@ -0,0 +1,203 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Drives simulated user sessions through the real `main.py` flow (ticker entry, Explore, Forecast
+with each model) using Streamlit's app-testing API, against an offline data source, and reports
+p50/p95/p99 latency per action, CPU usage and peak RSS for each concurrency level.
+
+Usage (from the repository root):
+    python scripts/load_test.py --concurrency 1,2,4,8 --models Prophet,ARIMA
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the Finance Predictor App with simulated sessions.")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated concurrency levels to run.")
+    parser.add_argument("--sessions", type=int, default=None, help="Sessions per level (defaults to the concurrency level).")
+    parser.add_argument("--tickers", default="AAPL,MSFT,BTC-USD,EURUSD=X", help="Comma-separated tickers assigned round-robin to sessions.")
+    parser.add_argument("--models", default="Prophet,ARIMA", help="Comma-separated models to forecast with.")
+    parser.add_argument("--source", default="synthetic", choices=["synthetic", "local"], help="Offline data source to use.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean latency (seconds) injected into each data call.")
+    parser.add_argument("--timeout", type=float, default=600, help="Timeout (seconds) of each script run.")
+    parser.add_argument("--cold", action="store_true", help="Clear Streamlit caches before each concurrency level.")
+    parser.add_argument("--json", default=None, help="Optional path where the raw report is written as JSON.")
+    return parser.parse_args()
+
+def percentile(values, q):
+    """
+    Compute a percentile with linear interpolation (same as numpy's default).
+
+    Args:
+        values (list): Sample values.
+        q (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile, or NaN if there are no values.
+    """
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process in megabytes.
+    """
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def find_button(at, label):
+    """
+    Find a button rendered anywhere in the app by its label.
+    """
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"Button {label!r} not found")
+
+def run_session(ticker, models, timeout):
+    """
+    Drive one simulated session through the app and time each action.
+
+    Args:
+        ticker (str): Ticker entered by the simulated user.
+        models (list): Models to forecast with, in order.
+        timeout (float): Timeout (seconds) of each script run.
+
+    Returns:
+        list: (action, seconds, error) tuples, one per action.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    timings = []
+
+    def timed(action, step):
+        start = time.perf_counter()
+        try:
+            step()
+            error = at.exception[0].message if at.exception else None
+        except Exception as e:
+            error = repr(e)
+        timings.append((action, time.perf_counter() - start, error))
+        return error is None
+
+    at = AppTest.from_file(str(ROOT / "main.py"), default_timeout=timeout)
+
+    if not timed("initial_load", lambda: at.run()):
+        return timings
+    if not timed("ticker_entry", lambda: at.sidebar.text_input[0].input(ticker).run()):
+        return timings
+    timed("explore", lambda: find_button(at, "🔍 Explore").click().run())
+
+    for model in models:
+        if not timed(f"open_forecast_{model}", lambda: find_button(at, "🔮 Forecast").click().run()):
+            continue
+        timed(f"select_{model}", lambda: at.sidebar.radio[0].set_value(model).run())
+        timed(f"predict_{model}", lambda: at.sidebar.button(key="predict_button").click().run())
+
+    return timings
+
+def run_level(concurrency, sessions, tickers, models, timeout):
+    """
+    Run `sessions` simulated sessions with `concurrency` of them in flight at once.
+
+    Returns:
+        dict: Per-action latency percentiles and errors, plus CPU and memory usage.
+    """
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(run_session, tickers[i % len(tickers)], models, timeout)
+            for i in range(sessions)
+        ]
+        results = [future.result() for future in futures]
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    # Group the timings by action
+    actions = {}
+    for timings in results:
+        for action, seconds, error in timings:
+            entry = actions.setdefault(action, {"latencies": [], "errors": []})
+            entry["latencies"].append(seconds)
+            if error:
+                entry["errors"].append(error)
+
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_pct": 100 * cpu / wall / (os.cpu_count() or 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "actions": {
+            action: {
+                "count": len(entry["latencies"]),
+                "p50_ms": 1000 * percentile(entry["latencies"], 50),
+                "p95_ms": 1000 * percentile(entry["latencies"], 95),
+                "p99_ms": 1000 * percentile(entry["latencies"], 99),
+                "errors": entry["errors"],
+            }
+            for action, entry in actions.items()
+        },
+    }
+
+def print_level(report):
+    print(f"\n=== Concurrency {report['concurrency']} ({report['sessions']} sessions) "
+          f"wall {report['wall_s']:.1f}s | CPU {report['cpu_s']:.1f}s ({report['cpu_pct']:.0f}% of all cores) "
+          f"| peak RSS {report['peak_rss_mb']:.0f} MB")
+    print(f"{'action':<24}{'n':>5}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'errors':>8}")
+    for action, stats in report["actions"].items():
+        print(f"{action:<24}{stats['count']:>5}{stats['p50_ms']:>12.0f}{stats['p95_ms']:>12.0f}"
+              f"{stats['p99_ms']:>12.0f}{len(stats['errors']):>8}")
+
+def main():
+    args = parse_args()
+
+    # The data source is selected when the app modules are imported, so configure it first
+    os.environ["DATA_SOURCE"] = args.source
+    os.environ["DATA_LATENCY"] = str(args.latency)
+    os.chdir(ROOT)  # main.py loads static files with relative paths
+    sys.path.insert(0, str(ROOT))
+
+    import streamlit as st
+
+    tickers = args.tickers.split(",")
+    models = args.models.split(",")
+    reports = []
+
+    for concurrency in [int(level) for level in args.concurrency.split(",")]:
+        if args.cold:
+            st.cache_data.clear()
+            st.cache_resource.clear()
+        report = run_level(concurrency, args.sessions or concurrency, tickers, models, args.timeout)
+        print_level(report)
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+import streamlit.logger
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+# Outside `streamlit run`, every cached function warns that it falls back to an in-memory cache
+streamlit.logger.set_log_level("error")
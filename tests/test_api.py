@@ -0,0 +1,62 @@
+import asyncio
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from app.api import jobs, server
+from app.api.jobs import cv_metrics, frame_records, metrics_accuracy
+from app.api.server import create_app, parse_request
+
+def price_history(days):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'Date': pd.bdate_range("2023-01-02", periods=days), 'Close': 100 + np.cumsum(rng.standard_normal(days))})
+
+def test_parse_request_validates_fields():
+    assert parse_request({'ticker': ' aapl ', 'model': 'ARIMA', 'years': 2}) == ("AAPL", "ARIMA", 2)
+    assert parse_request({'ticker': 'MSFT'}, with_years=False) == ("MSFT", "Prophet")
+    for body in [[], {'ticker': ''}, {'ticker': 'A B'}, {'ticker': 'AAPL', 'model': 'LSTM'},
+                 {'ticker': 'AAPL', 'years': 0}, {'ticker': 'AAPL', 'years': 6}, {'ticker': 'AAPL', 'years': '2'}]:
+        with pytest.raises(ValueError):
+            parse_request(body)
+
+def test_frame_records_use_iso_dates_and_nulls():
+    data = pd.DataFrame({'Date': pd.to_datetime(["2024-01-02", "2024-01-03"]), 'Close': [1.5, np.nan]})
+    assert frame_records(data) == [{'Date': "2024-01-02", 'Close': 1.5}, {'Date': "2024-01-03", 'Close': None}]
+
+def test_cv_metrics_without_folds_are_null(monkeypatch):
+    monkeypatch.setattr(jobs, "get_model_cv", lambda entry, cross_validate, *args: pd.DataFrame())
+    metrics = cv_metrics({'model': None}, None, "Prophet")
+    assert metrics is None and metrics_accuracy(metrics) is None
+
+def test_cv_metrics_score_the_folds(monkeypatch):
+    df_cv = pd.DataFrame({'Actual': [100.0, 200.0], 'Predicted': [110.0, 180.0]})
+    monkeypatch.setattr(jobs, "get_model_cv", lambda entry, cross_validate, *args: df_cv)
+    metrics = cv_metrics({'model': None}, None, "ARIMA")
+    assert metrics['mape'] == pytest.approx(10.0)
+    assert metrics_accuracy(metrics) == pytest.approx(90.0)
+
+async def call_service(requests):
+    app = create_app(workers=1, io_threads=2)
+    async with TestClient(TestServer(app)) as client:
+        responses = []
+        for method, path, body in requests:
+            response = await client.request(method, path, json=body)
+            responses.append((response.status, await response.text()))
+        return responses
+
+def test_service_reports_null_metrics_on_a_short_history(monkeypatch):
+    monkeypatch.setattr(server, "fetch_history", lambda ticker, years=5: price_history(250) if ticker == "SHORT" else None)
+    responses = asyncio.run(call_service([
+        ("POST", "/forecast", {'ticker': "SHORT", 'model': "Prophet", 'years': 1}),
+        ("POST", "/forecast", {'ticker': "MISSING"}),
+        ("GET", "/data/SHORT?years=9", None),
+        ("GET", "/health", None),
+    ]))
+
+    status, text = responses[0]
+    result = json.loads(text)
+    assert status == 200
+    assert result['metrics'] is None and result['accuracy'] is None
+    assert len(result['forecast']) > 200 and {'Date', 'Forecast'} <= set(result['forecast'][0])
+    assert [status for status, _ in responses[1:]] == [404, 400, 200]
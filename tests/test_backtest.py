@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.models import backtest, tuning
+from app.models.backtest import backtest_cutoffs, load_backtest_results, save_backtest_results, run_backtest, backtest_summary
+from app.models.tuning import save_model_params
+
+def price_history(start, end):
+    dates = pd.bdate_range(start, end)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'Date': dates, 'Close': 100 * np.exp(np.cumsum(0.01 * rng.standard_normal(len(dates))))})
+
+@pytest.fixture(autouse=True)
+def stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(backtest, "BACKTEST_DIR", tmp_path / "backtest")
+    monkeypatch.setattr(tuning, "TUNING_DIR", tmp_path / "tuning")
+
+def test_cutoffs_lie_on_a_fixed_grid():
+    dates = price_history("2018-01-01", "2022-12-30")['Date']
+    cutoffs = backtest_cutoffs(dates, horizons=(30, 365), step=90, initial=730)
+    assert cutoffs[0] >= dates.min() + pd.Timedelta(days=730)
+    assert cutoffs[-1] <= dates.max() - pd.Timedelta(days=365)
+    assert all((cutoff - backtest.CUTOFF_ORIGIN).days % 90 == 0 for cutoff in cutoffs)
+
+    # More data only adds cutoffs at the end
+    longer = backtest_cutoffs(price_history("2018-01-01", "2023-12-29")['Date'], horizons=(30, 365), step=90, initial=730)
+    assert longer[:len(cutoffs)] == cutoffs and len(longer) > len(cutoffs)
+
+def test_short_history_has_no_cutoff():
+    assert backtest_cutoffs(price_history("2023-01-02", "2023-12-29")['Date']) == []
+
+def test_saved_results_are_merged_by_cutoff_and_horizon():
+    row = {'ticker': "TEST", 'model': "ARIMA", 'cutoff': pd.Timestamp("2020-01-01"), 'horizon': 30, 'points': 20,
+           'mape': 5.0, 'mae': 1.0, 'rmse': 1.5, 'computed_at': 0.0}
+    save_backtest_results("TEST", "ARIMA", [row])
+    save_backtest_results("TEST", "ARIMA", [{**row, 'mape': 4.0}, {**row, 'horizon': 90, 'mape': 8.0}])
+
+    results = load_backtest_results("TEST", "ARIMA")
+    assert results[['horizon', 'mape']].values.tolist() == [[30, 4.0], [90, 8.0]]
+    assert load_backtest_results("OTHER", "ARIMA").empty
+
+    summary = backtest_summary(results)
+    assert list(summary.index) == ["30 days", "90 days"]
+    assert summary.loc["90 days", 'MAPE'] == 8.0
+
+def test_run_backtest_skips_stored_cutoffs():
+    save_model_params("TEST", "ARIMA", {'order': [1, 1, 0]})  # Fixed order, so each cutoff is a quick fit
+    histories = {"TEST": price_history("2019-01-01", "2021-12-31")}
+    cutoffs = backtest_cutoffs(histories["TEST"]['Date'], horizons=(30, 90))
+
+    report = run_backtest(histories, models=("ARIMA",), horizons=(30, 90), max_workers=2)
+    assert report[("TEST", "ARIMA")] == {'computed': len(cutoffs), 'skipped': 0, 'failed': 0}
+    results = load_backtest_results("TEST", "ARIMA")
+    assert len(results) == 2 * len(cutoffs)
+    assert (results['points'] > 0).all() and results['mape'].between(0, 100).all()
+
+    report = run_backtest(histories, models=("ARIMA",), horizons=(30, 90), max_workers=2)
+    assert report[("TEST", "ARIMA")] == {'computed': 0, 'skipped': len(cutoffs), 'failed': 0}
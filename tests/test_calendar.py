@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from app.data.calendar import future_sessions, infer_trading_calendar, trading_calendar, trading_sessions
+
+HOLIDAYS = pd.to_datetime(["2024-01-01", "2024-07-04", "2024-11-28", "2024-12-25"])
+
+def test_calendars():
+    exchange, fx, crypto = (trading_calendar(name) for name in ('exchange', 'fx', 'crypto'))
+    assert exchange.is_monotonic_increasing and fx.is_monotonic_increasing
+    assert not HOLIDAYS.isin(exchange).any() and HOLIDAYS.isin(fx).all()
+    assert pd.Timestamp("2024-07-05") in exchange
+    assert (fx.dayofweek < 5).all() and pd.Timestamp("2024-07-06") in crypto
+    assert len(exchange[exchange.year == 2024]) == 252
+
+@pytest.mark.parametrize("calendar", ['exchange', 'fx', 'crypto'])
+def test_inferred_calendar(calendar):
+    dates = pd.Series(trading_sessions(pd.Timestamp("2023-01-01"), pd.Timestamp("2024-12-31"), calendar))
+    assert infer_trading_calendar(dates) == calendar
+
+def test_a_stray_holiday_row_keeps_the_exchange_calendar():
+    dates = trading_sessions(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-12-31"), 'exchange').append(HOLIDAYS[:1])
+    assert infer_trading_calendar(dates.sort_values()) == 'exchange'
+
+def test_sessions_outside_the_precomputed_range_follow_the_weekly_pattern():
+    sessions = trading_sessions(pd.Timestamp("2061-07-01"), pd.Timestamp("2061-07-08"), 'exchange')
+    assert list(sessions.day) == [1, 4, 5, 6, 7, 8]  # 4 July is not a holiday there
+    assert len(trading_sessions(pd.Timestamp("1989-12-29"), pd.Timestamp("1990-01-03"), 'crypto')) == 6
+
+def test_future_sessions_skip_weekends_and_holidays():
+    dates = pd.Series(trading_sessions(pd.Timestamp("2024-06-01"), pd.Timestamp("2024-07-03"), 'exchange'))
+    future = future_sessions(dates, 7)
+    assert list(future.strftime('%m-%d')) == ["07-05", "07-08", "07-09", "07-10"]
+    assert list(future_sessions(dates, 7, 'fx').day) == [4, 5, 8, 9, 10]
+    assert len(future_sessions(dates.dt.tz_localize("America/New_York"), 7)) == 4
@@ -0,0 +1,28 @@
+import threading
+import time
+from app.data.client import TokenBucket, backoff_delay, BACKOFF_CAP
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05  # The burst is served at once
+
+    for _ in range(10):
+        bucket.acquire()
+    assert time.monotonic() - start >= 10 / 50 * 0.95  # Then one token every 1 / rate seconds
+
+def test_token_bucket_is_shared_by_threads():
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 19 / 100 * 0.95
+
+def test_backoff_delay_is_capped():
+    for attempt in range(20):
+        assert 0 <= backoff_delay(attempt) <= BACKOFF_CAP
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.models.arima import train_arima_model, cross_validation_arima_folds
+from app.models.prophet import train_prophet_model, cross_validate_prophet_folds
+
+def price_history(days):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'Date': pd.date_range("2019-01-01", periods=days), 'Close': 100 * np.exp(np.cumsum(0.01 * rng.standard_normal(days)))})
+
+def test_arima_folds_are_yielded_one_at_a_time():
+    data = price_history(300)
+    folds = cross_validation_arima_folds(data, train_arima_model(data, {'order': [1, 1, 0]}), n_splits=4)
+    fold, n_folds, df_fold = next(folds)
+    assert (fold, n_folds) == (1, 4)
+    assert list(df_fold.columns) == ['Actual', 'Predicted'] and len(df_fold) == 60
+
+    remaining = list(folds)
+    assert [fold for fold, _, _ in remaining] == [2, 3, 4]
+
+@pytest.fixture(scope="module")
+def prophet_fits():
+    return {days: train_prophet_model(price_history(days)) for days in [600, 1300]}
+
+def test_prophet_without_enough_history_yields_no_fold(prophet_fits):
+    assert list(cross_validate_prophet_folds(prophet_fits[600])) == []
+
+def test_prophet_folds_follow_the_cutoffs(prophet_fits):
+    folds = list(cross_validate_prophet_folds(prophet_fits[1300], initial='730 days', period='180 days', horizon='365 days'))
+    assert len(folds) == 2
+    assert [fold for fold, _, _ in folds] == [1, 2] and {n for _, n, _ in folds} == {2}
+    for _, _, df_fold in folds:
+        assert {'ds', 'y', 'yhat', 'cutoff'} <= set(df_fold.columns)
+        assert (df_fold['ds'] > df_fold['cutoff']).all()
+        assert (df_fold['ds'] <= df_fold['cutoff'] + pd.Timedelta('365 days')).all()
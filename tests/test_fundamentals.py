@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data import fundamentals
+from app.data.fundamentals import snapshot_row, screen, stale_symbols, refresh_fundamentals, load_fundamentals
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(0)
+    n = 1000
+    return pd.DataFrame({
+        'symbol': [f"S{i:04d}" for i in range(n)],
+        'sector': np.where(np.arange(n) % 2 == 0, "Technology", "Energy"),
+        'market_cap': rng.uniform(1e8, 1e12, n),
+        'trailing_pe': np.where(np.arange(n) % 10 == 0, np.nan, rng.uniform(1, 80, n)),
+        'updated_at': np.arange(n, dtype=float),
+    })
+
+def test_snapshot_row_keeps_numbers_only():
+    row = snapshot_row("AAPL", {'longName': "Apple", 'marketCap': 3_000_000_000_000, 'trailingPE': "Infinity",
+                                'beta': True, 'trailingPegRatio': 2.5})
+    assert row['name'] == "Apple" and row['sector'] is None
+    assert row['market_cap'] == 3e12
+    assert np.isnan(row['trailing_pe']) and np.isnan(row['beta'])
+    assert row['peg_ratio'] == 2.5
+
+def test_screen_filters_and_ranks_like_pandas(table):
+    top, matches = screen(table, ranges={'trailing_pe': (10, 30)}, categories={'sector': ["Technology"]}, limit=20)
+    expected = table[table['trailing_pe'].between(10, 30) & (table['sector'] == "Technology")]
+    assert matches == len(expected)
+    assert top['symbol'].tolist() == expected.nlargest(20, 'market_cap')['symbol'].tolist()
+
+def test_screen_puts_missing_values_last(table):
+    top, matches = screen(table, sort_by='trailing_pe', ascending=True, limit=len(table))
+    assert matches == len(table)
+    assert top['trailing_pe'].iloc[:900].is_monotonic_increasing
+    assert top['trailing_pe'].iloc[900:].isna().all()
+
+def test_screen_open_ranges_exclude_missing_values(table):
+    _, matches = screen(table, ranges={'trailing_pe': (None, None)})
+    assert matches == table['trailing_pe'].notna().sum()
+
+def test_stale_symbols_prefer_never_fetched(table):
+    assert stale_symbols(["NEW", "S0005", "S0001", "S0003"], table, limit=3) == ["NEW", "S0001", "S0003"]
+
+def test_refresh_merges_into_the_saved_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(fundamentals, "FUNDAMENTALS_PATH", tmp_path / "fundamentals.parquet")
+    infos = {"AAA": {'longName': "A", 'marketCap': 1e9}, "BBB": {}}
+    monkeypatch.setattr(fundamentals, "fetch_info", lambda symbol: infos[symbol])
+
+    table, failed = refresh_fundamentals(["AAA", "BBB"], max_workers=2)
+    assert failed == ["BBB"]
+    assert table['symbol'].tolist() == ["AAA"]
+
+    infos["AAA"] = {'longName': "A", 'marketCap': 2e9}
+    refresh_fundamentals(["AAA"], max_workers=1)
+    saved = load_fundamentals()
+    assert saved['symbol'].tolist() == ["AAA"] and saved['market_cap'].iloc[0] == 2e9
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+from app.models.arima import train_arima_model, forecast_arima_model
+from app.models.intervals import normal_bounds, simulated_bounds
+
+def test_normal_bounds_cover_the_requested_width():
+    lower, upper = normal_bounds([100.0, 110.0], 2.0, width=0.8)
+    z = norm.ppf(0.9)
+    np.testing.assert_allclose(lower, [100 - 2 * z, 110 - 2 * z])
+    np.testing.assert_allclose(upper, [100 + 2 * z, 110 + 2 * z])
+
+def test_normal_bounds_widen_with_coverage_and_std():
+    narrow = normal_bounds([0.0], 1.0, width=0.5)
+    wide = normal_bounds([0.0], 1.0, width=0.95)
+    assert wide[0][0] < narrow[0][0] and wide[1][0] > narrow[1][0]
+    lower, upper = normal_bounds([0.0, 0.0], np.array([1.0, 3.0]), width=0.8)
+    assert upper[1] - lower[1] == pytest.approx(3 * (upper[0] - lower[0]))
+
+def test_simulated_bounds_are_per_period_quantiles():
+    paths = np.tile(np.arange(101.0), (3, 1)) + np.array([[0.0], [10.0], [20.0]])
+    lower, upper = simulated_bounds(paths, width=0.8)
+    np.testing.assert_allclose(lower, [10, 20, 30])
+    np.testing.assert_allclose(upper, [90, 100, 110])
+
+@pytest.fixture(scope="module")
+def arima_fit():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'Date': pd.bdate_range("2022-01-03", periods=400), 'Close': 100 + np.cumsum(rng.standard_normal(400))})
+    return data, train_arima_model(data, {'order': [1, 1, 0]})
+
+@pytest.mark.parametrize("method", ["analytic", "simulation"])
+def test_arima_intervals_contain_the_forecast(arima_fit, method):
+    data, m_arima = arima_fit
+    forecast = forecast_arima_model(m_arima, data, 30, interval_method=method, samples=500)
+    assert (forecast['Lower'] <= forecast['Forecast']).all() and (forecast['Forecast'] <= forecast['Upper']).all()
+    width = forecast['Upper'] - forecast['Lower']
+    assert width.iloc[-1] > width.iloc[0]  # Uncertainty grows with the horizon
+
+def test_arima_without_intervals(arima_fit):
+    data, m_arima = arima_fit
+    forecast = forecast_arima_model(m_arima, data, 30, interval_method="none")
+    assert list(forecast.columns) == ['Date', 'Forecast']
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data import intraday
+from app.data.intraday import (BAR_COLUMNS, aggregate_bars, downsample, future_bar_dates, ingest_intraday,
+                               scan_intraday, tail_intraday, write_partitions)
+from app.data.sources import SyntheticSource
+
+def synthetic_bars(ticker="AAPL", start="2024-01-02", end="2024-03-01", interval="5m"):
+    data = SyntheticSource().download_intraday(ticker, pd.Timestamp(start), pd.Timestamp(end), interval)
+    return data.reset_index()[BAR_COLUMNS]
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(intraday, "INTRADAY_DIR", tmp_path)
+
+def resampled(bars, rule):
+    grouped = bars.set_index('Date').resample(rule)
+    expected = grouped.agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+    return expected[grouped['Close'].count() > 0].reset_index()
+
+@pytest.mark.parametrize("rule", ["15min", "1h", "1D"])
+def test_streamed_aggregation_matches_a_single_pass(rule):
+    bars = synthetic_bars()
+    chunks = np.array_split(np.arange(len(bars)), 7)  # Chunk edges fall inside buckets
+    streamed = aggregate_bars((bars.iloc[rows] for rows in chunks), rule)
+    pd.testing.assert_frame_equal(streamed, resampled(bars, rule), check_dtype=False, check_freq=False)
+
+def test_aggregation_of_nothing_is_empty():
+    assert aggregate_bars(iter([]), "1h").empty
+
+def test_partitions_are_merged_and_read_back():
+    bars = synthetic_bars()
+    write_partitions("AAPL", "5m", bars.iloc[:3000])
+    write_partitions("AAPL", "5m", bars.iloc[2000:])  # Overlapping bars are replaced, not duplicated
+
+    assert [path.stem for path in intraday.intraday_partitions("AAPL", "5m")] == ["2024-01", "2024-02"]
+    stored = pd.concat(scan_intraday("AAPL", "5m"), ignore_index=True)
+    pd.testing.assert_frame_equal(stored, bars, check_dtype=False)
+
+    february = pd.concat(scan_intraday("AAPL", "5m", start=pd.Timestamp("2024-02-01")), ignore_index=True)
+    assert february['Date'].min() >= pd.Timestamp("2024-02-01")
+    pd.testing.assert_frame_equal(tail_intraday("AAPL", "5m", 100), bars.iloc[-100:].reset_index(drop=True), check_dtype=False)
+
+def test_ingestion_only_requests_new_bars(monkeypatch):
+    source = SyntheticSource()
+    requests = []
+
+    class RecordingSource:
+        def download_intraday(self, ticker, start, end, interval):
+            requests.append((start, end))
+            return source.download_intraday(ticker, start, end, interval)
+
+    monkeypatch.setattr(intraday, "get_data_source", RecordingSource)
+    assert ingest_intraday("MSFT", "1h") > 0
+    first_run = len(requests)
+    assert first_run == 5  # 729 days in windows of at most 180 days
+
+    ingest_intraday("MSFT", "1h")
+    assert len(requests) == first_run + 1
+    assert requests[-1][0] >= pd.Timestamp("today").normalize() - pd.Timedelta(days=3)
+
+def test_downsample_keeps_the_extremes():
+    data = pd.DataFrame({'Date': pd.date_range("2024-01-01", periods=10_000, freq='min'), 'Close': np.sin(np.arange(10_000) / 50)})
+    data.loc[1234, 'Close'] = 10
+    sampled = downsample(data, max_points=200)
+    assert len(sampled) <= 200 and sampled['Date'].is_monotonic_increasing
+    assert 1234 in sampled.index and sampled['Close'].min() == data['Close'].min()
+
+def test_future_bars_skip_nights_and_weekends():
+    dates = synthetic_bars(start="2024-01-02", end="2024-01-06", interval="1h")['Date']  # Ends on a Friday
+    future = future_bar_dates(dates, 10)
+    assert len(future) == 10 and future[0] > dates.iloc[-1]
+    assert (future.dayofweek < 5).all()
+    assert set(future.time) <= set(dates.dt.time)
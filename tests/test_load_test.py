@@ -0,0 +1,17 @@
+import importlib.util
+import math
+from pathlib import Path
+import numpy as np
+
+spec = importlib.util.spec_from_file_location("load_test", Path(__file__).resolve().parents[1] / "scripts" / "load_test.py")
+load_test = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(load_test)
+
+def test_percentile_matches_numpy():
+    values = [0.8, 0.1, 2.5, 1.2, 0.4, 3.3, 0.9]
+    for q in [0, 50, 95, 99, 100]:
+        assert math.isclose(load_test.percentile(values, q), np.percentile(values, q))
+
+def test_percentile_of_no_values_is_nan():
+    assert math.isnan(load_test.percentile([], 50))
+    assert load_test.percentile([2.0], 99) == 2.0
@@ -0,0 +1,51 @@
+import threading
+import pytest
+from app.data import loader
+
+class StubIndex:
+    def __init__(self, known):
+        self.known = dict(known)
+
+    def lookup(self, ticker):
+        return self.known.get(ticker)
+
+    def add(self, ticker, name, ticker_type):
+        self.known[ticker] = (name, ticker_type)
+
+class SlowSource:
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def info(self, ticker):
+        self.calls.append((ticker, threading.current_thread().name))
+        self.release.wait(5)
+        return {'longName': f"{ticker} Corp", 'quoteType': "EQUITY"}
+
+@pytest.fixture
+def source(monkeypatch):
+    source = SlowSource()
+    monkeypatch.setattr(loader, "get_data_source", lambda: source)
+    monkeypatch.setattr(loader, "get_symbol_index", lambda: StubIndex({'AAPL': ("Apple Inc.", "EQUITY")}))
+    return source
+
+def test_metadata_is_only_fetched_when_needed(source):
+    assert loader.start_info_fetch("AAPL") is None  # Named by the index, outside the Explore section
+    future = loader.start_info_fetch("XYZ")
+    source.release.set()
+    assert future.result(5)['longName'] == "XYZ Corp"
+
+def test_concurrent_fetches_share_one_call_on_the_pool(source):
+    futures = [loader.submit_info_fetch("XYZ") for _ in range(3)]
+    source.release.set()
+    assert all(future.result(5)['quoteType'] == "EQUITY" for future in futures)
+    assert len(source.calls) == 1 and source.calls[0][1].startswith("fetch")
+
+def test_ticker_name_reuses_the_started_fetch(source, monkeypatch):
+    index = StubIndex({})
+    monkeypatch.setattr(loader, "get_symbol_index", lambda: index)
+    future = loader.submit_info_fetch("XYZ")
+    source.release.set()
+    assert loader.get_ticker_name("XYZ", future) == "XYZ Corp (EQUITY)"
+    assert len(source.calls) == 1
+    assert index.lookup("XYZ") == ("XYZ Corp", "EQUITY")  # Later lookups skip the network
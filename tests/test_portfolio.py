@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data import portfolio as portfolio_data
+from app.data.portfolio import parse_portfolio, fetch_portfolio_history
+from app.data.sources import SyntheticSource
+from app.models.portfolio import periods_per_year, portfolio_statistics
+
+def test_parse_portfolio_normalizes_weights():
+    assert parse_portfolio("aapl:0.6, MSFT:0.4") == pytest.approx({"AAPL": 0.6, "MSFT": 0.4})
+    assert parse_portfolio("AAPL:60% MSFT:20%") == pytest.approx({"AAPL": 0.75, "MSFT": 0.25})
+    assert parse_portfolio("AAPL MSFT") == {"AAPL": 0.5, "MSFT": 0.5}
+
+@pytest.mark.parametrize("text", ["", " , ", "AAPL, aapl", "AAPL:0", "AAPL:abc", ":0.5", " ".join(f"T{i}" for i in range(50))])
+def test_parse_portfolio_rejects_invalid_input(text):
+    with pytest.raises(ValueError):
+        parse_portfolio(text)
+
+def test_history_is_aligned_on_common_dates(monkeypatch):
+    monkeypatch.setattr(portfolio_data, "get_data_source", lambda: SyntheticSource())
+    data = fetch_portfolio_history(("AAPL", "BTC-USD"), years=1)
+    assert list(data.columns) == ["Date", "AAPL", "BTC-USD"]
+    assert (data['Date'].dt.dayofweek < 5).all()  # Crypto weekends are dropped
+    assert data[["AAPL", "BTC-USD"]].notna().all().all()
+
+    with pytest.raises(LookupError):
+        fetch_portfolio_history(("AAPL", "ES=F"), years=1)
+
+def test_periods_per_year():
+    assert periods_per_year(pd.Series(pd.bdate_range("2020-01-01", "2023-12-31"))) == pytest.approx(261, abs=1)
+    assert periods_per_year(pd.Series(pd.date_range("2020-01-01", "2023-12-31"))) == pytest.approx(365, abs=1)
+
+def test_statistics_of_two_assets():
+    rng = np.random.default_rng(0)
+    returns = rng.multivariate_normal([0.0004, 0.0002], [[1e-4, 3e-5], [3e-5, 4e-4]], size=5000)
+    prices = 100 * np.exp(np.vstack([np.zeros(2), np.cumsum(returns, axis=0)]))
+    stats = portfolio_statistics(prices, [0.7, 0.3])
+
+    np.testing.assert_allclose(stats['volatility'], np.sqrt(np.array([1e-4, 4e-4]) * 252), rtol=0.05)
+    assert stats['corr'][0, 1] == pytest.approx(0.15, abs=0.05)
+    np.testing.assert_allclose(np.diag(stats['corr']), 1)
+    assert stats['risk_contribution'].sum() == pytest.approx(1)
+    assert stats['portfolio_return'] == pytest.approx(0.7 * stats['mean'][0] + 0.3 * stats['mean'][1])
+    assert stats['portfolio_volatility'] < 0.7 * stats['volatility'][0] + 0.3 * stats['volatility'][1]  # Diversification
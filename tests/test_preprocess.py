@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data.calendar import trading_sessions
+from app.data.preprocess import preprocess, prepare_data, PREPROCESSED_COLUMNS
+
+def stock_history(start="2023-01-03", end="2023-12-29", seed=0):
+    dates = trading_sessions(pd.Timestamp(start), pd.Timestamp(end), 'exchange')
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(0.01 * rng.standard_normal(len(dates))))
+    return pd.DataFrame({'Date': dates, 'Close': close})
+
+def test_complete_series_is_unchanged():
+    data = stock_history()
+    result = preprocess(data)
+    assert list(result.columns) == PREPROCESSED_COLUMNS
+    assert len(result) == len(data)
+    np.testing.assert_allclose(result['Close'], data['Close'])
+    np.testing.assert_allclose(result['Return'].iloc[1:], np.diff(np.log(data['Close'])))
+    assert result['Return'].iloc[0] == 0 and not result['Filled'].any() and not result['Clipped'].any()
+
+def test_short_gaps_are_interpolated_and_long_gaps_dropped():
+    data = stock_history()
+    short_gap = data.drop(index=[50, 51])
+    long_gap = data.drop(index=range(100, 110))
+    result = preprocess(pd.concat([short_gap.loc[:99], long_gap.loc[110:]]), max_gap=5)
+
+    assert result['Filled'].sum() == 2
+    filled = result[result['Filled']]
+    assert list(filled['Date']) == list(data.loc[[50, 51], 'Date'])
+    # Linear in log space between the neighbours
+    log_close = np.log(data['Close'])
+    np.testing.assert_allclose(filled['LogClose'], log_close[49] + (log_close[52] - log_close[49]) * np.array([1, 2]) / 3)
+    assert not result['Date'].isin(data.loc[100:109, 'Date']).any()
+
+def test_spikes_are_clipped_but_jumps_kept():
+    data = stock_history()
+    data.loc[120, 'Close'] *= 1.5                 # One-day spike
+    data.loc[200:, 'Close'] *= 1.5                # Lasting jump
+    result = preprocess(data)
+
+    assert list(result.index[result['Clipped']]) == [120]
+    assert result.loc[120, 'Close'] < data.loc[120, 'Close'] / 1.3
+    assert result.loc[240, 'Close'] == pytest.approx(data.loc[240, 'Close'])
+    assert not preprocess(data, clip=False)['Clipped'].any()
+
+def test_duplicates_and_order_are_fixed():
+    data = stock_history()
+    shuffled = pd.concat([data.iloc[::-1], data.iloc[[10]].assign(Close=123.0)])
+    result = preprocess(shuffled, clip=False)
+    assert result['Date'].is_monotonic_increasing and len(result) == len(data)
+    assert result.loc[10, 'Close'] == pytest.approx(123.0)  # The last duplicate wins
+
+def test_prepare_data_is_shared_per_fingerprint():
+    data = stock_history()
+    first = prepare_data(data)
+    assert prepare_data(data.copy()) is first
+    assert prepare_data(stock_history(seed=1)) is not first
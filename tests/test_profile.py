@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data.profile import build_profile, profile_prompt
+
+@pytest.fixture
+def data():
+    dates = pd.bdate_range("2024-01-01", "2024-03-29")
+    close = np.linspace(100, 130, len(dates))
+    close[20] = 150   # Highest close, then a drawdown to 115.4
+    close[30] = 90    # Lowest close
+    volume = np.full(len(dates), 1_000_000.0)
+    volume[40] = 5_000_000
+    return pd.DataFrame({'Date': dates, 'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': volume})
+
+def test_profile_statistics(data):
+    profile = build_profile(data.sample(frac=1, random_state=0))  # Row order does not matter
+    assert profile['rows'] == len(data)
+    assert profile['start'] == data['Date'].iloc[0] and profile['end'] == data['Date'].iloc[-1]
+
+    extremes = profile['extremes']
+    assert extremes.loc['Highest close', 'Value'] == 150 and extremes.loc['Highest close', 'Date'] == data['Date'].iloc[20]
+    assert extremes.loc['Lowest close', 'Value'] == 90 and extremes.loc['Lowest close', 'Date'] == data['Date'].iloc[30]
+    assert extremes.loc['Maximum drawdown', 'Value'] == pytest.approx(90 / 150 - 1)
+    assert extremes.loc['Highest volume', 'Date'] == data['Date'].iloc[40]
+
+    returns = profile['returns']['Return']
+    assert returns['All'] == pytest.approx(130 / 100 - 1)
+    assert '1 year' not in returns  # The history is shorter than the window
+    assert list(profile['volatility'].index) == ['1 month', '3 months', 'All']  # 64 daily returns
+
+    monthly = profile['monthly']
+    assert list(monthly.index) == ['2024-01', '2024-02', '2024-03']
+    assert monthly['Volume'].sum() == data['Volume'].sum()
+    assert monthly.loc['2024-03', 'Close'] == 130
+
+def test_weekend_trading_annualizes_over_calendar_days(data):
+    daily = data.set_index('Date').asfreq('D').ffill().reset_index()
+    weekdays = build_profile(data)['volatility'].loc['All'].iloc[0]
+    every_day = build_profile(daily)['volatility'].loc['All'].iloc[0]
+    log_returns = np.diff(np.log(daily['Close']))
+    assert every_day == pytest.approx(log_returns.std() * np.sqrt(365))
+    assert weekdays != every_day
+
+def test_prompt_contains_the_profile(data):
+    prompt = profile_prompt(build_profile(data), "TEST")
+    assert prompt.startswith(f"Daily data of TEST: {len(data)} rows from 2024-01-01 to 2024-03-29.")
+    assert "Highest close: 150.00 on 2024-01-29" in prompt
+    assert "Lowest close: 90.00 on 2024-02-12" in prompt
+    assert "Highest monthly volume" in prompt
+    assert "2024-03," in prompt
+    assert len(prompt) < 3000
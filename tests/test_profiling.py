@@ -0,0 +1,56 @@
+import os
+import threading
+import time
+import pytest
+from app.components import profiling
+from app.components.profiling import SamplingProfiler, profiled, profiling_enabled, save_profile
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def test_profiler_samples_the_profiled_thread():
+    profiler = SamplingProfiler(threading.get_ident(), interval=0.005)
+    profiler.start()
+    busy_loop(0.3)
+    profiler.stop()
+
+    assert profiler.samples > 10 and profiler.elapsed >= 0.3
+    assert sum(profiler.counts.values()) == profiler.samples
+    lines = profiler.folded().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    busiest = lines[0].rsplit(" ", 1)[0].split(";")
+    assert busiest[-1].startswith("busy_loop (tests/test_profiling.py:")
+    assert "run (app/components/profiling.py" not in profiler.folded()  # Only the profiled thread is sampled
+
+def test_saved_profiles_are_pruned(tmp_path):
+    profiler = SamplingProfiler()
+    profiler.counts["main;work"] = 3
+    for age in range(5):
+        path = tmp_path / f"old-{age}.folded"
+        path.write_text("")
+        os.utime(path, (time.time() - 100 + age, time.time() - 100 + age))
+
+    path = save_profile(profiler, "forecast", directory=tmp_path, keep=3)
+    assert path.read_text() == "main;work 3\n" and "-forecast-" in path.name
+    assert sorted(file.name for file in tmp_path.iterdir()) == sorted([path.name, "old-3.folded", "old-4.folded"])
+
+@pytest.mark.parametrize("setting, expected", [("0", False), ("1", True), ("query", False)])
+def test_profiling_setting(monkeypatch, setting, expected):
+    monkeypatch.setattr(profiling, "APP_PROFILE", setting)
+    assert profiling_enabled() is expected
+
+def test_profiled_writes_the_profile_even_on_errors(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "APP_PROFILE", "1")
+    monkeypatch.setattr(profiling, "PROFILE_MIN_SECONDS", 0.1)
+    monkeypatch.setattr(profiling, "save_profile", lambda profiler, label: save_profile(profiler, label, directory=tmp_path))
+
+    @profiled("failing")
+    def failing():
+        busy_loop(0.2)
+        raise RuntimeError("stop")
+
+    with pytest.raises(RuntimeError):
+        failing()
+    assert len(list(tmp_path.glob("*-failing-*.folded"))) == 1
@@ -0,0 +1,80 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from app.models import registry
+from app.models.registry import ModelRegistry, get_fitted_model, get_model_cv, get_model_registry, model_key
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({'Date': pd.bdate_range("2023-01-02", periods=300), 'Close': np.linspace(100, 130, 300)})
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    get_model_registry().clear()
+    yield
+    get_model_registry().clear()
+
+def test_registry_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(registry, "estimate_model_bytes", lambda model: 40)
+    store = ModelRegistry(max_bytes=100)
+    store.put("a", object())
+    store.put("b", object())
+    store.get("a")  # 'b' becomes the least recently used
+    store.put("c", object())
+
+    assert list(store.entries) == ["a", "c"]
+    assert store.total_bytes == 80
+
+def test_registry_keeps_an_entry_larger_than_the_cap(monkeypatch):
+    monkeypatch.setattr(registry, "estimate_model_bytes", lambda model: 500)
+    store = ModelRegistry(max_bytes=100)
+    store.put("a", object())
+    store.put("b", object())
+    assert list(store.entries) == ["b"]
+
+def test_model_key_accepts_saved_json_params(data):
+    assert model_key("AAPL", data, "ARIMA", {'order': [1, 1, 1]}) == model_key("AAPL", data, "ARIMA", {'order': (1, 1, 1)})
+    assert model_key("AAPL", data, "ARIMA") != model_key("MSFT", data, "ARIMA")
+
+def test_concurrent_requests_share_one_fit(monkeypatch, data):
+    fits = []
+
+    def train(data, params):
+        fits.append(len(data))
+        time.sleep(0.2)
+        return "model"
+
+    monkeypatch.setitem(registry.TRAINERS, "ARIMA", train)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_fitted_model("AAPL", data, "ARIMA"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fits) == 1
+    assert all(entry is results[0] for entry in results)
+    assert get_fitted_model("AAPL", data, "ARIMA") is results[0]
+
+def test_failed_fit_returns_none(monkeypatch, data):
+    def train(data, params):
+        raise ValueError("no convergence")
+
+    monkeypatch.setitem(registry.TRAINERS, "ARIMA", train)
+    assert get_fitted_model("AAPL", data, "ARIMA") is None
+
+def test_cross_validation_runs_once_per_entry(monkeypatch, data):
+    monkeypatch.setitem(registry.TRAINERS, "ARIMA", lambda data, params: "model")
+    entry = get_fitted_model("AAPL", data, "ARIMA")
+    calls = []
+
+    def cross_validate():
+        calls.append(1)
+        return pd.DataFrame({'Actual': [1.0], 'Predicted': [1.1]})
+
+    first = get_model_cv(entry, cross_validate)
+    assert get_model_cv(entry, cross_validate) is first
+    assert len(calls) == 1
+    assert get_model_registry().get_result(entry, 'cv') is first
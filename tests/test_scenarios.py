@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from app.models.scenarios import simulate_scenarios
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    return 100 * np.exp(np.cumsum(0.0004 + 0.01 * rng.standard_normal(1000)))
+
+def test_same_seed_gives_the_same_scenarios(prices):
+    first = simulate_scenarios(prices, 300, n_paths=2_000, seed=7)
+    second = simulate_scenarios(prices, 300, n_paths=2_000, seed=7, chunk_size=300)  # Chunking only changes the draws order
+    assert first['fan'].shape == second['fan'].shape
+    np.testing.assert_allclose(first['fan'].iloc[-1, 1:], second['fan'].iloc[-1, 1:], rtol=0.05)
+    again = simulate_scenarios(prices, 300, n_paths=2_000, seed=7)
+    np.testing.assert_array_equal(first['fan'].to_numpy(), again['fan'].to_numpy())
+
+def test_fan_is_ordered_and_keeps_checkpoints(prices):
+    result = simulate_scenarios(prices, 600, n_paths=2_000, method="gbm", seed=1, fan_points=50)
+    fan = result['fan']
+    quantiles = fan.drop(columns='step').to_numpy()
+    assert (np.diff(quantiles, axis=1) >= 0).all()
+    assert {252, 504, 600} <= set(fan['step'])
+    assert len(fan) <= 50 + 3
+
+    assert list(result['thresholds'].index) == ["1Y", "2Y", "2.4Y"]
+    assert list(result['var'].index.get_level_values('Confidence').unique()) == ["95%", "99%"]
+
+def test_gbm_matches_the_historical_drift_and_volatility(prices):
+    horizon = 252
+    result = simulate_scenarios(prices, horizon, n_paths=20_000, method="gbm", seed=2)
+    returns = np.diff(np.log(prices))
+    median = result['fan'].iloc[-1]['q50']
+    assert np.log(median / prices[-1]) == pytest.approx(returns.mean() * horizon, abs=0.02)
+
+    spread = np.log(result['fan'].iloc[-1]['q95'] / result['fan'].iloc[-1]['q05'])
+    assert spread == pytest.approx(2 * 1.645 * returns.std() * np.sqrt(horizon), rel=0.05)
+
+def test_thresholds_and_var_are_consistent(prices):
+    result = simulate_scenarios(prices, 252, n_paths=5_000, seed=3)
+    probabilities = result['thresholds'].iloc[0].to_numpy()
+    assert (np.diff(probabilities) <= 0).all()  # Higher thresholds are less likely
+    var = result['var'].loc["1Y"]
+    assert var.loc["99%", 'VaR'] >= var.loc["95%", 'VaR']
+    assert (var['CVaR'] >= var['VaR']).all()
+
+def test_residual_method_centres_on_the_base_path(prices):
+    base_path = np.linspace(prices[-1], prices[-1] * 1.5, 100)
+    innovations = np.random.default_rng(4).normal(0.05, 0.001, 500)  # The mean is removed
+    result = simulate_scenarios(prices, 100, n_paths=2_000, method="residual", innovations=innovations, base_path=base_path, seed=4)
+    assert result['fan'].iloc[-1]['q50'] == pytest.approx(base_path[-1], rel=0.01)
+
+    with pytest.raises(ValueError):
+        simulate_scenarios(prices, 100, method="residual")
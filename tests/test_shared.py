@@ -0,0 +1,41 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from app.data.shared import SharedFrame, as_frame
+
+def frame():
+    return pd.DataFrame({
+        'Date': pd.bdate_range("2020-01-01", periods=1000),
+        'Close': np.linspace(1, 2, 1000),
+        'Volume': np.arange(1000, dtype=np.int64),
+        'Filled': np.arange(1000) % 7 == 0,
+    })
+
+def column_sums(handle):
+    data = as_frame(handle)
+    return float(data['Close'].sum()), int(data['Volume'].sum()), int(data['Filled'].sum()), data['Date'].iloc[-1]
+
+def test_frame_round_trips_through_shared_memory():
+    data = frame()
+    with SharedFrame(data) as shared:
+        attached = as_frame(shared.handle)
+        pd.testing.assert_frame_equal(attached, data, check_freq=False)
+        assert not attached['Close'].to_numpy().flags.writeable
+        assert len(pickle.dumps(shared.handle)) < 500  # Tasks carry a handle, not the data
+
+def test_workers_read_the_published_frame():
+    data = frame()
+    expected = (float(data['Close'].sum()), int(data['Volume'].sum()), int(data['Filled'].sum()), data['Date'].iloc[-1])
+    with SharedFrame(data) as shared, ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(column_sums, [shared.handle] * 4))
+    assert results == [expected] * 4
+
+def test_plain_frames_pass_through():
+    data = frame()
+    assert as_frame(data) is data
+
+def test_object_columns_are_rejected():
+    with pytest.raises(TypeError):
+        SharedFrame(pd.DataFrame({'Ticker': ["AAPL", "MSFT"]}))
@@ -0,0 +1,82 @@
+import threading
+import time
+import pytest
+from app.data.singleflight import SingleFlight
+
+def run_together(fn, count):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(fn())
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+def test_concurrent_calls_share_one_run():
+    group = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results, errors = run_together(lambda: group.do("key", work), 5)
+    assert len(calls) == 1 and not errors
+    assert all(result is results[0] for result in results)
+    assert group.calls == {}
+
+def test_results_are_not_cached_after_completion():
+    group = SingleFlight()
+    assert group.do("key", lambda: 1) == 1
+    assert group.do("key", lambda: 2) == 2
+
+def test_different_keys_run_separately():
+    group = SingleFlight()
+    calls = []
+    run_together(lambda: group.do(threading.get_ident(), lambda: calls.append(1)), 3)
+    assert len(calls) == 3
+
+def test_followers_share_the_leader_exception():
+    group = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError("download failed")
+
+    results, errors = run_together(lambda: group.do("key", fail), 3)
+    assert not results and len(errors) == 3
+    assert all(isinstance(error, ValueError) for error in errors)
+
+def test_followers_take_over_when_the_leader_is_interrupted():
+    group = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    class Interrupted(BaseException):
+        pass
+
+    def leader_work():
+        calls.append("leader")
+        started.set()
+        time.sleep(0.2)
+        raise Interrupted()  # Like a Streamlit script being stopped
+
+    def follower():
+        started.wait()
+        return group.do("key", lambda: calls.append("follower") or "done")
+
+    leader = threading.Thread(target=lambda: pytest.raises(Interrupted, group.do, "key", leader_work))
+    leader.start()
+    results, errors = run_together(follower, 2)
+    leader.join()
+
+    assert not errors and results == ["done", "done"]
+    assert calls.count("leader") == 1 and calls.count("follower") >= 1
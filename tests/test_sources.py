@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from app.data.sources import DataSource, OfflineSource, LocalFileSource, SyntheticSource, PRICE_COLUMNS, guess_quote_type
+
+def test_backend_missing_abstract_methods_cannot_be_created():
+    class Incomplete(OfflineSource):
+        def history(self, ticker):
+            return pd.DataFrame()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    with pytest.raises(TypeError):
+        DataSource()
+
+def test_synthetic_windows_are_slices_of_one_series():
+    source = SyntheticSource(seed=1)
+    full = source.download("AAPL", start="2020-01-01", end="2021-01-01")
+    part = source.download("AAPL", start="2020-06-01", end="2020-07-01")
+
+    assert list(full.columns) == PRICE_COLUMNS
+    assert full.index.min() >= pd.Timestamp("2020-01-01") and full.index.max() < pd.Timestamp("2021-01-01")
+    pd.testing.assert_frame_equal(part, full.loc["2020-06-01":"2020-06-30"])
+    pd.testing.assert_frame_equal(full, SyntheticSource(seed=1).download("AAPL", start="2020-01-01", end="2021-01-01"))
+
+def test_synthetic_calendars_follow_the_quote_type():
+    source = SyntheticSource()
+    equity = source.download("MSFT", start="2024-01-01", end="2024-02-01")
+    crypto = source.download("BTC-USD", start="2024-01-01", end="2024-02-01")
+    assert (equity.index.dayofweek < 5).all()
+    assert len(crypto) == 31
+    assert source.download("ES=F", period="1y").empty
+
+def test_local_source_reads_csv_and_falls_back_to_minimal_metadata(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=10, name="Date")
+    frame = pd.DataFrame({column: range(10) for column in PRICE_COLUMNS}, index=dates).astype(float)
+    frame.reset_index().to_csv(tmp_path / "TEST.csv", index=False)
+    source = LocalFileSource(tmp_path)
+
+    data = source.download("TEST", start="2024-01-03", end="2024-01-05")
+    assert list(data.index) == list(pd.to_datetime(["2024-01-03", "2024-01-04"]))
+    assert source.info("TEST") == {"symbol": "TEST", "longName": "TEST", "quoteType": "EQUITY"}
+    assert source.info("MISSING") == {}
+    assert source.download("MISSING").empty
+
+def test_guess_quote_type():
+    assert guess_quote_type("EURUSD=X") == "CURRENCY"
+    assert guess_quote_type("^GSPC") == "INDEX"
+    assert guess_quote_type("ETH-USD") == "CRYPTOCURRENCY"
+    assert guess_quote_type("AAPL") == "EQUITY"
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from app.components import state
+from app.components.state import SessionStore, estimate_bytes
+
+def test_estimate_bytes_counts_frames_arrays_and_containers():
+    frame = pd.DataFrame({'Close': np.zeros(1000)})
+    assert estimate_bytes(np.zeros(1000)) == 8000
+    assert estimate_bytes(frame) >= 8000
+    assert estimate_bytes((frame, np.zeros(1000))) >= 16000
+
+def test_idle_entries_of_other_sessions_are_spilled_and_reloaded(tmp_path):
+    store = SessionStore(budget_bytes=10_000, idle_seconds=0, spill_dir=tmp_path)
+    store.put("idle", "output", np.arange(1000.0))
+    store.put("active", "output", np.zeros(1000))
+
+    assert store.session_bytes("idle") == 0
+    assert store.session_bytes("active") == 8000
+    assert [path.name for path in tmp_path.iterdir()] == ["idle-output.pkl"]
+
+    np.testing.assert_array_equal(store.get("idle", "output"), np.arange(1000.0))
+    assert not (tmp_path / "idle-output.pkl").exists()
+
+def test_entries_are_dropped_without_spill_dir():
+    store = SessionStore(budget_bytes=10_000, idle_seconds=0, spill_dir=None)
+    store.put("idle", "output", np.zeros(1000))
+    store.put("active", "output", np.zeros(1000))
+    assert store.get("idle", "output") is None
+    assert store.get("active", "output") is not None
+
+def test_recent_entries_are_not_evicted():
+    store = SessionStore(budget_bytes=10_000, idle_seconds=3600, spill_dir=None)
+    store.put("a", "output", np.zeros(1000))
+    store.put("b", "output", np.zeros(1000))
+    assert store.get("a", "output") is not None  # Over budget, but nothing is idle yet
+
+def test_sweep_drops_expired_entries_and_their_files(tmp_path, monkeypatch):
+    store = SessionStore(budget_bytes=10_000, idle_seconds=0, spill_dir=tmp_path)
+    store.put("gone", "output", np.zeros(1000))
+    store.put("other", "output", np.zeros(1000))
+    assert any(tmp_path.iterdir())
+
+    monkeypatch.setattr(state, "ENTRY_TTL_SECONDS", -1)
+    store.sweep()
+    assert store.entries == {} and store.total_bytes == 0
+    assert not any(tmp_path.iterdir())
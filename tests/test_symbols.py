@@ -0,0 +1,59 @@
+import threading
+import pandas as pd
+import pytest
+from app.data import symbols
+from app.data.symbols import SymbolIndex
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(symbols, "SYMBOL_INDEX_PATH", tmp_path / "symbols.csv")
+    return SymbolIndex(pd.DataFrame({
+        'symbol': ["MSFT", "AAPL", "AMZN", "AAPL", None, "AMD"],
+        'name': ["Microsoft", "Apple", None, "Duplicate", "Missing", "AMD"],
+        'quote_type': ["EQUITY", "EQUITY", "EQUITY", "EQUITY", "EQUITY", None],
+    }))
+
+def test_lookup_is_exact(index):
+    assert len(index) == 4
+    assert index.lookup("AAPL") == ("Apple", "EQUITY")
+    assert index.lookup("AMZN") == ("AMZN", "EQUITY")  # Missing names fall back to the symbol
+    assert index.lookup("AMD") == ("AMD", "Unknown")
+    assert index.lookup("AAP") is None
+    assert index.lookup("ZZZZ") is None
+
+def test_prefix_returns_sorted_matches_up_to_the_limit(index):
+    assert [symbol for symbol, _, _ in index.prefix("A")] == ["AAPL", "AMD", "AMZN"]
+    assert [symbol for symbol, _, _ in index.prefix("AM", limit=1)] == ["AMD"]
+    assert index.prefix("") == []
+    assert index.prefix("X") == []
+
+def test_add_keeps_the_order_and_appends_to_the_local_copy(index):
+    index.add("BTC-USD", "Bitcoin USD", "CRYPTOCURRENCY")
+    index.add("AAPL", "Ignored", "EQUITY")  # Known symbols are not added twice
+
+    assert index.entries[0] == sorted(index.entries[0])
+    assert index.lookup("BTC-USD") == ("Bitcoin USD", "CRYPTOCURRENCY")
+    saved = pd.read_csv(symbols.SYMBOL_INDEX_PATH)
+    assert saved['symbol'].tolist() == ["BTC-USD"]
+
+def test_readers_always_see_parallel_lists(index):
+    stop = threading.Event()
+    mismatches = []
+
+    def read():
+        while not stop.is_set():
+            listed, names, types = index.entries
+            if not len(listed) == len(names) == len(types):
+                mismatches.append(len(listed))
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    for i in range(200):
+        index.add(f"T{i:03d}", f"Test {i}", "EQUITY")
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert not mismatches
+    assert len(index) == 204
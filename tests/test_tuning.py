@@ -0,0 +1,66 @@
+import multiprocessing
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from app.models import tuning
+from app.models.tuning import prophet_cutoffs, tune_prophet, search_arima_order, save_model_params, load_model_params, load_tuning_record
+
+def price_history(days, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2019-01-01", periods=days)
+    return pd.DataFrame({'Date': dates, 'Close': 100 * np.exp(np.cumsum(0.01 * rng.standard_normal(days)))})
+
+def test_prophet_cutoffs_are_spaced_back_from_the_end():
+    ds = pd.Series(pd.date_range("2020-01-01", "2023-12-31"))
+    cutoffs = prophet_cutoffs(ds, initial='730 days', period='180 days', horizon='365 days')
+    assert cutoffs[0] == ds.max() - pd.Timedelta('365 days')
+    assert all(a - b == pd.Timedelta('180 days') for a, b in zip(cutoffs, cutoffs[1:]))
+    assert cutoffs[-1] >= ds.min() + pd.Timedelta('730 days')
+
+def test_tune_prophet_refuses_a_short_history():
+    with pytest.raises(ValueError):
+        tune_prophet(price_history(300), max_workers=1)
+
+def test_tune_prophet_returns_a_grid_candidate(tmp_path, monkeypatch):
+    monkeypatch.setattr(tuning, "TUNING_DIR", tmp_path)
+    grid = {'changepoint_prior_scale': [0.01, 0.5], 'seasonality_mode': ['additive']}
+    best, results = tune_prophet(price_history(1000), ticker="TEST", grid=grid, rungs=(1, None), eta=2,
+                                 initial='500 days', period='180 days', horizon='90 days', max_workers=2)
+
+    assert best['changepoint_prior_scale'] in grid['changepoint_prior_scale']
+    assert len(results) == 2 and results['mape'].notna().all()
+    assert results['cutoffs'].iloc[0] >= results['cutoffs'].iloc[-1]  # Survivors are scored on more cutoffs
+    assert load_model_params("TEST", "Prophet") == best
+
+def test_saved_params_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(tuning, "TUNING_DIR", tmp_path)
+    assert load_model_params("TEST", "ARIMA") is None
+    save_model_params("TEST", "ARIMA", {'order': [1, 1, 1]}, aic=12.5)
+    assert load_model_params("TEST", "ARIMA") == {'order': [1, 1, 1]}
+    assert load_tuning_record("TEST", "ARIMA")['aic'] == 12.5
+
+    (tmp_path / "ARIMA" / "TEST.json").write_text("{not json")
+    assert load_model_params("TEST", "ARIMA") is None
+
+def test_arima_search_finds_the_best_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(tuning, "TUNING_DIR", tmp_path)
+    m_arima, report = search_arima_order(price_history(400), ticker="TEST", max_p=1, max_q=1, seasonal_period=0, budget=60, max_workers=2)
+
+    assert m_arima is not None
+    assert report['evaluated'] == report['candidates'] == 4 and not report['timed_out']
+    assert report['aic'] == pytest.approx(m_arima.aic())
+    assert load_model_params("TEST", "ARIMA")['order'] == list(report['order'])
+
+def test_arima_search_stops_at_the_budget(monkeypatch):
+    monkeypatch.setattr(tuning, "evaluate_arima_candidate", slow_candidate)
+    start = time.monotonic()
+    m_arima, report = search_arima_order(price_history(200), max_p=3, max_q=3, seasonal_period=0, budget=1, max_workers=2)
+
+    assert time.monotonic() - start < 5
+    assert report['timed_out'] and report['evaluated'] < report['candidates']
+    assert multiprocessing.active_children() == []
+
+def slow_candidate(y, order, seasonal_order):
+    time.sleep(0.4 if sum(order) < 2 else 30)  # Complex candidates would run well past the budget
+    return float(sum(order)), None